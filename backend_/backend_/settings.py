@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # third party apps
     'rest_framework',
@@ -77,16 +78,22 @@ CORS_ALLOWED_ORIGINS = [origin.strip() for origin in config('CORS_ALLOWED_ORIGIN
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'internship.authentication.RoleJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'internship.pagination.ListPagination',
     'PAGE_SIZE': 10,
 }
 
+# Access tokens carry the user's role; see internship/authentication.py
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'internship.authentication.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'internship.authentication.RoleTokenRefreshSerializer',
+}
+
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',  # default
 )
@@ -162,6 +169,64 @@ DATABASES = {
 
 
 
+# Cache
+# Local memory by default (per process, used in development and tests). Set
+# REDIS_URL to share cached responses and counters across gunicorn workers.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', cast=int, default=300)
+
+# Seconds a user's token version is cached between checks against the
+# database. Logouts and role changes clear it only in the cache they reach,
+# so without a shared cache (REDIS_URL) it is not cached at all: every
+# request with an access token reads it, or other workers would accept
+# revoked tokens for that long.
+AUTH_VERSION_CACHE_TIMEOUT = config('AUTH_VERSION_CACHE_TIMEOUT', cast=int, default=60 if REDIS_URL else 0)
+
+# Seconds between rebuilds of the in-process autocomplete index when another
+# worker has changed internships
+AUTOCOMPLETE_REBUILD_INTERVAL = config('AUTOCOMPLETE_REBUILD_INTERVAL', cast=int, default=10)
+
+# Seconds between re-reads of internships changed by other workers into the
+# in-process recommendation matrix
+RECOMMENDATION_SYNC_INTERVAL = config('RECOMMENDATION_SYNC_INTERVAL', cast=int, default=10)
+
+# Threads per process for work done after the response (profile picture
+# renditions); with BACKGROUND_TASKS_EAGER it runs inline (see background.py)
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', cast=int, default=2)
+BACKGROUND_TASKS_EAGER = config('BACKGROUND_TASKS_EAGER', cast=bool, default=False)
+
+# Activity logs are buffered per process and written in batches after the
+# response, with a spool directory to recover them after a crash (see
+# internship/activity.py). ACTIVITY_LOG_SYNC writes each one inside the
+# request instead. The default spool directory, var/, is git-ignored.
+ACTIVITY_LOG_SYNC = config('ACTIVITY_LOG_SYNC', cast=bool, default=False)
+ACTIVITY_LOG_BATCH_SIZE = config('ACTIVITY_LOG_BATCH_SIZE', cast=int, default=500)
+ACTIVITY_LOG_FLUSH_INTERVAL = config('ACTIVITY_LOG_FLUSH_INTERVAL', cast=float, default=2.0)
+ACTIVITY_LOG_SPOOL_DIR = config('ACTIVITY_LOG_SPOOL_DIR', default=str(BASE_DIR / 'var' / 'activity-log'))
+
+# Months of activity logs kept before the current one; older months are
+# archived under ACTIVITY_LOG_ARCHIVE_PREFIX in the default storage and
+# dropped by `manage.py maintain_activity_log` (see internship/partitions.py)
+ACTIVITY_LOG_RETENTION_MONTHS = config('ACTIVITY_LOG_RETENTION_MONTHS', cast=int, default=12)
+ACTIVITY_LOG_ARCHIVE_PREFIX = config('ACTIVITY_LOG_ARCHIVE_PREFIX', default='activity_archive')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -202,6 +267,35 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Media storage (profile pictures, resumes): 'supabase' for Supabase Storage,
+# where the first path segment of a file name is the bucket, or 'local' for
+# MEDIA_ROOT. Defaults to Supabase when it is configured. See internship/storage.py.
+SUPABASE_URL = config('SUPABASE_URL', default='')
+SUPABASE_SERVICE_ROLE_KEY = config('SUPABASE_SERVICE_ROLE_KEY', default='')
+MEDIA_STORAGE = config('MEDIA_STORAGE', default='supabase' if SUPABASE_URL else 'local')
+
+STORAGES = {
+    'default': {
+        'BACKEND': (
+            'internship.storage.SupabaseStorage' if MEDIA_STORAGE == 'supabase'
+            else 'django.core.files.storage.FileSystemStorage'
+        ),
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Uploads over this size are refused while the request is parsed; bulk
+# internship imports (up to 50,000 rows) have their own, larger limit
+MAX_UPLOAD_SIZE = config('MAX_UPLOAD_SIZE', cast=int, default=10 * 1024 * 1024)
+IMPORT_MAX_UPLOAD_SIZE = config('IMPORT_MAX_UPLOAD_SIZE', cast=int, default=100 * 1024 * 1024)
+FILE_UPLOAD_HANDLERS = [
+    'internship.storage.UploadSizeLimitHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
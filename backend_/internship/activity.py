@@ -0,0 +1,297 @@
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ActivityLog, Internship
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# ACTIVITY LOG
+# --------------------------
+# Signal handlers record activity with `log_activity`, and bulk writes with
+# `log_activities`; neither queries nor writes inside the request. An event waits for the surrounding
+# transaction to commit (a rolled-back change logs nothing), then joins a
+# per-process buffer. The buffer is written with one bulk_create once it
+# holds ACTIVITY_LOG_BATCH_SIZE events or ACTIVITY_LOG_FLUSH_INTERVAL seconds
+# after its first one.
+#
+# Buffered events are also appended to a spool file under
+# ACTIVITY_LOG_SPOOL_DIR, which is deleted once its batch is in the database.
+# Files left by a failed write or a dead process are replayed by
+# `replay_spool` after a writer's first good write (and the next one after a
+# failure), or by the flush_activity_log command. Delivery is therefore at
+# least once. With ACTIVITY_LOG_SYNC (which the tests turn on) events are
+# inserted straight away in the caller's transaction instead.
+#
+# Details are templates filled in when the batch is written: `{title}` is the
+# internship's title and `{username}` the user's. Callers pass the values
+# they already have in memory (see `loaded`); the rest are fetched with one
+# query per batch. Any other braces must be doubled (see describe_changes).
+
+
+def loaded(instance, *path):
+    """
+    Follow `path` from `instance` (e.g. 'internship', 'title') without
+    querying: None if a relation on the way isn't cached or a field is
+    deferred.
+    """
+    value = instance
+    for name in path:
+        if value is None:
+            return None
+        field = value._meta.get_field(name)
+        if field.is_relation:
+            if not field.is_cached(value):
+                return None
+        elif field.attname in value.get_deferred_fields():
+            return None
+        value = getattr(value, name)
+    return value
+
+
+def describe_changes(instance, changes):
+    """
+    One 'field: old → new' line per change (see ChangeTrackingModel), for
+    details. Long text and JSON fields are only named. Braces are escaped.
+    """
+    lines = []
+    for name, (old, new) in changes.items():
+        field = instance._meta.get_field(name)
+        label = field.attname if field.is_relation else name
+        if isinstance(field, (models.TextField, models.JSONField)) or old is models.DEFERRED:
+            lines.append(f"{label} changed")
+        else:
+            old, new = ('—' if value in (None, '') else value for value in (old, new))
+            lines.append(f"{label}: {old} → {new}")
+    return '\n'.join(lines).replace('{', '{{').replace('}', '}}')
+
+
+def activity(user_id, action, related_object_id=None, details='', internship_id=None, title=None, username=None):
+    """One event for `log_activities`; see the module comment for `details`."""
+    return {
+        'user_id': user_id,
+        'action': action,
+        'related_object_id': related_object_id,
+        'details': details,
+        'internship_id': internship_id,
+        'title': title,
+        'username': username,
+        'timestamp': timezone.now().isoformat(),
+    }
+
+
+def log_activity(user_id, action, related_object_id=None, details='', internship_id=None, title=None, username=None):
+    """Record one activity of `user_id`; see the module comment for `details`."""
+    log_activities([activity(user_id, action, related_object_id, details, internship_id, title, username)])
+
+
+def log_activities(events):
+    """Record many events (see `activity`) at once, e.g. of a bulk update."""
+    if not events:
+        return
+    if settings.ACTIVITY_LOG_SYNC:
+        ActivityLog.objects.bulk_create(build_logs(events, known_users=True))
+    else:
+        transaction.on_commit(lambda: activity_buffer.extend(events))
+
+
+def build_logs(events, known_users=False):
+    """
+    ActivityLog rows for `events` with their details filled in. Unless
+    `known_users`, events of users deleted in the meantime are dropped.
+    """
+    user_ids = {
+        event['user_id'] for event in events
+        if not known_users or event['username'] is None and '{username}' in event['details']
+    }
+    usernames = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'username')) if user_ids else {}
+    internship_ids = {
+        event['internship_id'] for event in events if event['title'] is None and '{title}' in event['details']
+    }
+    titles = dict(Internship.objects.filter(pk__in=internship_ids).values_list('pk', 'title')) if internship_ids else {}
+
+    logs = []
+    for event in events:
+        user_id, internship_id = event['user_id'], event['internship_id']
+        if not known_users and user_id not in usernames:
+            continue
+        logs.append(ActivityLog(
+            user_id=user_id,
+            action=event['action'],
+            related_object_id=event['related_object_id'],
+            details=event['details'].format_map({
+                'title': titles.get(internship_id, f"internship #{internship_id}")
+                if event['title'] is None else event['title'],
+                'username': usernames.get(user_id, '') if event['username'] is None else event['username'],
+            }),
+            timestamp=parse_datetime(event['timestamp']),
+        ))
+    return logs
+
+
+def write_events(events):
+    """Insert events with one bulk_create; returns how many were written."""
+    logs = build_logs(events)
+    ActivityLog.objects.bulk_create(logs)
+    return len(logs)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class ActivityLogBuffer:
+    """
+    Events of this process waiting to be written by its writer thread.
+    Spool files are `<pid>-<id>.ndjson` while buffered, `failed-<pid>-<id>`
+    after a failed write and `replaying-<replaying pid>-<pid>-<id>` while
+    `replay_spool` writes them.
+    """
+
+    def __init__(self, batch_size=None, interval=None, spool_dir=None, autostart=True):
+        self.batch_size = batch_size or settings.ACTIVITY_LOG_BATCH_SIZE
+        self.interval = interval or settings.ACTIVITY_LOG_FLUSH_INTERVAL
+        self.spool_dir = Path(spool_dir or settings.ACTIVITY_LOG_SPOOL_DIR)
+        self.autostart = autostart
+        self.condition = threading.Condition()
+        self.pid = None
+        self._reset()
+
+    def _reset(self):
+        # Also run in a forked child, which must not share the parent's state
+        self.pid = os.getpid()
+        self.events = []
+        self.spool = None
+        self.thread = None
+        self.retry = True  # replay leftovers once the writer is up
+
+    def add(self, event):
+        self.extend([event])
+
+    def extend(self, events):
+        with self.condition:
+            if self.pid != os.getpid():
+                self._reset()
+            if self.autostart and self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='activity-log', daemon=True)
+                self.thread.start()
+            if self.spool is None:
+                self.spool_dir.mkdir(parents=True, exist_ok=True)
+                path = self.spool_dir / f'{self.pid}-{uuid.uuid4().hex[:12]}.ndjson'
+                # Line buffered: every event reaches the OS before extend() returns
+                self.spool = open(path, 'x', buffering=1, encoding='utf-8')
+            self.spool.writelines(json.dumps(event) + '\n' for event in events)
+            self.events.extend(events)
+            if len(self.events) >= self.batch_size:
+                self.condition.notify()
+
+    def _take(self):
+        """Swap out the current batch and its spool file (caller holds the lock)."""
+        events, spool = self.events, self.spool
+        self.events, self.spool = [], None
+        if spool is not None:
+            spool.close()
+        return events, spool and Path(spool.name)
+
+    def _write(self, events, path):
+        try:
+            write_events(events)
+        except Exception:
+            logger.exception("Writing %d activity log events failed; kept in %s", len(events), path)
+            if path is not None:
+                path.rename(path.with_name(f'failed-{path.name}'))
+            self.retry = True
+            return False
+        if path is not None:
+            path.unlink(missing_ok=True)
+        return True
+
+    def flush(self):
+        """Write whatever is buffered now, in the calling thread."""
+        with self.condition:
+            events, path = self._take()
+        if events:
+            self._write(events, path)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.events)
+                # Give the batch time to fill up, unless it already has
+                self.condition.wait_for(lambda: len(self.events) >= self.batch_size, timeout=self.interval)
+                events, path = self._take()
+            try:
+                if self._write(events, path) and self.retry:
+                    self.retry = False
+                    replay_spool(self.spool_dir)
+            except Exception:
+                logger.exception("Replaying the activity log spool failed")
+                self.retry = True
+            finally:
+                connections.close_all()
+
+
+SPOOL_NAME = re.compile(r'^(?:(failed)-|replaying-(\d+)-)?((\d+)-[0-9a-f]+)\.ndjson$')
+
+
+def replay_spool(spool_dir=None):
+    """
+    Write the events of spool files left by failed writes or dead processes.
+    Each file is claimed by renaming it first, so concurrent replays don't
+    write it twice. Returns the number of events written.
+    """
+    spool_dir = Path(spool_dir or settings.ACTIVITY_LOG_SPOOL_DIR)
+    if not spool_dir.is_dir():
+        return 0
+    written = 0
+    for path in sorted(spool_dir.glob('*.ndjson')):
+        match = SPOOL_NAME.match(path.name)
+        if match is None:
+            continue
+        failed, replaying_pid, batch, batch_pid = match.groups()
+        owner = None if failed else int(replaying_pid or batch_pid)
+        if owner is not None and (owner == os.getpid() or _pid_alive(owner)):
+            continue  # still being buffered or replayed
+        claimed = path.with_name(f'replaying-{os.getpid()}-{batch}.ndjson')
+        try:
+            path.rename(claimed)
+        except FileNotFoundError:
+            continue  # another process got there first
+        with open(claimed, encoding='utf-8') as spool:
+            # The last line may be cut short if the process died mid-write
+            events = []
+            for line in spool:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping a damaged line in %s", path)
+        try:
+            written += write_events(events) if events else 0
+        except Exception:
+            claimed.rename(path.with_name(f'failed-{batch}.ndjson'))
+            raise
+        claimed.unlink()
+    return written
+
+
+activity_buffer = ActivityLogBuffer()
+# Write what is still buffered when a worker shuts down cleanly
+atexit.register(activity_buffer.flush)
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import Profile, TokenUser
+
+# --------------------------
+# ROLE-AWARE JWT
+# --------------------------
+# Access tokens carry the user's role and auth version next to the user id,
+# so authenticating a request reads neither the User nor the Profile: the
+# request's user is a TokenUser made from the claims, and permissions take
+# the role from it (see permissions.role_of). Views that need more of the
+# user load it on first use.
+#
+# Profile.auth_version is bumped when the role changes, which ends every
+# access token issued before; deactivating or deleting the user ends them
+# too. Logout only blacklists that session's refresh token, leaving other
+# devices logged in. Requests check the version through the cache, for at
+# most AUTH_VERSION_CACHE_TIMEOUT seconds; changes clear the cached version,
+# so with a shared cache they apply at once. Without one (no REDIS_URL) the
+# timeout defaults to 0 and every request reads the version instead, one
+# query on Profile. A refresh re-reads role and version from the database,
+# so a client whose role changed gets a valid token again as long as its
+# refresh token is not blacklisted.
+
+ROLE_CLAIM = 'role'
+VERSION_CLAIM = 'auth_version'
+REVOKED = -1  # cached for users who may not authenticate at all
+
+
+def _version_key(user_id):
+    return f'auth-version:{user_id}'
+
+
+def current_claims(user_id):
+    """The user's role and auth version claims, or None for an inactive or deleted user."""
+    row = (
+        Profile.objects.filter(user_id=user_id, user__is_active=True)
+        .values_list('role', 'auth_version').first()
+    )
+    return row and {ROLE_CLAIM: row[0], VERSION_CLAIM: row[1]}
+
+
+def _stored_version(user_id):
+    claims = current_claims(user_id)
+    return claims[VERSION_CLAIM] if claims else REVOKED
+
+
+def auth_version(user_id):
+    """
+    The version the user's access tokens must carry, through the cache
+    unless AUTH_VERSION_CACHE_TIMEOUT is 0.
+    """
+    if not settings.AUTH_VERSION_CACHE_TIMEOUT:
+        return _stored_version(user_id)
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _stored_version(user_id)
+        cache.set(key, version, settings.AUTH_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_auth_version(user_id):
+    # Again on commit, in case a request cached the old version meanwhile
+    key = _version_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def revoke_tokens(user_id):
+    """End the access tokens issued to the user so far. Refresh tokens stay valid."""
+    Profile.objects.filter(user_id=user_id).update(auth_version=F('auth_version') + 1)
+    forget_auth_version(user_id)
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's current role and auth version."""
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        access.payload.update(current_claims(self[api_settings.USER_ID_CLAIM]) or {})
+        return access
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the User query, for access tokens with role
+    claims. Tokens issued before those existed are checked the usual way.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        if validated_token[VERSION_CLAIM] != auth_version(user_id):
+            raise AuthenticationFailed("Token has been revoked", code='token_revoked')
+        return TokenUser.from_claims(user_id, validated_token.get(ROLE_CLAIM))
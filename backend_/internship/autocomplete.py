@@ -0,0 +1,241 @@
+import difflib
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+
+from .background import submit
+from .cache import get_generation
+from .models import Internship
+from .search import trigram_supported
+
+# --------------------------
+# AUTOCOMPLETE
+# --------------------------
+# Each process keeps a small in-memory index of the distinct titles, companies
+# and locations of open internships. Local writes are applied incrementally
+# (from signals, once the transaction commits); writes made by other worker
+# processes are noticed through the shared cache generation and trigger a
+# rebuild, at most once per AUTOCOMPLETE_REBUILD_INTERVAL seconds. Rebuilds
+# run one at a time on the background pool while requests keep using the
+# old index; until a process has its first one, suggestions come from a
+# prefix query on the database.
+
+SUGGESTION_FIELDS = ('title', 'company', 'location')
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    return ' '.join(_WORD_RE.findall(text.casefold()))
+
+
+class PrefixIndex:
+    """
+    Distinct values of one field, searchable by the prefix of any word.
+    `entries` is a sorted list of (word suffix, value key) pairs, so a prefix
+    lookup is a bisect plus a short scan.
+    """
+
+    def __init__(self):
+        self.values = {}  # key -> [display value, number of internships]
+        self.entries = []
+
+    @staticmethod
+    def _suffixes(key):
+        # "data science intern" -> "data science intern", "science intern", "intern"
+        return [key[match.start():] for match in _WORD_RE.finditer(key)]
+
+    @classmethod
+    def build(cls, values):
+        """Index of `values`, with the entries sorted once instead of inserted one by one."""
+        index = cls()
+        for value in values:
+            key = normalize(value or '')
+            if not key:
+                continue
+            if key in index.values:
+                index.values[key][1] += 1
+            else:
+                index.values[key] = [value, 1]
+        index.entries = sorted((suffix, key) for key in index.values for suffix in cls._suffixes(key))
+        return index
+
+    def add(self, value):
+        key = normalize(value or '')
+        if not key:
+            return
+        if key in self.values:
+            self.values[key][1] += 1
+            return
+        self.values[key] = [value, 1]
+        for suffix in self._suffixes(key):
+            insort(self.entries, (suffix, key))
+
+    def remove(self, value):
+        key = normalize(value or '')
+        if key not in self.values:
+            return
+        self.values[key][1] -= 1
+        if self.values[key][1] > 0:
+            return
+        del self.values[key]
+        for suffix in self._suffixes(key):
+            i = bisect_left(self.entries, (suffix, key))
+            if i < len(self.entries) and self.entries[i] == (suffix, key):
+                del self.entries[i]
+
+    def search(self, prefix, limit, scan=200):
+        """
+        Values with a word starting with `prefix`, ranked by: whole value
+        starts with the prefix, then number of internships, then alphabetically.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        matches = set()
+        i = bisect_left(self.entries, (prefix,))
+        while i < len(self.entries) and len(matches) < scan:
+            suffix, key = self.entries[i]
+            if not suffix.startswith(prefix):
+                break
+            matches.add(key)
+            i += 1
+        ranked = sorted(matches, key=lambda key: (not key.startswith(prefix), -self.values[key][1], key))
+        return [self.values[key][0] for key in ranked[:limit]]
+
+    def fuzzy(self, text, limit):
+        keys = difflib.get_close_matches(normalize(text), list(self.values), n=limit, cutoff=0.6)
+        return [self.values[key][0] for key in keys]
+
+
+class SuggestionIndex:
+    """Per-process prefix indexes for every suggestion field."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.built_at = 0.0
+        self.rebuilding = False
+        self.rows = {}  # internship id -> indexed values, to undo them on change
+        self.fields = {}
+
+    @staticmethod
+    def is_indexed(instance):
+        return instance.status == 'open'
+
+    def rebuild(self):
+        generation = get_generation('internship')
+        rows = {}
+        queryset = Internship.objects.filter(status='open').values_list('id', *SUGGESTION_FIELDS)
+        for pk, *values in queryset.iterator(chunk_size=5000):
+            rows[pk] = tuple(values)
+        columns = zip(*rows.values()) if rows else [()] * len(SUGGESTION_FIELDS)
+        fields = {field: PrefixIndex.build(values) for field, values in zip(SUGGESTION_FIELDS, columns)}
+        with self.lock:
+            self.fields, self.rows = fields, rows
+            self.generation, self.built_at = generation, time.monotonic()
+
+    def _rebuild_in_background(self):
+        with self.lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+
+        def run():
+            try:
+                self.rebuild()
+            finally:
+                self.rebuilding = False
+        submit(run)
+
+    def ensure_fresh(self):
+        """
+        Start a rebuild if there is no index yet or another process changed
+        internships. True if there is an index to serve from meanwhile.
+        """
+        if self.generation is None:
+            self._rebuild_in_background()
+            return self.generation is not None  # built inline with BACKGROUND_TASKS_EAGER
+        interval = getattr(settings, 'AUTOCOMPLETE_REBUILD_INTERVAL', 10)
+        if time.monotonic() - self.built_at >= interval and get_generation('internship') != self.generation:
+            self._rebuild_in_background()
+        return True
+
+    def apply(self, pk, instance, generation):
+        """
+        Apply one committed change to internship `pk`; `instance` is None when
+        it was deleted. `generation` is the cache generation the
+        change bumped to; if other writes (e.g. from another process) happened
+        in between, the index still takes this change but stays marked stale,
+        so `ensure_fresh` rebuilds it.
+        """
+        with self.lock:
+            if self.generation is None:
+                return
+            old = self.rows.pop(pk, None)
+            if old:
+                for field, value in zip(SUGGESTION_FIELDS, old):
+                    self.fields[field].remove(value)
+            if instance is not None and self.is_indexed(instance):
+                new = tuple(getattr(instance, field) for field in SUGGESTION_FIELDS)
+                self.rows[pk] = new
+                for field, value in zip(SUGGESTION_FIELDS, new):
+                    self.fields[field].add(value)
+            if generation == self.generation + 1:
+                self.generation = generation
+
+    def suggest(self, field, text, limit=8):
+        """Prefix matches first, topped up with fuzzy (typo-tolerant) matches."""
+        if self.ensure_fresh():
+            with self.lock:
+                index = self.fields[field]
+                results = index.search(text, limit)
+        else:
+            index, results = None, prefix_matches(field, text, limit)
+        if len(results) < limit and len(normalize(text)) >= 3:
+            seen = {normalize(value) for value in results}
+            for value in self.fuzzy(index, field, text, limit):
+                if normalize(value) not in seen and len(results) < limit:
+                    seen.add(normalize(value))
+                    results.append(value)
+        return results
+
+    def fuzzy(self, index, field, text, limit):
+        if trigram_supported():
+            return trigram_matches(field, text, limit)
+        if index is None:
+            return []
+        with self.lock:
+            return index.fuzzy(text, limit)
+
+
+def prefix_matches(field, text, limit):
+    """Values with a word starting with `text`, from the database, for before the index is built."""
+    prefix = normalize(text)
+    if not prefix:
+        return []
+    word_start = Q(**{f'{field}__istartswith': prefix}) | Q(**{f'{field}__icontains': f' {prefix}'})
+    return list(
+        Internship.objects.filter(word_start, status='open')
+        .order_by(field).values_list(field, flat=True).distinct()[:limit]
+    )
+
+
+def trigram_matches(field, text, limit):
+    """Closest values by trigram word similarity, served by the pg_trgm index."""
+    return list(
+        Internship.objects
+        .filter(status='open', **{f'{field}__trigram_word_similar': text})
+        .annotate(similarity=TrigramWordSimilarity(text, field))
+        .order_by('-similarity', field)
+        .values_list(field, flat=True)
+        .distinct()[:limit]
+    )
+
+
+suggestion_index = SuggestionIndex()
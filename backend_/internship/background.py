@@ -0,0 +1,55 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# BACKGROUND TASKS
+# --------------------------
+# Work that should not hold up a response (image processing and the like)
+# runs on a small in-process thread pool once the surrounding transaction has
+# committed. With BACKGROUND_TASKS_EAGER (tests) it runs inline instead. Tasks
+# are not persisted: each one must leave the database in a state that a
+# management command can find and finish if the process dies first (see
+# process_profile_pictures).
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    # Created on first use, i.e. after gunicorn has forked the worker
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2), thread_name_prefix='background',
+            )
+        return _executor
+
+
+def _run(fn, args):
+    try:
+        fn(*args)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(fn, '__name__', fn))
+    finally:
+        # Pool threads keep their own connections; don't leave them open
+        connections.close_all()
+
+
+def submit(fn, *args):
+    """Call `fn(*args)` off the request thread right away, whatever the transaction state."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        fn(*args)
+    else:
+        _get_executor().submit(_run, fn, args)
+
+
+def run_in_background(fn, *args):
+    """Call `fn(*args)` off the request thread after the current transaction commits."""
+    transaction.on_commit(lambda: submit(fn, *args))
@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+# --------------------------
+# RESPONSE CACHE
+# --------------------------
+# Anonymous responses are cached under a per-model generation number. Any
+# write to the model bumps the generation (see signals.py), which makes every
+# previously cached response unreachable at once; the timeout only bounds how
+# long orphaned entries occupy memory.
+
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _generation_key(namespace):
+    return f'response-cache:generation:{namespace}'
+
+
+def get_generation(namespace):
+    # Seeded from the clock so a generation key lost to eviction never
+    # restarts at a number that older cached entries were stored under.
+    return get_cache().get_or_set(_generation_key(namespace), time.time_ns, timeout=None)
+
+
+def bump_generation(namespace):
+    cache = get_cache()
+    try:
+        return cache.incr(_generation_key(namespace))
+    except ValueError:
+        generation = time.time_ns()
+        cache.set(_generation_key(namespace), generation, timeout=None)
+        return generation
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def cache_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+
+def reset_cache_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+def response_cache_key(request, namespace, *extra_namespaces):
+    """
+    Key on host, path and the normalized query string: parameters are sorted
+    and blank values dropped, so `?location=&page=1` and `?page=1` share an entry.
+    A bump of any of the namespaces' generations makes the key unreachable.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    raw = f"{request.get_host()}|{request.path}|{params}"
+    digest = hashlib.sha256(raw.encode()).hexdigest()
+    generations = ':'.join(str(get_generation(name)) for name in (namespace, *extra_namespaces))
+    return f'response-cache:{namespace}:{generations}:{digest}'
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serve GET responses for anonymous users from the shared cache.
+    Authenticated users always get a fresh response, since it carries
+    per-user fields such as `bookmarked`, unless the view sets
+    `cache_authenticated` because its response is the same for everyone.
+    Responses that also depend on other data list those namespaces in
+    `get_extra_cache_namespaces()`.
+    """
+    cache_namespace = None
+    cache_authenticated = False
+
+    def get_extra_cache_namespaces(self):
+        return ()
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated and not self.cache_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = response_cache_key(request, self.cache_namespace, *self.get_extra_cache_namespaces())
+        data = cache.get(key)
+        if data is not None:
+            _count(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _count(MISSES_KEY)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,45 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for read views, answering matching
+    `If-None-Match` / `If-Modified-Since` requests with `304 Not Modified`
+    before anything is serialized.
+
+    Views implement `get_etag_parts()`, returning cheap values (row versions,
+    generation counters) that change whenever the representation does, or
+    None to skip validation. `get_last_modified()` is optional and should only
+    return a timestamp when it covers every change to the response.
+    """
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        parts = self.get_etag_parts(request, *args, **kwargs)
+        etag = quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest()[:32]) if parts is not None else None
+        last_modified = self.get_last_modified(request, *args, **kwargs)
+        timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        if etag:
+            response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        # Let browsers revalidate on every poll instead of re-downloading
+        patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+        patch_vary_headers(response, ['Authorization'])
+        return response
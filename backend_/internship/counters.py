@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .cache import bump_generation
+from .models import Application, Bookmark, Internship
+
+# --------------------------
+# POPULARITY COUNTERS
+# --------------------------
+# Internship.applications_count and bookmarks_count are kept up to date by
+# signals with atomic F() updates, so showing or sorting by popularity reads
+# a column instead of counting rows. They are not content changes: updated_at
+# and the 'internship' generation stay put, and responses carrying the counts
+# follow their own COUNTERS_NAMESPACE generation instead. Rows written in bulk
+# (bypassing signals) are fixed up with `repair_counters`.
+
+COUNTERS_NAMESPACE = 'internship-counters'
+COUNTER_FIELDS = {'applications_count': Application, 'bookmarks_count': Bookmark}
+
+
+def adjust(internship_id, field, delta):
+    """Atomically add `delta` to one counter; it never drops below zero."""
+    queryset = Internship.objects.filter(pk=internship_id)
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    queryset.update(**{field: F(field) + delta})
+    # Once committed, or a concurrent request could cache the old counts under the new generation
+    transaction.on_commit(lambda: bump_generation(COUNTERS_NAMESPACE))
+
+
+def _actual(model):
+    rows = (
+        model.objects.filter(internship=OuterRef('pk'))
+        .order_by().values('internship').annotate(n=Count('id')).values('n')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+
+def repair_counters(batch_size=10_000):
+    """
+    Recompute every counter from the Application and Bookmark tables, one
+    batch of internship ids at a time, writing only rows that are off.
+    Returns the number of internships fixed.
+    """
+    fixed, last = 0, 0
+    while True:
+        ids = list(
+            Internship.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last = ids[-1]
+        actual = {field: _actual(model) for field, model in COUNTER_FIELDS.items()}
+        stale = Q()
+        for field in COUNTER_FIELDS:
+            stale |= ~Q(**{field: F(f'actual_{field}')})
+        stale_ids = list(
+            Internship.objects.filter(pk__in=ids)
+            .annotate(**{f'actual_{field}': value for field, value in actual.items()})
+            .filter(stale).values_list('pk', flat=True)
+        )
+        if stale_ids:
+            fixed += Internship.objects.filter(pk__in=stale_ids).update(**actual)
+    if fixed:
+        transaction.on_commit(lambda: bump_generation(COUNTERS_NAMESPACE))
+    return fixed
+
+
+class CounterResponseMixin:
+    """
+    View mixin for responses that may show the counters or be sorted by
+    them (`?ordering=`); those are cached under COUNTERS_NAMESPACE too.
+    """
+
+    def shows_counters(self):
+        ordering = self.request.query_params.get('ordering', '')
+        if any(name.strip().lstrip('-') in COUNTER_FIELDS for name in ordering.split(',')):
+            return True
+        return not COUNTER_FIELDS.keys().isdisjoint(self.get_serializer().fields)
+
+    def get_extra_cache_namespaces(self):
+        return (COUNTERS_NAMESPACE,) if self.shows_counters() else ()
@@ -0,0 +1,109 @@
+import csv
+from itertools import islice
+
+from django.core.files.storage import FileSystemStorage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.encoding import filepath_to_uri
+
+from .models import Application
+
+# --------------------------
+# APPLICANT EXPORT
+# --------------------------
+# Recruiters download every applicant of a posting as CSV or NDJSON. Rows are
+# read as plain values() tuples through a server-side cursor and written out
+# chunk by chunk, so memory stays flat however many applicants there are and
+# the header goes out before the query even runs.
+
+FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson'}
+CHUNK_SIZE = 2000
+
+# (column, values() path)
+COLUMNS = (
+    ('application_id', 'id'),
+    ('user_id', 'user_id'),
+    ('username', 'user__username'),
+    ('email', 'user__email'),
+    ('first_name', 'user__profile__first_name'),
+    ('last_name', 'user__profile__last_name'),
+    ('location', 'user__profile__location'),
+    ('status', 'status'),
+    ('applied_on', 'applied_on'),
+    ('resume_url', 'resume'),
+)
+HEADER = [column for column, _ in COLUMNS]
+_RESUME = HEADER.index('resume_url')
+_APPLIED_ON = HEADER.index('applied_on')
+# Text starting with these runs as a formula when the CSV is opened in a
+# spreadsheet; such cells get a leading apostrophe
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _url_builder(storage, absolute=None):
+    """name -> URL for `storage`, made absolute with `absolute` when given."""
+    if isinstance(storage, FileSystemStorage):
+        # Local files sit under one base URL; join it once instead of per row
+        base = storage.url('')
+        base = absolute(base) if absolute else base
+        return lambda name: base + filepath_to_uri(name).lstrip('/')
+    if absolute:
+        return lambda name: absolute(storage.url(name))
+    return storage.url
+
+
+def applicant_rows(internship_id, resume_url=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield one tuple per applicant of `internship_id`, oldest first, in the
+    order of COLUMNS. `resume_url` turns a stored file name into a URL.
+    """
+    url = _url_builder(Application._meta.get_field('resume').storage, resume_url)
+    rows = (
+        Application.objects.filter(internship_id=internship_id)
+        .order_by('applied_on', 'id')
+        .values_list(*(path for _, path in COLUMNS))
+    )
+    # The cursor has to live in one transaction behind a transaction pooler
+    with transaction.atomic():
+        for row in rows.iterator(chunk_size=chunk_size):
+            row = list(row)
+            row[_RESUME] = url(row[_RESUME]) if row[_RESUME] else None
+            yield row
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(rows, chunk_size):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADER)
+    while chunk := list(islice(rows, chunk_size)):
+        yield ''.join(writer.writerow(
+            [value.isoformat() if i == _APPLIED_ON else _csv_cell(value) for i, value in enumerate(row)]
+        ) for row in chunk)
+
+
+def _ndjson_lines(rows, chunk_size):
+    encoder = DjangoJSONEncoder()
+    while chunk := list(islice(rows, chunk_size)):
+        yield ''.join(encoder.encode(dict(zip(HEADER, row))) + '\n' for row in chunk)
+
+
+WRITERS = {'csv': _csv_lines, 'ndjson': _ndjson_lines}
+
+
+def export_applicants(internship_id, fmt, resume_url=None, chunk_size=CHUNK_SIZE):
+    """Iterator of text chunks for a StreamingHttpResponse."""
+    rows = applicant_rows(internship_id, resume_url=resume_url, chunk_size=chunk_size)
+    return WRITERS[fmt](rows, chunk_size)
@@ -0,0 +1,249 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.functions import Left
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+# --------------------------
+# SPARSE FIELDSETS
+# --------------------------
+# Read requests may pick the fields of a response with `?fields=a,b` or drop
+# some with `?omit=c`; dotted names reach into nested serializers
+# (`?fields=status,internship.title`). The same selection narrows the SQL:
+# list views load only the columns the kept fields read (see
+# `SparseFieldsetViewMixin`). List views may also default to a compact shape
+# declared by the serializer in `Meta.compact_fields`.
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_names(names):
+    """['status', 'internship.title'] -> {'status': [], 'internship': ['title']}"""
+    tree = {}
+    for name in names:
+        head, _, rest = name.partition('.')
+        children = tree.setdefault(head, [])
+        if rest:
+            children.append(rest)
+    return tree
+
+
+def split_param(request, param):
+    names = [name.strip() for name in request.query_params.get(param, '').split(',')]
+    return [name for name in names if name] or None
+
+
+class PreviewField(serializers.Field):
+    """
+    Read-only preview of a long text field, cut at a word boundary.
+    List views annotate only the first `length` characters instead of loading
+    the whole column (see `SparseFieldsetMixin.narrow_queryset`).
+    """
+
+    def __init__(self, text_field, length=160, **kwargs):
+        self.text_field = text_field
+        self.length = length
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    @property
+    def annotation_name(self):
+        return f'_{self.text_field}_preview'
+
+    def annotation(self):
+        # One extra character tells whether the text was cut
+        return {self.annotation_name: Left(self.text_field, self.length + 1)}
+
+    def to_representation(self, instance):
+        text = getattr(instance, self.annotation_name, None)
+        if text is None:
+            text = getattr(instance, self.text_field) or ''
+        if len(text) <= self.length:
+            return text
+        cut = text[:self.length]
+        if ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        return cut.rstrip(' .,;:') + '…'
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin for `?fields=` / `?omit=` selection.
+
+    Only the outermost serializer reads the query params, and only on safe
+    methods (writes always see every field); nested sparse serializers get
+    their part of the selection from their parent.
+
+    `Meta.compact_fields` (plus the context's `extra_compact_fields`) is the
+    default shape when the context has `compact=True`. `Meta.method_field_sources` lists the model fields each
+    SerializerMethodField reads; without an entry, keeping that field loads
+    the full row.
+    """
+
+    _selection = None  # (fields, omit) handed down by the parent serializer
+
+    def _is_outermost(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _requested(self):
+        if self._selection is not None:
+            return self._selection
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_outermost():
+            return None, []
+        return split_param(request, FIELDS_PARAM), split_param(request, OMIT_PARAM) or []
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include, omit = self._requested()
+        include_tree = parse_names(include) if include is not None else None
+        omit_tree = parse_names(omit)
+
+        unknown = set(include_tree or ()) | set(omit_tree)
+        unknown -= set(fields)
+        if unknown:
+            raise ValidationError({
+                FIELDS_PARAM: f"Unknown field(s): {', '.join(sorted(unknown))}. "
+                              f"Available: {', '.join(fields)}."
+            })
+
+        if include_tree is not None:
+            keep = list(include_tree)
+        elif self.context.get('compact') and hasattr(self.Meta, 'compact_fields'):
+            keep = [*self.Meta.compact_fields, *self.context.get('extra_compact_fields', ())]
+        else:
+            keep = list(fields)
+        keep = [name for name in fields if name in keep and omit_tree.get(name, None) != []]
+
+        selected = {}
+        for name in keep:
+            field = fields[name]
+            nested = getattr(field, 'child', field)
+            sub_include = (include_tree or {}).get(name) or None
+            sub_omit = omit_tree.get(name) or []
+            if isinstance(nested, SparseFieldsetMixin):
+                nested._selection = (sub_include, sub_omit)
+            elif sub_include or sub_omit:
+                raise ValidationError({FIELDS_PARAM: f"Field '{name}' has no selectable subfields."})
+            selected[name] = field
+        return selected
+
+    # --------------------------
+    # QUERYSET NARROWING
+    # --------------------------
+
+    def narrow_queryset(self, queryset, extra=()):
+        """
+        Defer every column the kept fields do not read, on the queryset's
+        model and on relations it follows with select_related. `extra` names
+        more fields to load (e.g. ordering fields read back by the paginator).
+        Returns the queryset unchanged when that cannot be worked out.
+        """
+        select_related = queryset.query.select_related
+        if select_related is True:
+            return queryset
+        select_related = select_related or {}
+        needed, whole = set(extra), set()
+        if not self.collect_paths(queryset.model, select_related, needed, whole):
+            return queryset
+        annotations = {}
+        for field in self.fields.values():
+            if isinstance(field, PreviewField):
+                annotations.update(field.annotation())
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        deferred = list(_deferrable(queryset.model, select_related, needed, whole))
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def collect_paths(self, model, select_related, needed, whole, prefix=''):
+        """
+        Add the field paths the kept fields read to `needed`, and relations
+        whose whole row is needed (nested non-sparse serializers) to `whole`.
+        False when some field reads something that is not a plain model field.
+        """
+        opts = model._meta
+        internship_field = getattr(self.Meta, 'viewer_state_internship_field', None)
+        if internship_field:
+            needed.add(prefix + opts.get_field(internship_field).name)
+
+        method_sources = getattr(self.Meta, 'method_field_sources', {})
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, PreviewField):
+                # Annotated on the outermost model; related rows load the text
+                if prefix:
+                    needed.add(prefix + field.text_field)
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in method_sources:
+                    return False
+                needed.update(prefix + source for source in method_sources[name])
+                continue
+            attrs = field.source_attrs
+            if not attrs:
+                return False
+            try:
+                model_field = opts.get_field(attrs[0])
+            except FieldDoesNotExist:
+                return False
+            path = prefix + model_field.name
+            needed.add(path)
+            if not model_field.is_relation or model_field.name not in select_related:
+                continue
+
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsetMixin):
+                sub_select = select_related[model_field.name]
+                if not nested.collect_paths(model_field.related_model, sub_select, needed, whole, f'{path}__'):
+                    return False
+            elif isinstance(nested, serializers.BaseSerializer):
+                whole.add(path)
+            elif len(attrs) > 1:
+                try:
+                    needed.add(f'{path}__' + model_field.related_model._meta.get_field(attrs[1]).name)
+                except FieldDoesNotExist:
+                    return False
+        return True
+
+
+def _deferrable(model, select_related, needed, whole, prefix=''):
+    """Concrete fields under `model` (and its select_related relations) nobody reads."""
+    for field in model._meta.concrete_fields:
+        path = prefix + field.name
+        if not (field.primary_key or path in needed or field.name in select_related):
+            yield path
+    for relation, nested in select_related.items():
+        path = prefix + relation
+        if path not in whole:
+            related = model._meta.get_field(relation).related_model
+            yield from _deferrable(related, nested, needed, whole, f'{path}__')
+
+
+class SparseFieldsetViewMixin:
+    """
+    Generic view mixin that narrows the queryset to the serializer's
+    selected fields. Set `compact = True` on list views to default to the
+    serializer's compact shape, plus any `extra_compact_fields`.
+    """
+    compact = False
+    extra_compact_fields = ()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['compact'] = self.compact
+        context['extra_compact_fields'] = self.extra_compact_fields
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+        extra = [field.lstrip('-') for field in getattr(self, 'cursor_ordering', None) or ()]
+        return serializer.narrow_queryset(queryset, extra=extra)
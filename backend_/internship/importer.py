@@ -0,0 +1,187 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .activity import activity, log_activities
+from .cache import bump_generation
+from .models import Internship
+from .search import update_search_vectors
+from .serializers import InternshipSerializer
+
+# --------------------------
+# BULK IMPORT
+# --------------------------
+# Recruiters can post many internships at once from CSV, a JSON array or
+# NDJSON (one object per line). Input is read as a stream and handled in
+# chunks: every row is validated with InternshipSerializer, valid rows are
+# inserted with one bulk_create and their activity logs recorded as one batch
+# (see activity.log_activities), so no per-row saves or signals run. Invalid
+# rows are skipped and reported.
+
+FORMATS = ('csv', 'json', 'ndjson')
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/x-jsonlines': 'ndjson',
+}
+EXTENSIONS = {'csv': 'csv', 'json': 'json', 'ndjson': 'ndjson', 'jsonl': 'ndjson'}
+
+CHUNK_SIZE = 500
+MAX_ROWS = 50_000
+MAX_REPORTED_ERRORS = 1000
+_READ_SIZE = 64 * 1024
+
+
+class ImportFailed(ValueError):
+    """The input as a whole cannot be imported (malformed or too large)."""
+
+
+def detect_format(content_type=None, filename=None):
+    """Import format from a content type or a file name, or None."""
+    if content_type:
+        fmt = CONTENT_TYPES.get(content_type.split(';')[0].strip().lower())
+        if fmt:
+            return fmt
+    if filename and '.' in filename:
+        return EXTENSIONS.get(filename.rsplit('.', 1)[1].lower())
+    return None
+
+
+# --------------------------
+# READERS
+# --------------------------
+
+def _text(stream):
+    """Decode a binary stream lazily (a leading BOM is dropped)."""
+    return codecs.getreader('utf-8-sig')(stream)
+
+
+def _csv_records(stream):
+    for record in csv.DictReader(_text(stream)):
+        # Blank cells mean "not given", so model defaults apply
+        yield {key.strip(): value for key, value in record.items() if key and value not in ('', None)}
+
+
+def _ndjson_records(stream):
+    for number, line in enumerate(_text(stream), 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            raise ImportFailed(f"Line {number}: invalid JSON ({exc}).")
+
+
+def _json_records(stream):
+    """Yield the elements of a top-level JSON array without loading it whole."""
+    text = _text(stream)
+    decoder = json.JSONDecoder()
+    buffer, eof, started = '', False, False
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != '[':
+                    raise ImportFailed("Expected a JSON array of internships.")
+                buffer, started = buffer[1:], True
+                continue
+        elif buffer.startswith(']'):
+            return
+        elif buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        elif buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise ImportFailed("Invalid JSON.")
+            else:
+                # A number could be cut off at the end of the buffer; objects cannot
+                if end < len(buffer) or eof or isinstance(record, (dict, list)):
+                    yield record
+                    buffer = buffer[end:]
+                    continue
+        if eof:
+            raise ImportFailed("Unexpected end of JSON input.")
+        chunk = text.read(_READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+READERS = {'csv': _csv_records, 'json': _json_records, 'ndjson': _ndjson_records}
+
+
+def read_records(stream, fmt):
+    return READERS[fmt](stream)
+
+
+# --------------------------
+# IMPORT
+# --------------------------
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_internships(records, recruiter, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Validate and insert `records` (dicts, as accepted by InternshipSerializer)
+    as internships of `recruiter`, all in one transaction. Returns a report:
+    {'created': n, 'failed': n, 'errors': [{'row': n, 'errors': {...}}, ...]}
+    with 1-based row numbers. With `dry_run`, nothing is written and
+    `created` counts the rows that would be.
+    """
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    serializer = InternshipSerializer()
+
+    def fail(number, errors):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'errors': errors})
+
+    with transaction.atomic():
+        for chunk in _chunks(enumerate(records, 1), chunk_size):
+            if chunk[-1][0] > MAX_ROWS:
+                raise ImportFailed(f"Too many rows; at most {MAX_ROWS} per import.")
+
+            internships = []
+            for number, record in chunk:
+                if not isinstance(record, dict):
+                    fail(number, {'non_field_errors': ["Expected an object."]})
+                    continue
+                try:
+                    data = serializer.run_validation(record)
+                except ValidationError as exc:
+                    fail(number, exc.detail)
+                    continue
+                internships.append(Internship(recruiter=recruiter, **data))
+
+            if dry_run or not internships:
+                report['created'] += len(internships)
+                continue
+
+            created = Internship.objects.bulk_create(internships)
+            update_search_vectors(Internship.objects.filter(pk__in=[internship.pk for internship in created]))
+            log_activities([
+                activity(
+                    recruiter.pk, 'internship_posted', internship.pk, "{title}",
+                    internship_id=internship.pk, title=internship.title,
+                )
+                for internship in created
+            ])
+            report['created'] += len(created)
+
+    if report['created'] and not dry_run:
+        bump_generation('internship')
+    return report
@@ -0,0 +1,394 @@
+import io
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import User, update_last_login
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from internship.authentication import RoleJWTAuthentication, RoleRefreshToken
+from internship.autocomplete import SuggestionIndex
+from internship.exporter import export_applicants
+from internship.importer import import_internships, read_records
+from internship.models import ActivityLog, Application, Internship, Profile
+from internship.partitions import add_months, create_partitions, month_start
+from internship.recommendations import InternshipMatrix, StudentProfile
+from internship.search import InternshipSearchFilter, search_supported, update_search_vectors
+from internship.seed import COMPANIES, LOCATIONS, TITLES, WORDS, seed_internships, seed_recruiter, seed_users
+from internship.serializers import InternshipSerializer
+from internship.views import (
+    ApplyToInternshipView, BookmarkCreateView, BookmarkDeleteView, InternshipEditView, InternshipListView,
+    MyPostedInternshipsView, ProfileUpdateView, UserActivityLogListView, ViewerStateView,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return statistics.median(ordered), pick(0.95), pick(0.99)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a seeded latency benchmark. Data is created inside a transaction "
+        "that is rolled back afterwards, so nothing is left behind."
+    )
+
+    scenarios = {
+        'search': 'bench_search',
+        'autocomplete': 'bench_autocomplete',
+        'list-shape': 'bench_list_shape',
+        'recommend': 'bench_recommend',
+        'import': 'bench_import',
+        'export': 'bench_export',
+        'write-path': 'bench_write_path',
+        'activity-log': 'bench_activity_log',
+        'write-count': 'bench_write_count',
+        'auth': 'bench_auth',
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(self.scenarios))
+        parser.add_argument('--rows', type=int, default=100_000, help='Number of rows to seed.')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per query.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        self.stdout.write(f"Database vendor: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                getattr(self, self.scenarios[options['scenario']])(**options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def analyze(self, *models):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in models:
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+    def time_it(self, label, fn, repeat):
+        fn()  # warm up
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        p50, p95, p99 = percentiles(samples)
+        self.stdout.write(f"  {label:<40} p50={p50:8.2f}ms  p95={p95:8.2f}ms  p99={p99:8.2f}ms")
+
+    # --------------------------
+    # SCENARIOS
+    # --------------------------
+
+    def bench_search(self, rows, repeat, **options):
+        """Legacy icontains SearchFilter vs. the ranked full-text filter."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        seed_internships(seed_recruiter(), rows)
+        update_search_vectors(Internship.objects.all())
+        self.analyze(Internship)
+
+        class View:
+            search_fields = ['title', 'description', 'location', 'company', 'internship_type']
+
+        factory = APIRequestFactory()
+        base = Internship.objects.order_by('-posted_on')
+        backends = [('icontains', filters.SearchFilter())]
+        if search_supported():
+            backends.append(('full-text', InternshipSearchFilter()))
+
+        for term in ['python', 'data sci', 'mumbai backend', 'stark']:
+            request = Request(factory.get('/internships/', {'search': term}))
+            self.stdout.write(f"search={term!r}")
+            for label, backend in backends:
+                queryset = backend.filter_queryset(request, base, View)
+                # Mirror one page of InternshipListView: COUNT(*) plus the first ten rows
+                self.time_it(label, lambda: (queryset.count(), list(queryset[:10])), repeat)
+
+    def bench_autocomplete(self, rows, repeat, **options):
+        """Prefix/fuzzy suggestions from the in-process index."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        seed_internships(seed_recruiter(), rows)
+        self.analyze(Internship)
+
+        index = SuggestionIndex()
+        start = time.perf_counter()
+        index.rebuild()
+        self.stdout.write(f"  index build: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        for field, text in [('title', 'd'), ('title', 'data sc'), ('company', 'ind'),
+                            ('location', 'ban'), ('location', 'bangalre')]:
+            self.time_it(f"{field}={text!r}", lambda: index.suggest(field, text), repeat)
+
+    def bench_list_shape(self, rows, repeat, **options):
+        """One page of the internship list: full rows vs. the compact and sparse shapes."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        recruiter = seed_recruiter()
+        seed_internships(recruiter, rows)
+        self.analyze(Internship)
+
+        factory = APIRequestFactory()
+        view = InternshipListView.as_view()
+
+        def render(params):
+            # Authenticated, so every run serializes instead of hitting the response
+            # cache; cursor mode, so no COUNT(*) drowns out the row cost
+            request = factory.get('/internships/', {'pagination': 'cursor', **params})
+            force_authenticate(request, user=recruiter)
+            return view(request).render()
+
+        shapes = [
+            ('full', {'fields': ','.join(InternshipSerializer().fields)}),
+            ('compact (default)', {}),
+            ('fields=id,title,company', {'fields': 'id,title,company'}),
+        ]
+        for label, params in shapes:
+            size = len(render(params).content)
+            self.time_it(f"{label} [{size} bytes/page]", lambda: render(params), repeat)
+
+    def bench_recommend(self, rows, repeat, **options):
+        """Ranking every open posting for a student (sparse matrix-vector product)."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        # Posted within the last two weeks, so (almost) every row is open and ranked
+        internships = seed_internships(seed_recruiter(), rows, days=14)
+        self.analyze(Internship)
+
+        matrix = InternshipMatrix()
+        start = time.perf_counter()
+        matrix.rebuild()
+        self.stdout.write(f"  matrix build: {(time.perf_counter() - start) * 1000:.0f}ms "
+                          f"({matrix.matrix.shape[0]} open rows, {matrix.matrix.nnz} non-zeros)")
+
+        student = User.objects.create_user(username='bench_student', password='bench-password')
+        student.profile.role = 'student'
+        student.profile.bio = 'Python and machine learning enthusiast looking for data science work'
+        student.profile.location = 'Bangalore'
+        student.profile.save()
+        Application.objects.bulk_create([
+            Application(user=student, internship=internship) for internship in random.sample(internships, 5)
+        ])
+
+        profile = StudentProfile(student)
+        self.time_it('rank (profile loaded)', lambda: matrix.rank(profile), repeat)
+        self.time_it('profile + rank (cache miss)', lambda: matrix.rank(StudentProfile(student)), repeat)
+
+    def bench_import(self, rows, repeat, **options):
+        """Bulk import of `rows` NDJSON postings (validation, inserts, activity logs)."""
+        recruiter = seed_recruiter()
+        types = [choice for choice, _ in Internship.INTERNSHIP_TYPES]
+        body = '\n'.join(json.dumps({
+            'title': random.choice(TITLES),
+            'company': random.choice(COMPANIES),
+            'location': random.choice(LOCATIONS),
+            'description': ' '.join(random.choices(WORDS, k=60)),
+            'internship_type': random.choice(types),
+            'stipend': random.randrange(0, 50000, 500),
+        }) for _ in range(rows)).encode()
+        self.stdout.write(f"Importing {rows} rows ({len(body) // 1024} KiB of NDJSON)...")
+
+        start = time.perf_counter()
+        report = import_internships(read_records(io.BytesIO(body), 'ndjson'), recruiter)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"  created {report['created']} in {elapsed:.2f}s ({report['created'] / elapsed:.0f} rows/s)"
+        )
+
+    def bench_export(self, rows, repeat, **options):
+        """Streaming CSV export of postings with rows/10 and rows applicants (first byte, total, peak memory)."""
+        self.stdout.write(f"Seeding {rows} applicants...")
+        small, large = seed_internships(seed_recruiter(), 2)
+        users = seed_users(rows, prefix='bench_applicant')
+        Profile.objects.bulk_create([
+            Profile(user=user, role='student', first_name='Bench', last_name=str(i), location=random.choice(LOCATIONS))
+            for i, user in enumerate(users)
+        ], batch_size=5000)
+        Application.objects.bulk_create([
+            Application(user=user, internship=posting, resume=f'resumes/{user.username}.pdf' if i % 2 else None)
+            for i, user in enumerate(users)
+            for posting in ((small, large) if i < rows // 10 else (large,))
+        ], batch_size=5000)
+        self.analyze(User, Profile, Application)
+
+        for posting, count in ((small, rows // 10), (large, rows)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            chunks = export_applicants(posting.pk, 'csv')
+            size = len(next(chunks))
+            first_ms = (time.perf_counter() - start) * 1000
+            size += sum(len(chunk) for chunk in chunks)
+            total = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.stdout.write(
+                f"  {count:>8} rows: first byte {first_ms:6.2f}ms, total {total:6.2f}s, "
+                f"{size // 1024} KiB, peak Python memory {peak / 1024 / 1024:.1f} MiB"
+            )
+
+    def bench_write_path(self, rows, repeat, **options):
+        """Apply and bookmark request latency with activity logs written inline vs. buffered."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        recruiter = seed_recruiter()
+        # Enough open postings that every timed request targets a fresh one
+        seeded = seed_internships(recruiter, max(rows, 5 * (repeat + 1)), days=14)
+        postings = iter([posting for posting in seeded if posting.status == 'open'])
+        self.analyze(Internship)
+
+        factory = APIRequestFactory()
+        apply, bookmark, unbookmark = (
+            ApplyToInternshipView.as_view(), BookmarkCreateView.as_view(), BookmarkDeleteView.as_view()
+        )
+        for mode, sync in (('inline', True), ('buffered', False)):
+            student = User.objects.create_user(username=f'bench_writer_{mode}', password='bench-password')
+            student.profile.role = 'student'
+            student.profile.save()
+
+            def call(view, method, posting):
+                request = getattr(factory, method)('/', {}, format='json')
+                force_authenticate(request, user=student)
+                response = view(request, internship_id=posting.pk)
+                assert response.status_code < 300, response.data
+
+            def bookmark_round_trip():
+                posting = next(postings)
+                call(bookmark, 'post', posting)
+                call(unbookmark, 'delete', posting)
+
+            # The benchmark's transaction never commits, so buffered events are
+            # never handed to the writer: this is the request's share only
+            with override_settings(ACTIVITY_LOG_SYNC=sync):
+                self.stdout.write(f"activity log {mode}")
+                self.time_it('apply', lambda: call(apply, 'post', next(postings)), repeat)
+                self.time_it('bookmark + remove', bookmark_round_trip, repeat)
+
+    def bench_activity_log(self, rows, repeat, **options):
+        """One user's activity log with `rows` entries over a year: page numbers vs. keyset pages."""
+        # Monthly partitions for the whole year, as maintain_activity_log would have made them
+        create_partitions(months_ahead=13, today=add_months(month_start(), -12))
+        user = seed_recruiter('bench_logger')
+        actions = [choice for choice, _ in ActivityLog.ACTION_CHOICES]
+        now = timezone.now()
+        step = timedelta(days=365) / rows
+        self.stdout.write(f"Seeding {rows} activity log rows...")
+        for start in range(0, rows, 50_000):
+            ActivityLog.objects.bulk_create([
+                ActivityLog(
+                    user=user, action=random.choice(actions), related_object_id=random.randrange(1, 10_000),
+                    details=' '.join(random.choices(WORDS, k=8)), timestamp=now - step * i,
+                )
+                for i in range(start, min(rows, start + 50_000))
+            ], batch_size=5000)
+        self.analyze(ActivityLog)
+
+        factory = APIRequestFactory()
+        view = UserActivityLogListView.as_view()
+
+        def fetch(params):
+            request = factory.get('/activity_logs/', params)
+            force_authenticate(request, user=user)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            return response.data
+
+        def deep_cursor(params, pages=50):
+            # The cursor a user reaches after paging `pages` pages in
+            data = fetch(params)
+            for _ in range(pages - 1):
+                data = fetch({**params, 'cursor': parse_qs(urlparse(data['next']).query)['cursor'][0]})
+            return parse_qs(urlparse(data['next']).query)['cursor'][0]
+
+        week = {
+            'start_date': (now - timedelta(days=190)).isoformat(),
+            'end_date': (now - timedelta(days=183)).isoformat(),
+        }
+        cases = [
+            ('page 1 (page numbers + COUNT)', {'pagination': 'page'}),
+            ('page 51 (OFFSET 500 + COUNT)', {'pagination': 'page', 'page': 51}),
+            ('page 1 (keyset)', {}),
+            ('page 51 (keyset seek)', {'cursor': deep_cursor({})}),
+            ('action=login page 1 (keyset)', {'action': 'login'}),
+            ('action=login page 51 (keyset)', {'action': 'login', 'cursor': deep_cursor({'action': 'login'})}),
+            ('one week, half a year back (keyset)', week),
+        ]
+        for label, params in cases:
+            self.time_it(label, lambda: fetch(params), repeat)
+
+    def bench_write_count(self, rows, repeat, **options):
+        """Statements and rows written per login and per profile/internship edit, with latency."""
+        recruiter = seed_recruiter('bench_editor')
+        posting = seed_internships(recruiter, 1)[0]
+        factory = APIRequestFactory()
+        edit_profile, edit_internship = ProfileUpdateView.as_view(), InternshipEditView.as_view()
+
+        def patch(view, data, **kwargs):
+            request = factory.patch('/', data, format='json')
+            force_authenticate(request, user=recruiter)
+            response = view(request, **kwargs)
+            assert response.status_code == 200, response.data
+
+        bios = iter(range(10 ** 9))
+        cases = [
+            ('login (last_login)', lambda: update_last_login(None, User.objects.get(pk=recruiter.pk))),
+            ('profile edit, same values', lambda: patch(edit_profile, {'location': 'Pune'})),
+            ('profile edit, one field', lambda: patch(edit_profile, {'bio': f'Bio {next(bios)}'})),
+            ('internship edit, same values', lambda: patch(edit_internship, {'title': posting.title}, pk=posting.pk)),
+            ('internship edit, one field', lambda: patch(edit_internship, {'stipend': next(bios)}, pk=posting.pk)),
+        ]
+        patch(edit_profile, {'location': 'Pune'})
+        with override_settings(ACTIVITY_LOG_SYNC=True):
+            for label, fn in cases:
+                with CaptureQueriesContext(connection) as queries:
+                    fn()
+                writes = [query['sql'] for query in queries if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+                self.stdout.write(f"{label}: {len(queries)} queries, {len(writes)} writes")
+                for sql in writes:
+                    self.stdout.write(f"    {sql[:100]}")
+                self.time_it(label, fn, repeat)
+
+    def bench_auth(self, rows, repeat, **options):
+        """Queries and latency of token-authenticated requests: User + Profile loads vs. role claims."""
+        self.stdout.write(f"Seeding {rows} internships...")
+        recruiter = seed_recruiter('bench_auth_recruiter')
+        postings = seed_internships(recruiter, rows)
+        student = User.objects.create_user(username='bench_auth_student', password='bench-password')
+        student.profile.role = 'student'
+        student.profile.save()
+        self.analyze(Internship)
+        ids = ','.join(str(posting.pk) for posting in postings[:20])
+
+        factory = APIRequestFactory()
+        cases = [
+            ('my posted internships', MyPostedInternshipsView, recruiter, {}),
+            ('internship list (student)', InternshipListView, student, {}),
+            ('viewer state, 20 ids', ViewerStateView, student, {'ids': ids}),
+        ]
+        for mode, authentication in (('User + Profile', JWTAuthentication), ('role claims', RoleJWTAuthentication)):
+            self.stdout.write(f"authentication: {mode}")
+            for label, view_class, user, params in cases:
+                view = view_class.as_view(authentication_classes=[authentication])
+                access = str(RoleRefreshToken.for_user(user).access_token)
+
+                def call():
+                    response = view(factory.get('/', params, HTTP_AUTHORIZATION=f'Bearer {access}'))
+                    assert response.status_code == 200, response.data
+
+                call()
+                with CaptureQueriesContext(connection) as queries:
+                    call()
+                self.time_it(f'{label} ({len(queries)} queries)', call, repeat)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from internship.cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the anonymous response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write("Counters reset.")
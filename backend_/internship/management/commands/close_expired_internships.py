@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from internship.cache import bump_generation
+from internship.models import Internship
+
+
+class Command(BaseCommand):
+    help = (
+        "Close open internships whose expiry date has passed. Runs chunked bulk "
+        "UPDATEs (no per-row saves, signals or activity logs); schedule it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows closed per UPDATE.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many postings would close.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f"{Internship.objects.expired().count()} expired internships would be closed.")
+            return
+
+        closed = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    Internship.objects.expired()
+                    .order_by('id')
+                    .select_for_update(skip_locked=True)
+                    .values_list('id', flat=True)[:options['batch_size']]
+                )
+                if not ids:
+                    break
+                closed += Internship.objects.filter(id__in=ids).update(
+                    status='closed', updated_at=timezone.now()
+                )
+
+        if closed:
+            bump_generation('internship')
+        self.stdout.write(self.style.SUCCESS(f"Closed {closed} expired internships."))
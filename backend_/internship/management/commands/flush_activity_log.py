@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from internship.activity import replay_spool
+
+
+class Command(BaseCommand):
+    help = (
+        "Write activity log events left in ACTIVITY_LOG_SPOOL_DIR by failed "
+        "batch writes or by processes that died before flushing their buffer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--spool-dir', help='Spool directory (defaults to ACTIVITY_LOG_SPOOL_DIR).')
+
+    def handle(self, *args, **options):
+        written = replay_spool(options['spool_dir'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} activity log events."))
@@ -0,0 +1,54 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from internship.importer import CHUNK_SIZE, FORMATS, ImportFailed, detect_format, import_internships, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import internships for a recruiter from CSV, a JSON array or NDJSON. "
+        "Rows are validated and inserted in chunks inside one transaction; "
+        "invalid rows are skipped and reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin.")
+        parser.add_argument('--recruiter', required=True, help='Username of the posting recruiter.')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension).')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows validated and inserted per batch.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; write nothing.')
+
+    def handle(self, *args, **options):
+        try:
+            recruiter = User.objects.select_related('profile').get(username=options['recruiter'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['recruiter']!r}.")
+        if recruiter.profile.role != 'recruiter':
+            raise CommandError(f"{recruiter.username} is not a recruiter.")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(filename=path)
+        if fmt is None:
+            raise CommandError(f"Cannot tell the format of {path!r}; pass --format.")
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            report = import_internships(
+                read_records(stream, fmt), recruiter,
+                chunk_size=options['chunk_size'], dry_run=options['dry_run'],
+            )
+        except ImportFailed as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        verb = 'would be created' if options['dry_run'] else 'created'
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} internships {verb}, {report['failed']} rows rejected."
+        ))
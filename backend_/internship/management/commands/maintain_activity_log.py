@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from internship.partitions import create_partitions, expire
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly activity log partitions and expire months past "
+        "the retention period: archived as gzipped NDJSON in the default storage, "
+        "then dropped as whole partitions. Schedule it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3, help='Months of partitions to create in advance.')
+        parser.add_argument(
+            '--retain-months', type=int, default=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+            help='Full months kept before the current one.',
+        )
+        parser.add_argument('--no-archive', action='store_true', help='Drop expired months without archiving them.')
+
+    def handle(self, *args, **options):
+        for name in create_partitions(months_ahead=options['months_ahead']):
+            self.stdout.write(f"Created partition {name}.")
+        expired = expire(options['retain_months'], keep_archive=not options['no_archive'])
+        for month, rows, stored in expired:
+            rows = 'all rows' if rows is None else f"{rows} rows"
+            self.stdout.write(f"Expired {month:%Y-%m} ({rows}){f', archived to {stored}' if stored else ''}.")
+        self.stdout.write(self.style.SUCCESS(f"Expired {len(expired)} months of activity logs."))
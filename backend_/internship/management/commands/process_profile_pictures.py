@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from internship.models import Profile
+from internship.thumbnails import process_profile_picture
+
+
+class Command(BaseCommand):
+    help = (
+        "Make the resized renditions of profile pictures that have none yet, "
+        "e.g. when a process died before its background task ran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Redo every picture (after RENDITIONS changed).')
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.exclude(profile_picture_path__isnull=True).exclude(profile_picture_path='')
+        if not options['all']:
+            profiles = profiles.filter(profile_picture_renditions={})
+        done = failed = 0
+        for pk, name in profiles.values_list('pk', 'profile_picture_path').iterator():
+            try:
+                process_profile_picture(pk, name)
+                done += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Profile {pk} ({name}): {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Processed {done} profile pictures, {failed} failed."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from internship.counters import repair_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Internship.applications_count and bookmarks_count from the "
+        "Application and Bookmark tables. Needed after bulk writes that skip signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Internships checked per batch.')
+
+    def handle(self, *args, **options):
+        fixed = repair_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters of {fixed} internships."))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:24
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.search import SearchVector
+    Internship = apps.get_model('internship', 'Internship')
+    Internship.objects.using(schema_editor.connection.alias).update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('company', weight='B', config='english')
+        + SearchVector('location', 'internship_type', weight='C', config='english')
+        + SearchVector('description', weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0008_alter_profile_role'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='internship',
+            name='internship_type',
+            field=models.CharField(choices=[('full-time', 'Full-time'), ('part-time', 'Part-time'), ('remote', 'Remote'), ('on-site', 'On-site')], max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='internship_search_gin'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+# `location__icontains` compiles to UPPER(location) LIKE UPPER('%term%'), which
+# only a trigram index on the same expression can serve. pg_trgm is optional:
+# hosts without it still migrate, they just keep scanning for that filter.
+CREATE_LOCATION_TRGM = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS internship_location_trgm
+            ON internship_internship USING gin (UPPER(location::text) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+
+def create_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_LOCATION_TRGM)
+
+
+def drop_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS internship_location_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0009_internship_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['-posted_on', '-id'], name='internship_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['location', '-posted_on'], name='internship_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['internship_type', '-posted_on'], name='internship_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['status', '-posted_on'], name='internship_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['recruiter', '-posted_on'], name='internship_recruiter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['stipend', 'id'], name='internship_stipend_idx'),
+        ),
+        migrations.RunPython(create_location_trigram_index, drop_location_trigram_index),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Trigram indexes backing autocomplete's fuzzy matches (`trigram_word_similar`).
+# Like internship_location_trgm they are only created where pg_trgm is available.
+CREATE_TRGM_INDEXES = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS internship_title_trgm
+            ON internship_internship USING gin (title gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS internship_company_trgm
+            ON internship_internship USING gin (company gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS internship_location_word_trgm
+            ON internship_internship USING gin (location gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRGM_INDEXES)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in ('internship_title_trgm', 'internship_company_trgm', 'internship_location_word_trgm'):
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0010_internship_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0011_internship_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='internship',
+            name='internship_location_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='internship',
+            name='internship_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='internship',
+            name='internship_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='internship',
+            name='internship_stipend_idx',
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open'), _negated=True), fields=['status', '-posted_on'], name='internship_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-posted_on', '-id'], name='internship_open_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['location', '-posted_on'], name='internship_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['internship_type', '-posted_on'], name='internship_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['stipend', 'id'], name='internship_stipend_idx'),
+        ),
+    ]
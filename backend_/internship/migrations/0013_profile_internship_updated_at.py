@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0012_internship_open_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:27
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Internship = apps.get_model('internship', 'Internship')
+
+    def actual(model_name):
+        rows = (
+            apps.get_model('internship', model_name).objects.filter(internship=OuterRef('pk'))
+            .order_by().values('internship').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+    Internship.objects.update(applications_count=actual('Application'), bookmarks_count=actual('Bookmark'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0013_profile_internship_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='bookmarks_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-applications_count', '-id'], name='internship_applications_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-bookmarks_count', '-id'], name='internship_bookmarks_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0014_internship_popularity_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='profile_picture_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
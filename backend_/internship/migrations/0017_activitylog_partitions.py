@@ -0,0 +1,84 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:12
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = 'internship_activitylog'
+
+
+def partition_activity_log(apps, schema_editor):
+    """
+    PostgreSQL only: rebuild the table as one partitioned by month of
+    `timestamp` (primary key (id, timestamp)), with a partition for every
+    month that has rows, the current month and a default partition. Indexes
+    and foreign keys are carried over. SQLite keeps the plain table.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE])
+        if cursor.fetchone()[0] == 'p':
+            return
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s", [TABLE, f'{TABLE}_pkey'],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'''SELECT DISTINCT date_trunc('month', "timestamp" AT TIME ZONE 'UTC')::date FROM {TABLE}''')
+        months = {row[0] for row in cursor.fetchall()} | {datetime.date.today().replace(day=1)}
+
+        cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq_new")
+        cursor.execute(f'''
+            CREATE TABLE {TABLE}_new (LIKE {TABLE} INCLUDING CONSTRAINTS, PRIMARY KEY (id, "timestamp"))
+            PARTITION BY RANGE ("timestamp")
+        ''')
+        cursor.execute(f"ALTER TABLE {TABLE}_new ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq_new')")
+        for month in sorted(months):
+            following = (month + datetime.timedelta(days=32)).replace(day=1)
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_y{month:%Y}m{month:%m} PARTITION OF {TABLE}_new "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00+00') TO ('{following:%Y-%m-%d} 00:00+00')"
+            )
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE}_new DEFAULT")
+        cursor.execute(f"INSERT INTO {TABLE}_new SELECT * FROM {TABLE}")
+
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE}_new RENAME TO {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {TABLE}_new_pkey TO {TABLE}_pkey")
+        cursor.execute(f"ALTER SEQUENCE {TABLE}_id_seq_new RENAME TO {TABLE}_id_seq")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+        cursor.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+        cursor.execute(f"SELECT setval('{TABLE}_id_seq', COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {TABLE}")
+        for indexdef in indexes:
+            cursor.execute(indexdef)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0016_activitylog_event_timestamp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='activitylog_user_time_idx'),
+        ),
+        migrations.RunPython(partition_activity_log, migrations.RunPython.noop),
+    ]
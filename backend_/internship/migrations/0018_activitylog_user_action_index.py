@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0017_activitylog_partitions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', 'action', '-timestamp', '-id'], name='activitylog_user_action_idx'),
+        ),
+    ]
@@ -1,11 +1,100 @@
+import copy
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, router
+from django.db.models import DEFERRED, Q
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 
+# --------------------------
+# CHANGE TRACKING
+# --------------------------
+def _comparable(value):
+    # Files compare by name; JSON is copied so in-place edits show up as changes
+    if isinstance(value, FieldFile):
+        return value.name or None
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class ChangeTrackingModel(models.Model):
+    """
+    Remembers the values a row was loaded or last saved with. Saving an
+    existing row writes only the fields that differ from them (plus auto_now
+    fields), and nothing at all, without sending signals, when none do.
+    During post_save and until the next save, `saved_changes` is
+    {field name: (old, new)} for the fields written; empty for a new row.
+    """
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember()
+        return instance
+
+    def _remember(self, attnames=None):
+        # `attnames` None means every loaded field
+        if attnames is None or not hasattr(self, '_saved_values'):
+            self._saved_values = {}
+        deferred = self.get_deferred_fields()
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred or attnames is not None and field.attname not in attnames:
+                continue
+            self._saved_values[field.attname] = _comparable(field.value_from_object(self))
+
+    def changes(self):
+        """{field name: (old, new)} for the fields changed since the row was loaded or saved."""
+        saved = getattr(self, '_saved_values', None)
+        if saved is None or self._state.adding:
+            return {}
+        deferred = self.get_deferred_fields()
+        changes = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or getattr(field, 'auto_now', False) or field.attname in deferred:
+                continue
+            new = _comparable(field.value_from_object(self))
+            # A field that was deferred when loaded has no known old value
+            old = saved.get(field.attname, DEFERRED)
+            if old is DEFERRED or old != new:
+                changes[field.name] = (old, new)
+        return changes
+
+    def save(self, *args, **kwargs):
+        if (self._state.adding or self.pk is None or kwargs.get('force_insert')
+                or not hasattr(self, '_saved_values')):
+            self.saved_changes = {}
+            super().save(*args, **kwargs)
+            self._remember()
+            return
+        changes = self.changes()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            auto_now = [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+            # An empty list makes Model.save() return without a query
+            kwargs['update_fields'] = [*changes, *auto_now] if changes else []
+        else:
+            names = {self._meta.get_field(name).name for name in update_fields}
+            changes = {name: change for name, change in changes.items() if name in names}
+        self.saved_changes = changes
+        super().save(*args, **kwargs)
+        self._remember({self._meta.get_field(name).attname for name in kwargs['update_fields']})
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember(None if fields is None else {
+            field.attname for field in map(self._meta.get_field, fields) if field.concrete
+        })
+
+
 # --------------------------
 # USER PROFILE
 # --------------------------
-class Profile(models.Model):
+class Profile(ChangeTrackingModel):
     """
     Extends the default Django User model to store additional profile information.
     """
@@ -21,13 +110,41 @@ class Profile(models.Model):
     profile_picture_path = models.CharField(max_length=255, blank=True, null=True)
     # profile_picture_url can store an external URL (e.g., from cloud storage)
     profile_picture_url = models.URLField(blank=True, null=True)
+    # Resized copies of the picture, {rendition: URL} (see thumbnails.py)
+    profile_picture_renditions = models.JSONField(default=dict, blank=True)
     bio = models.TextField(blank=True)
     location = models.CharField(max_length=255, blank=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Bumped to revoke the user's access tokens (see authentication.py)
+    auth_version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.user.username}'s profile"
 
+
+class TokenUser(User):
+    """
+    The user of a request authenticated by an access token, built from its
+    claims without a query (see authentication.py): only `id` is loaded and
+    `role` comes from the token. Reading any other field loads them all.
+    """
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, role):
+        user = cls.from_db(router.db_for_read(User), ['id'], [user_id])
+        user.role = role
+        return user
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # One query for all deferred fields rather than one per field read
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
 # Access:
 # - Users can view and update their own profile
 # - Admins can manage all profiles
@@ -35,7 +152,18 @@ class Profile(models.Model):
 # --------------------------
 # INTERNSHIP
 # --------------------------
-class Internship(models.Model):
+class InternshipQuerySet(models.QuerySet):
+    def open(self):
+        """Open postings that have not passed their expiry date."""
+        today = timezone.localdate()
+        return self.filter(Q(expiry_date__isnull=True) | Q(expiry_date__gte=today), status='open')
+
+    def expired(self):
+        """Postings still marked open although their expiry date has passed."""
+        return self.filter(status='open', expiry_date__lt=timezone.localdate())
+
+
+class Internship(ChangeTrackingModel):
     """
     Represents an internship posted by a recruiter.
     """
@@ -62,6 +190,34 @@ class Internship(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
     expiry_date = models.DateField(null=True, blank=True)
     recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='internships')
+    updated_at = models.DateTimeField(auto_now=True)
+    # Popularity counters, maintained by signals (see counters.py)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+    bookmarks_count = models.PositiveIntegerField(default=0, editable=False)
+    # Weighted full-text document, maintained by signals (see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = InternshipQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='internship_search_gin'),
+            # Any-status ordering and keyset pagination
+            models.Index(fields=['-posted_on', '-id'], name='internship_posted_idx'),
+            # Closed/archived history (open rows are covered by the indexes below)
+            models.Index(fields=['status', '-posted_on'], condition=~Q(status='open'), name='internship_status_idx'),
+            # MyPostedInternshipsView
+            models.Index(fields=['recruiter', '-posted_on'], name='internship_recruiter_idx'),
+            # The public list only shows open postings; partial indexes keep
+            # closed and archived history out of its working set.
+            models.Index(fields=['-posted_on', '-id'], condition=Q(status='open'), name='internship_open_posted_idx'),
+            models.Index(fields=['location', '-posted_on'], condition=Q(status='open'), name='internship_location_idx'),
+            models.Index(fields=['internship_type', '-posted_on'], condition=Q(status='open'), name='internship_type_idx'),
+            models.Index(fields=['stipend', 'id'], condition=Q(status='open'), name='internship_stipend_idx'),
+            # Popularity ordering of the public list
+            models.Index(fields=['-applications_count', '-id'], condition=Q(status='open'), name='internship_applications_idx'),
+            models.Index(fields=['-bookmarks_count', '-id'], condition=Q(status='open'), name='internship_bookmarks_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -74,7 +230,7 @@ class Internship(models.Model):
 # --------------------------
 # APPLICATION
 # --------------------------
-class Application(models.Model):
+class Application(ChangeTrackingModel):
     """
     Stores applications made by students for internships.
     """
@@ -146,14 +302,25 @@ class ActivityLog(models.Model):
         ('password_changed', 'Password Changed'),
     )
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activity_logs')
+    # Indexed together with the timestamp below
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activity_logs', db_index=False)
     action = models.CharField(max_length=50, choices=ACTION_CHOICES)
     related_object_id = models.PositiveIntegerField(null=True, blank=True)  # e.g., internship or application ID
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # When it happened, not when the (buffered) row was written; see activity.py
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     details = models.TextField(blank=True)  # optional JSON/details as string
 
     class Meta:
         ordering = ['-timestamp']
+        # On PostgreSQL the table is partitioned by month of `timestamp`, with
+        # primary key (id, timestamp); see partitions.py
+        indexes = [
+            # A user's activity, newest first, optionally of one action
+            # (UserActivityLogListView): filter, date range and keyset seek
+            # are all one index range scan
+            models.Index(fields=['user', '-timestamp', '-id'], name='activitylog_user_time_idx'),
+            models.Index(fields=['user', 'action', '-timestamp', '-id'], name='activitylog_user_action_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.action} at {self.timestamp}"
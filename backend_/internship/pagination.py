@@ -0,0 +1,177 @@
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from functools import reduce
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Row count from the PostgreSQL planner estimate instead of a COUNT(*) scan.
+    Other backends get an exact count.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ListPagination(PageNumberPagination):
+    """
+    Default pagination for every list view.
+
+    Without extra parameters this is plain page-number pagination
+    (`?page=N`, with `count`/`next`/`previous`), which is what the frontend
+    relies on to compute `totalPages`.
+
+    Views that declare `cursor_ordering` (e.g. `('-posted_on', '-id')`) also
+    support keyset pagination, enabled with `?pagination=cursor` or by
+    following an opaque `?cursor=` link. Views with
+    `default_pagination = 'cursor'` start out in cursor mode and take
+    `?pagination=page` for page numbers. In cursor mode:
+    - rows are ordered by `cursor_ordering` (the trailing unique field breaks ties)
+      and each page seeks from the previous position instead of using OFFSET;
+    - a request ordered any other way (`?ordering=stipend`, search rank) gets
+      a 400: the keyset only follows `cursor_ordering`, so such lists are
+      paged by number;
+    - no COUNT(*) runs unless asked for with `?count=exact` or `?count=estimate`;
+      `has_more` tells whether a next page exists.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'cursor_ordering', None)
+        mode = request.query_params.get(self.mode_query_param, getattr(view, 'default_pagination', 'page'))
+        self.cursor_mode = bool(ordering) and (
+            mode == 'cursor' or bool(request.query_params.get(self.cursor_query_param))
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        if not self.follows(queryset, ordering):
+            raise ValidationError({self.mode_query_param: [
+                "Cursor pagination is only available in the default order; use page numbers with this ordering."
+            ]})
+
+        self.request = request
+        self.ordering = tuple(ordering)
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        self.count = None
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            self.count = queryset.count()
+        elif count_mode == 'estimate':
+            self.count = estimate_count(queryset)
+
+        order = self._reversed(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(order, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page_rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['has_more'] = self.has_next
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.page_rows[0], reverse=True)
+
+    # --------------------------
+    # CURSOR HELPERS
+    # --------------------------
+
+    @staticmethod
+    def follows(queryset, ordering):
+        """True if the queryset's ordering so far is a prefix of `ordering`."""
+        current = tuple(queryset.query.order_by)
+        return current == tuple(ordering[:len(current)])
+
+    @staticmethod
+    def _reversed(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _seek_filter(ordering, position):
+        """
+        Rows strictly after `position` in `ordering`, i.e. the expansion of
+        (a, b) > (va, vb): a > va OR (a = va AND b > vb). The leading a >= va
+        bound lets the database range-scan an index on the ordering columns.
+        """
+        clauses = []
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {f.lstrip('-'): position[j] for j, f in enumerate(ordering[:i])}
+            clauses.append(Q(**equal, **{f'{name}__{lookup}': position[i]}))
+        first = ordering[0].lstrip('-')
+        bound = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{first}__{bound}': position[0]}) & reduce(lambda a, b: a | b, clauses)
+
+    def _link(self, row, reverse):
+        values = [getattr(row, field.lstrip('-')) for field in self.ordering]
+        payload = {'p': [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]}
+        if reverse:
+            payload['r'] = 1
+        token = b64encode(json.dumps(payload).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(b64decode(token.encode(), validate=True))
+            raw = payload['p']
+            if len(raw) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, raw)
+            ]
+        except Exception:
+            raise NotFound("Invalid cursor.")
+        return position, bool(payload.get('r'))
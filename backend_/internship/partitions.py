@@ -0,0 +1,181 @@
+import datetime
+import gzip
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+# --------------------------
+# ACTIVITY LOG PARTITIONS
+# --------------------------
+# On PostgreSQL the activity log is partitioned by calendar month (UTC) of
+# `timestamp` (migration 0017), plus a default partition that catches rows
+# no monthly partition covers. The maintain_activity_log command, run daily,
+# creates partitions ahead of time and expires old months: each is detached,
+# written to a gzipped NDJSON archive in the default storage, then dropped
+# whole. Rows that ended up in the default partition, or anywhere on
+# SQLite's plain table, are archived the same way and removed with one
+# DELETE per month.
+
+TABLE = ActivityLog._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_y(\d{{4}})m(\d{{2}})$')
+ARCHIVE_FIELDS = ('id', 'user_id', 'action', 'related_object_id', 'timestamp', 'details')
+CHUNK_SIZE = 5000
+
+
+def month_start(day=None):
+    return (day or timezone.now().date()).replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def bounds(month):
+    """[start, end) of a month as aware UTC datetimes."""
+    start = datetime.datetime.combine(month, datetime.time(), datetime.timezone.utc)
+    return start, datetime.datetime.combine(add_months(month, 1), datetime.time(), datetime.timezone.utc)
+
+
+def partition_name(month):
+    return f'{TABLE}_y{month:%Y}m{month:%m}'
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE])
+        return cursor.fetchone()[0] == 'p'
+
+
+def monthly_partitions():
+    """{month: (table name, attached)}, including partitions detached but not yet dropped."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, i.inhparent IS NOT NULL
+            FROM pg_class c LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+            WHERE c.relkind = 'r' AND c.relnamespace = current_schema()::regnamespace AND c.relname LIKE %s
+            """,
+            [f'{TABLE}_y%'],
+        )
+        found = {}
+        for name, attached in cursor.fetchall():
+            match = PARTITION_NAME.match(name)
+            if match:
+                found[datetime.date(int(match[1]), int(match[2]), 1)] = (name, attached)
+        return found
+
+
+def create_partitions(months_ahead=3, today=None):
+    """
+    Create the monthly partitions from this month to `months_ahead` months
+    on. Rows already in the default partition for a new month move into it.
+    Returns the names created; nothing to do on an unpartitioned table.
+    """
+    if not is_partitioned():
+        return []
+    this_month = month_start(today)
+    existing = monthly_partitions()
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        start, end = (f"'{value.isoformat()}'" for value in bounds(month))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= {start} AND "timestamp" < {end} RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """)
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})")
+        created.append(name)
+    return created
+
+
+def _table_rows(name):
+    # Server-side cursor, which has to stay in one transaction behind a pooler
+    with transaction.atomic(), connection.chunked_cursor() as cursor:
+        columns = ', '.join(f'"{field}"' for field in ARCHIVE_FIELDS)
+        cursor.execute(f'SELECT {columns} FROM {name} ORDER BY "timestamp", id')
+        while rows := cursor.fetchmany(CHUNK_SIZE):
+            yield from rows
+
+
+def _queryset_rows(queryset):
+    with transaction.atomic():
+        yield from queryset.order_by('timestamp', 'id').values_list(*ARCHIVE_FIELDS).iterator(chunk_size=CHUNK_SIZE)
+
+
+def archive(month, rows):
+    """
+    Write `rows` (tuples in ARCHIVE_FIELDS order) as gzipped NDJSON to the
+    default storage. Returns (stored name, row count); no file for no rows.
+    """
+    encoder = DjangoJSONEncoder()
+    count = 0
+    with tempfile.TemporaryFile() as buffer:
+        with gzip.open(buffer, 'wt', encoding='utf-8') as output:
+            for row in rows:
+                output.write(encoder.encode(dict(zip(ARCHIVE_FIELDS, row))) + '\n')
+                count += 1
+        if not count:
+            return None, 0
+        buffer.seek(0)
+        name = default_storage.save(
+            f'{settings.ACTIVITY_LOG_ARCHIVE_PREFIX}/activitylog-{month:%Y-%m}.ndjson.gz', File(buffer),
+        )
+    return name, count
+
+
+def expire(retain_months, keep_archive=True, today=None):
+    """
+    Remove activity older than the `retain_months` months before this one,
+    a month at a time, archiving it first unless `keep_archive` is false.
+    Returns [(month, rows, archive name)].
+    """
+    cutoff = add_months(month_start(today), -retain_months)
+    expired = []
+
+    if is_partitioned():
+        for month, (name, attached) in sorted(monthly_partitions().items()):
+            if month >= cutoff:
+                continue
+            if attached:
+                # From here on, late rows for this month land in the default partition
+                with connection.cursor() as cursor:
+                    cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            if keep_archive:
+                stored, rows = archive(month, _table_rows(name))
+            else:
+                stored, rows = None, None
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {name}")
+            expired.append((month, rows, stored))
+
+    # The default partition, or the whole table when it isn't partitioned
+    old = ActivityLog.objects.filter(timestamp__lt=bounds(cutoff)[0])
+    while oldest := old.order_by('timestamp').values_list('timestamp', flat=True).first():
+        month = month_start(oldest.astimezone(datetime.timezone.utc).date())
+        start, end = bounds(month)
+        rows = old.filter(timestamp__gte=start, timestamp__lt=end)
+        # Rows written while this runs (a replayed spool, say) wait for the next run
+        rows = rows.filter(id__lte=rows.order_by('-id').values_list('id', flat=True).first())
+        stored = archive(month, _queryset_rows(rows))[0] if keep_archive else None
+        deleted = rows.delete()[0]  # one DELETE: nothing cascades from activity logs
+        expired.append((month, deleted, stored))
+    return expired
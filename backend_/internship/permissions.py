@@ -1,19 +1,24 @@
 from rest_framework.permissions import BasePermission
 
+from .models import TokenUser
+
+
+def role_of(user):
+    """
+    The user's role: from the access token's claims when it has them (see
+    authentication.py), otherwise from the profile.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    if isinstance(user, TokenUser):
+        return user.role
+    profile = getattr(user, 'profile', None)
+    return profile and profile.role
+
 class IsRecruiter(BasePermission):
     def has_permission(self, request, view):
-        return bool(
-            request.user and 
-            request.user.is_authenticated and
-            hasattr(request.user, 'profile') and
-            request.user.profile.role == 'recruiter'
-        )
+        return role_of(request.user) == 'recruiter'
 
 class IsStudent(BasePermission):
     def has_permission(self, request, view):
-        return bool(
-            request.user and
-            request.user.is_authenticated and
-            hasattr(request.user, 'profile') and
-            request.user.profile.role == 'student'
-        )
+        return role_of(request.user) == 'student'
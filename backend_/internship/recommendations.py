@@ -0,0 +1,434 @@
+import hashlib
+import string
+import threading
+import time
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+from scipy import sparse
+
+from .background import submit
+from .cache import get_cache, get_generation
+from .models import Application, Bookmark, Internship
+from .viewer_state import viewer_version
+
+# --------------------------
+# RECOMMENDATIONS
+# --------------------------
+# Open internships are kept as rows of an L2-normalized TF-IDF matrix in each
+# process (terms are hashed into a fixed number of columns, so the vocabulary
+# never has to be rebuilt). A student is turned into a query vector from their
+# bio and location plus the postings they applied to or bookmarked, and
+# ranking is one sparse matrix-vector product over every open posting.
+#
+# Local writes are applied from signals once the transaction commits. Writes
+# made by other processes are picked up by re-reading rows whose `updated_at`
+# moved, at most once per RECOMMENDATION_SYNC_INTERVAL seconds. IDF weights
+# are fixed when a row is added, so the matrix is rebuilt from scratch once
+# too many rows have changed since the last build.
+#
+# Builds take seconds on a large table, so they run on the background pool,
+# one at a time per process, and rebuilds keep the old matrix in service.
+# Until a process has its first matrix, students get `fallback_ids`: newest
+# postings, their own location first.
+
+N_FEATURES = 1 << 20
+# Times each field is counted in an internship's document
+FIELD_WEIGHTS = {'title': 3, 'company': 1, 'location': 1, 'internship_type': 1, 'description': 1}
+DOC_FIELDS = tuple(FIELD_WEIGHTS)
+
+BIO_WEIGHT = 1.0
+APPLIED_WEIGHT = 2.0
+BOOKMARKED_WEIGHT = 1.0
+HISTORY_LIMIT = 50  # most recent applications/bookmarks used for the profile
+
+LOCATION_BOOST = 0.15
+REMOTE_BOOST = 0.05
+RECENCY_BOOST = 0.05  # decays over RECENCY_DAYS; also orders cold-start results
+RECENCY_DAYS = 30
+
+MAX_RESULTS = 50
+MERGE_ROWS = 1024  # rows added since the last merge are kept in a small tail matrix
+REBUILD_RATIO = 0.25  # rebuild once this share of rows has been replaced
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our the their this '
+    'to we will with you your who what which work working intern internship'.split()
+)
+
+_SEPARATORS = str.maketrans({char: ' ' for char in string.punctuation + string.digits})
+
+
+def tokenize(text):
+    # translate + split is several times faster than a regex over 100k documents
+    return (text or '').casefold().translate(_SEPARATORS).split()
+
+
+@lru_cache(maxsize=100_000)
+def feature(token):
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') & (N_FEATURES - 1)
+
+
+def term_counts(values):
+    """Weighted term counts ({column: count}) of a {field: text} mapping."""
+    text = ' '.join(' '.join([values.get(field) or ''] * weight) for field, weight in FIELD_WEIGHTS.items())
+    counts = {}
+    for token, n in Counter(tokenize(text)).items():
+        if len(token) > 1 and token not in STOP_WORDS:
+            column = feature(token)
+            counts[column] = counts.get(column, 0) + n
+    return counts
+
+
+def location_key(location):
+    """Column-sized integer identifying a normalized location, -1 for none."""
+    key = ' '.join(tokenize(location))
+    return feature(key) if key else -1
+
+
+REMOTE = location_key('remote')
+
+_query_buffers = threading.local()  # see InternshipMatrix._scores
+
+
+class InternshipMatrix:
+    """Per-process TF-IDF matrix of open internships."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.synced_at = 0.0
+        self.watermark = None  # newest `updated_at` applied
+        self.rebuilding = False
+        self._reset()
+
+    def _reset(self):
+        self.df = np.zeros(N_FEATURES, dtype=np.int32)
+        self.n_docs = 0
+        self.matrix = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self.tail = []  # (columns, weights) rows not merged into `matrix` yet
+        self.tail_matrix = None
+        self.rows = {}  # internship id -> row number
+        self.meta = {'id': [], 'posted': [], 'expiry': [], 'location': [], 'remote': [], 'active': []}
+        self.arrays = None
+        self.replaced = 0
+
+    # --------------------------
+    # VECTORS
+    # --------------------------
+
+    def _idf(self, columns):
+        return np.log((1 + self.n_docs) / (1 + self.df[columns])) + 1
+
+    def vector(self, counts):
+        """L2-normalized TF-IDF (columns, weights) for {column: count} term counts."""
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = 1 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+        weights = tf * self._idf(columns)
+        weights /= np.linalg.norm(weights)
+        return columns, weights.astype(np.float32)
+
+    # --------------------------
+    # BUILD AND UPDATE
+    # --------------------------
+
+    def rebuild(self):
+        generation = get_generation('internship')
+        fields = ('id', *DOC_FIELDS, 'posted_on', 'expiry_date', 'updated_at')
+        docs = []
+        watermark = None
+        for row in Internship.objects.filter(status='open').values(*fields).iterator(chunk_size=5000):
+            docs.append((row, term_counts(row)))
+            if watermark is None or row['updated_at'] > watermark:
+                watermark = row['updated_at']
+
+        # TF-IDF for every document at once
+        lengths = np.fromiter((len(counts) for _, counts in docs), dtype=np.int64, count=len(docs))
+        columns = np.fromiter(
+            (column for _, counts in docs for column in counts), dtype=np.int64, count=int(lengths.sum()))
+        tf = 1 + np.log(np.fromiter(
+            (n for _, counts in docs for n in counts.values()), dtype=np.float64, count=len(columns)))
+        df = np.bincount(columns, minlength=N_FEATURES).astype(np.int32)
+        weights = tf * (np.log((1 + len(docs)) / (1 + df[columns])) + 1)
+        row_ids = np.repeat(np.arange(len(docs)), lengths)
+        norms = np.sqrt(np.bincount(row_ids, weights=weights * weights, minlength=len(docs)))
+        weights /= norms[row_ids]
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+
+        with self.lock:
+            self._reset()
+            self.df, self.n_docs = df, len(docs)
+            self.matrix = sparse.csr_matrix(
+                (weights.astype(np.float32), columns, indptr), shape=(len(docs), N_FEATURES),
+            )
+            for row, _ in docs:
+                self._add_meta(row)
+            self.generation, self.synced_at = generation, time.monotonic()
+            self.watermark = watermark or timezone.now()
+
+    def _add_meta(self, row):
+        self.rows[row['id']] = len(self.meta['id'])
+        expiry = row['expiry_date']
+        self.meta['id'].append(row['id'])
+        self.meta['posted'].append(row['posted_on'].timestamp())
+        self.meta['expiry'].append(expiry.toordinal() if expiry else date.max.toordinal())
+        location = location_key(row['location'])
+        self.meta['location'].append(location)
+        self.meta['remote'].append(row['internship_type'] == 'remote' or location == REMOTE)
+        self.meta['active'].append(True)
+        self.arrays = None
+
+    def _row_columns(self, index):
+        if index < self.matrix.shape[0]:
+            start, end = self.matrix.indptr[index], self.matrix.indptr[index + 1]
+            return self.matrix.indices[start:end]
+        return self.tail[index - self.matrix.shape[0]][0]
+
+    def _remove(self, pk):
+        index = self.rows.pop(pk, None)
+        if index is None:
+            return
+        self.df[self._row_columns(index)] -= 1
+        self.n_docs -= 1
+        self.meta['active'][index] = False
+        self.arrays = None
+        self.replaced += 1
+
+    def _add(self, row):
+        counts = term_counts(row)
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        self.df[columns] += 1
+        self.n_docs += 1
+        self.tail.append(self.vector(counts))
+        self.tail_matrix = None
+        self._add_meta(row)
+        if len(self.tail) >= MERGE_ROWS:
+            self.matrix = sparse.vstack([self.matrix, self._tail_matrix()], format='csr')
+            self.tail, self.tail_matrix = [], None
+
+    def _tail_matrix(self):
+        if self.tail_matrix is None:
+            indptr = np.cumsum([0] + [len(columns) for columns, _ in self.tail])
+            self.tail_matrix = sparse.csr_matrix(
+                (np.concatenate([weights for _, weights in self.tail]),
+                 np.concatenate([columns for columns, _ in self.tail]), indptr),
+                shape=(len(self.tail), N_FEATURES),
+            )
+        return self.tail_matrix
+
+    @staticmethod
+    def _as_row(instance):
+        return {field: getattr(instance, field) for field in ('id', *DOC_FIELDS, 'posted_on', 'expiry_date')}
+
+    def apply(self, pk, instance, generation):
+        """
+        Apply one committed change to internship `pk` (`instance` is None when
+        it was deleted), the same way `SuggestionIndex.apply` does.
+        """
+        with self.lock:
+            if self.generation is None:
+                return
+            self._remove(pk)
+            if instance is not None and instance.status == 'open':
+                self._add(self._as_row(instance))
+            if generation == self.generation + 1:
+                self.generation = generation
+
+    def _rebuild_in_background(self):
+        with self.lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+
+        def run():
+            try:
+                self.rebuild()
+            finally:
+                self.rebuilding = False
+        submit(run)
+
+    def ensure_fresh(self):
+        """Build or sync the matrix as needed; False while there is none to rank with."""
+        if self.generation is None:
+            self._rebuild_in_background()
+            return self.generation is not None  # built inline with BACKGROUND_TASKS_EAGER
+        interval = getattr(settings, 'RECOMMENDATION_SYNC_INTERVAL', 10)
+        if time.monotonic() - self.synced_at < interval:
+            return True
+        generation = get_generation('internship')
+        if generation != self.generation:
+            self.sync(generation)
+        else:
+            self.synced_at = time.monotonic()
+        return True
+
+    def sync(self, generation):
+        """
+        Re-read rows changed since the last sync (e.g. by another process).
+        Rows deleted elsewhere are only dropped by the next rebuild; callers
+        re-check results against the database.
+        """
+        fields = ('id', *DOC_FIELDS, 'posted_on', 'expiry_date', 'status', 'updated_at')
+        changed = list(Internship.objects.filter(updated_at__gt=self.watermark).values(*fields))
+        with self.lock:
+            for row in changed:
+                self._remove(row['id'])
+                if row['status'] == 'open':
+                    self._add(row)
+                self.watermark = max(self.watermark, row['updated_at'])
+            self.generation, self.synced_at = generation, time.monotonic()
+            stale = self.replaced > REBUILD_RATIO * max(len(self.rows), 1)
+        if stale:
+            self._rebuild_in_background()
+
+    # --------------------------
+    # RANKING
+    # --------------------------
+
+    def _arrays(self):
+        if self.arrays is None:
+            self.arrays = {
+                'id': np.array(self.meta['id'], dtype=np.int64),
+                'posted': np.array(self.meta['posted'], dtype=np.float64),
+                'expiry': np.array(self.meta['expiry'], dtype=np.int64),
+                'location': np.array(self.meta['location'], dtype=np.int64),
+                'remote': np.array(self.meta['remote'], dtype=bool),
+                'active': np.array(self.meta['active'], dtype=bool),
+            }
+        return self.arrays
+
+    def _query(self, profile):
+        """
+        L2-normalized (columns, weights) of a `StudentProfile`, over its own
+        hashed terms only (caller holds the lock).
+        """
+        vectors = [self.vector(counts) for counts, _ in profile.documents]
+        if not vectors:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        columns, inverse = np.unique(np.concatenate([columns for columns, _ in vectors]), return_inverse=True)
+        weights = np.bincount(inverse, minlength=len(columns), weights=np.concatenate([
+            weight * weights for (_, weight), (_, weights) in zip(profile.documents, vectors)
+        ]))
+        norm = np.linalg.norm(weights)
+        if norm:
+            weights /= norm
+        return columns, weights.astype(np.float32)
+
+    @staticmethod
+    def _scores(matrices, columns, weights):
+        # scipy's sparse @ sparse would turn the query into a CSR column with
+        # an N_FEATURES-long indptr, so the terms are scattered into a dense
+        # buffer kept per thread instead, and cleared again afterwards
+        buffer = getattr(_query_buffers, 'buffer', None)
+        if buffer is None:
+            buffer = _query_buffers.buffer = np.zeros(N_FEATURES, dtype=np.float32)
+        buffer[columns] = weights
+        try:
+            return np.concatenate([matrix @ buffer for matrix in matrices])
+        finally:
+            buffer[columns] = 0
+
+    def rank(self, profile, limit=MAX_RESULTS):
+        """
+        Ids of the best open, unexpired internships for a `StudentProfile`,
+        or None while the matrix is being built.
+        """
+        if not self.ensure_fresh():
+            return None
+        # Only the snapshot is taken under the lock: updates replace the
+        # matrices and arrays rather than change them, so the product runs
+        # alongside other requests and signal updates
+        with self.lock:
+            columns, weights = self._query(profile)
+            matrices = [self.matrix, self._tail_matrix()] if self.tail else [self.matrix]
+            arrays = self._arrays()
+            excluded = [self.rows[pk] for pk in profile.exclude if pk in self.rows]
+
+        scores = self._scores(matrices, columns, weights).astype(np.float64)
+
+        age_days = (time.time() - arrays['posted']) / 86400
+        scores += RECENCY_BOOST * np.exp(-np.maximum(age_days, 0) / RECENCY_DAYS)
+        if profile.location != -1:
+            scores += LOCATION_BOOST * (arrays['location'] == profile.location)
+        scores += REMOTE_BOOST * arrays['remote']
+
+        eligible = arrays['active'] & (arrays['expiry'] >= timezone.localdate().toordinal())
+        eligible[excluded] = False
+        scores[~eligible] = -np.inf
+
+        count = min(limit, int(eligible.sum()))
+        if not count:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.lexsort((-arrays['id'][top], -scores[top]))]
+        return arrays['id'][top].tolist()
+
+
+class StudentProfile:
+    """What a student's recommendations are computed from."""
+
+    def __init__(self, user):
+        profile = user.profile
+        self.location_name = profile.location
+        self.location = location_key(profile.location)
+        applied = list(
+            Application.objects.filter(user=user).order_by('-applied_on')
+            .values_list('internship_id', flat=True)[:HISTORY_LIMIT]
+        )
+        bookmarked = list(
+            Bookmark.objects.filter(user=user).order_by('-bookmarked_on')
+            .values_list('internship_id', flat=True)[:HISTORY_LIMIT]
+        )
+        self.exclude = set(applied) | set(bookmarked)
+
+        self.documents = []  # (term counts, weight)
+        own = term_counts({'description': profile.bio, 'location': profile.location})
+        if own:
+            self.documents.append((own, BIO_WEIGHT))
+        history = Internship.objects.filter(pk__in=self.exclude).values('id', *DOC_FIELDS)
+        for row in history:
+            weight = APPLIED_WEIGHT if row['id'] in applied else BOOKMARKED_WEIGHT
+            self.documents.append((term_counts(row), weight))
+
+
+internship_matrix = InternshipMatrix()
+
+
+def fallback_ids(profile, limit=MAX_RESULTS):
+    """Newest open postings, the student's location first, for before the matrix is built."""
+    queryset = Internship.objects.open().exclude(pk__in=profile.exclude)
+    local = Value(1, output_field=IntegerField())
+    if profile.location_name:
+        local = Case(When(location__iexact=profile.location_name, then=0), default=1, output_field=IntegerField())
+    return list(queryset.order_by(local, '-posted_on', '-id').values_list('id', flat=True)[:limit])
+
+
+def recommendation_cache_key(user):
+    version = (
+        get_generation('internship'), viewer_version(user),
+        user.profile.updated_at, timezone.localdate(),
+    )
+    digest = hashlib.sha256(repr(version).encode()).hexdigest()
+    return f'recommendations:{user.pk}:{digest}'
+
+
+def recommended_ids(user):
+    """Ranked internship ids for a student, cached until anything they depend on changes."""
+    cache = get_cache()
+    key = recommendation_cache_key(user)
+    ids = cache.get(key)
+    if ids is None:
+        profile = StudentProfile(user)
+        ids = internship_matrix.rank(profile)
+        if ids is None:
+            return fallback_ids(profile)  # not cached: the real ranking is on its way
+        cache.set(key, ids, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+    return ids
@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F
+from rest_framework import filters
+
+# --------------------------
+# FULL-TEXT SEARCH
+# --------------------------
+# On PostgreSQL every internship carries a weighted tsvector in
+# `Internship.search_vector` (GIN indexed). Other backends (SQLite in local
+# development and tests) fall back to DRF's plain `icontains` search, as do
+# searches made only of stop words ("the"), whose tsquery would be empty.
+
+SEARCH_CONFIG = 'english'
+
+# Fields that feed the search document; saves touching none of them skip the refresh.
+SEARCH_SOURCE_FIELDS = {'title', 'company', 'location', 'internship_type', 'description'}
+
+_TERM_RE = re.compile(r'[^\W_]+')
+
+
+def search_supported(using='default'):
+    """Full-text search needs PostgreSQL; anything else uses the fallback."""
+    return connections[using].vendor == 'postgresql'
+
+
+_trigram_available = {}
+
+
+def trigram_supported(using='default'):
+    """True when the pg_trgm extension is installed (checked once per database)."""
+    if using not in _trigram_available:
+        supported = search_supported(using)
+        if supported:
+            with connections[using].cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                supported = cursor.fetchone() is not None
+        _trigram_available[using] = supported
+    return _trigram_available[using]
+
+
+def internship_search_vector():
+    """
+    Weighted search document: title > company > location/type > description.
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('company', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('location', 'internship_type', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """
+    Recompute the search document for every internship in `queryset`
+    with a single UPDATE. No-op on backends without full-text search.
+    """
+    if not search_supported(queryset.db):
+        return 0
+    return queryset.update(search_vector=internship_search_vector())
+
+
+@lru_cache(maxsize=10_000)
+def is_stop_word(term, using='default'):
+    """True if SEARCH_CONFIG drops `term`, e.g. "the" (one query per term and database)."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT numnode(plainto_tsquery(%s::regconfig, %s)) = 0", [SEARCH_CONFIG, term])
+        return cursor.fetchone()[0]
+
+
+def query_terms(text):
+    return _TERM_RE.findall(text.lower())
+
+
+def build_search_query(text):
+    """
+    Turn free text into a prefix-matching tsquery ("data sci" -> data:* & sci:*),
+    so partially typed words match while the user is still typing.
+    Returns None when the text holds no searchable terms.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return None
+    raw = ' & '.join(f"{term}:*" for term in terms)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+class InternshipSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for `SearchFilter` that matches against the indexed
+    search vector and orders results by rank (then by the view's ordering).
+    Falls back to `SearchFilter` behaviour when full-text search is unavailable.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not search_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        text = ' '.join(search_terms)
+        query = build_search_query(text)
+        if query is None:
+            return queryset
+        if all(is_stop_word(term, queryset.db) for term in query_terms(text)):
+            # The tsquery would be empty and match nothing
+            return super().filter_queryset(request, queryset, view)
+
+        return (
+            queryset
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', *queryset.query.order_by)
+        )
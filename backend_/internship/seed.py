@@ -0,0 +1,85 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .models import Internship
+
+# --------------------------
+# SYNTHETIC DATA
+# --------------------------
+# Realistic-looking rows for benchmarks and query-plan tests. Everything is
+# inserted with bulk_create, so no signals (and no activity logs) fire.
+
+WORDS = (
+    'python django react data science machine learning backend frontend '
+    'analytics marketing design product research cloud devops security '
+    'mobile android ios finance sales content writing operations support'
+).split()
+TITLES = [
+    'Software Engineering Intern', 'Data Science Intern', 'Frontend Developer Intern',
+    'Backend Developer Intern', 'Product Design Intern', 'Marketing Intern',
+    'Machine Learning Intern', 'DevOps Intern', 'Content Writing Intern', 'Business Analyst Intern',
+]
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Wonka']
+LOCATIONS = [
+    'Bangalore', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai', 'Pune', 'Remote', 'Kolkata',
+    'Ahmedabad', 'Jaipur', 'Noida', 'Gurgaon', 'Kochi', 'Indore', 'Chandigarh', 'Lucknow',
+]
+# Postings past their expiry date have been closed or archived; a few
+# unexpired ones were closed early.
+EXPIRED_STATUS_WEIGHTS = {'closed': 70, 'archived': 30}
+EARLY_CLOSE_RATE = 0.05
+
+
+def seed_recruiter(username='bench_recruiter'):
+    user = User.objects.create_user(username=username, password='bench-password')
+    user.profile.role = 'recruiter'
+    user.profile.save()
+    return user
+
+
+def seed_users(count, prefix='bench_user'):
+    """Bulk insert plain users (no profiles, unusable passwords)."""
+    return User.objects.bulk_create([
+        User(username=f'{prefix}_{i}', password='!') for i in range(count)
+    ])
+
+
+def seed_internships(recruiters, rows, batch_size=5000, days=730):
+    """
+    Bulk insert `rows` internships spread over `recruiters` (a user or a list
+    of users) and over the last `days` days.
+    """
+    if isinstance(recruiters, User):
+        recruiters = [recruiters]
+    types = [choice for choice, _ in Internship.INTERNSHIP_TYPES]
+    statuses, weights = zip(*EXPIRED_STATUS_WEIGHTS.items())
+    now = timezone.now()
+    today = timezone.localdate()
+    created = []
+    for start in range(0, rows, batch_size):
+        batch = []
+        for _ in range(min(batch_size, rows - start)):
+            posted_on = now - timedelta(minutes=random.randrange(days * 24 * 60))
+            expiry_date = (posted_on + timedelta(days=random.randrange(15, 120))).date()
+            if expiry_date < today:
+                status = random.choices(statuses, weights)[0]
+            else:
+                status = 'closed' if random.random() < EARLY_CLOSE_RATE else 'open'
+            batch.append(Internship(
+                title=random.choice(TITLES),
+                company=random.choice(COMPANIES),
+                location=random.choice(LOCATIONS),
+                description=' '.join(random.choices(WORDS, k=60)),
+                stipend=Decimal(random.randrange(0, 50000, 500)) if random.random() > 0.1 else None,
+                internship_type=random.choice(types),
+                status=status,
+                posted_on=posted_on,
+                expiry_date=expiry_date,
+                recruiter=random.choice(recruiters),
+            ))
+        created += Internship.objects.bulk_create(batch)
+    return created
@@ -1,9 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
 from .models import *
-from .supabase_storage import upload_file, get_public_url
+from .background import run_in_background
+from .fieldsets import PreviewField, SparseFieldsetMixin
+from .storage import validate_file_size
+from .thumbnails import DEFAULT_RENDITION, process_profile_picture, rendition_url
+from .viewer_state import ViewerState, ViewerStateListSerializer
 import uuid
 
+PROFILE_PICTURE_MAX_SIZE = 5 * 1024 * 1024
+RESUME_MAX_SIZE = 10 * 1024 * 1024
+
 # ==========================
 # PROFILE SERIALIZERS
 # ==========================
@@ -19,18 +28,29 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def get_profile_picture_url(self, obj):
         """
-        Return the public URL of profile picture if exists.
+        Return the public URL of the profile picture rendition that fits the
+        context (`avatar_size`), or None while it is still being processed.
         """
-        return obj.profile_picture_url or None
+        url = rendition_url(obj, self.context.get('avatar_size', DEFAULT_RENDITION))
+        request = self.context.get('request')
+        if url and url.startswith('/') and request is not None:
+            url = request.build_absolute_uri(url)
+        return url
 
 
 class ProfileUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating user profile and uploading profile picture.
+    The original goes to the default storage (see storage.py); resized
+    renditions are made in the background (see thumbnails.py).
     """
+    profile_picture = serializers.ImageField(
+        write_only=True, required=False, validators=[validate_file_size(PROFILE_PICTURE_MAX_SIZE)]
+    )
+
     class Meta:
         model = Profile
-        fields = ['first_name', 'last_name', 'bio', 'location']
+        fields = ['first_name', 'last_name', 'bio', 'location', 'profile_picture']
         read_only_fields = ['role']
 
     def update(self, instance, validated_data):
@@ -40,14 +60,15 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
                 setattr(instance, attr, validated_data[attr])
 
         # Handle profile picture upload
-        request = self.context.get('request')
-        if request and hasattr(request, 'FILES') and 'profile_picture' in request.FILES:
-            profile_pic = request.FILES['profile_picture']
-            bucket_name = "profile_pics"
-            file_ext = profile_pic.name.split('.')[-1]
-            file_path = f"{instance.user.id}/{uuid.uuid4()}.{file_ext}"
-            upload_file(bucket_name, file_path, profile_pic)
-            instance.profile_picture_url = get_public_url(bucket_name, file_path)
+        profile_pic = validated_data.get('profile_picture')
+        if profile_pic is not None:
+            file_ext = profile_pic.name.rsplit('.', 1)[-1].lower()
+            name = default_storage.save(f"profile_pics/{instance.user.id}/{uuid.uuid4()}.{file_ext}", profile_pic)
+            previous = instance.profile_picture_path
+            instance.profile_picture_path = name
+            instance.profile_picture_url = None
+            instance.profile_picture_renditions = {}
+            run_in_background(process_profile_picture, instance.pk, name, previous)
 
         instance.save()
         return instance
@@ -119,25 +140,36 @@ class ChangePasswordSerializer(serializers.Serializer):
 # ==========================
 # INTERNSHIP SERIALIZER
 # ==========================
-class InternshipSerializer(serializers.ModelSerializer):
+class InternshipSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
-    Serializer for Internship model with optional bookmarked status.
+    Serializer for Internship model with the requesting student's
+    bookmarked/applied status (resolved per page, see viewer_state.py).
+    List views default to the compact card shape, with a description preview
+    instead of the full text (see fieldsets.py).
     """
     expiry_date = serializers.DateField(
         input_formats=['%Y-%m-%d', '%m/%d/%Y', '%d-%m-%Y'], required=False
     )
+    description_preview = PreviewField('description')
     bookmarked = serializers.SerializerMethodField()
+    applied = serializers.SerializerMethodField()
 
     class Meta:
         model = Internship
-        fields = '__all__'
-        read_only_fields = ['recruiter', 'posted_on']
+        exclude = ['search_vector']
+        read_only_fields = ['recruiter', 'posted_on', 'applications_count', 'bookmarks_count']
+        list_serializer_class = ViewerStateListSerializer
+        compact_fields = [
+            'id', 'title', 'company', 'location', 'internship_type', 'stipend', 'status',
+            'posted_on', 'expiry_date', 'description_preview', 'bookmarked', 'applied',
+        ]
+        method_field_sources = {'bookmarked': ['id'], 'applied': ['id']}
 
     def get_bookmarked(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated and user.profile.role == 'student':
-            return obj.bookmarked_by.filter(user=user).exists()
-        return False
+        return ViewerState.for_context(self.context).is_bookmarked(obj.id)
+
+    def get_applied(self, obj):
+        return ViewerState.for_context(self.context).has_applied(obj.id)
 
 
 # ==========================
@@ -146,26 +178,29 @@ class InternshipSerializer(serializers.ModelSerializer):
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     """
     For students to apply to an internship. Resume is optional.
+    Duplicates are caught by the unique constraint (see ApplyToInternshipView).
     """
     class Meta:
         model = Application
         fields = ['resume']
-        extra_kwargs = {'resume': {'required': False, 'allow_null': True}}
-
-    def validate(self, data):
-        user = self.context['request'].user
-        internship_id = self.context['view'].kwargs['internship_id']
+        extra_kwargs = {
+            'resume': {'required': False, 'allow_null': True, 'validators': [validate_file_size(RESUME_MAX_SIZE)]},
+        }
 
-        if not hasattr(user, 'profile') or user.profile.role != 'student':
-            raise serializers.ValidationError("Only students can apply.")
-
-        if Application.objects.filter(internship_id=internship_id, user=user).exists():
-            raise serializers.ValidationError("You have already applied for this internship.")
-
-        return data
-
-
-class ApplicationListSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # The resume reaches the storage before the INSERT, so a duplicate
+        # must not leave it behind
+        application = Application(**validated_data)
+        try:
+            application.save()
+        except IntegrityError:
+            if application.resume:
+                application.resume.delete(save=False)
+            raise
+        return application
+
+
+class ApplicationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Show all application details along with user info and internship info.
     """
@@ -175,6 +210,20 @@ class ApplicationListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['id', 'internship', 'resume', 'status', 'applied_on', 'user']
+        list_serializer_class = ViewerStateListSerializer
+        viewer_state_internship_field = 'internship_id'
+
+
+class ApplicantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    One applicant of a recruiter's internship, without the internship itself
+    (sent once per page instead, see RecruiterApplicantListView).
+    """
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ['id', 'resume', 'status', 'applied_on', 'user']
 
 
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
@@ -186,10 +235,29 @@ class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
         fields = ['status']
 
 
+class ApplicationStatusChangeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """
+    Status changes for many applications at once:
+    {"updates": [{"id": 1, "status": "accepted"}, ...]}
+    """
+    updates = ApplicationStatusChangeSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate_updates(self, value):
+        ids = [update['id'] for update in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each application may appear only once.")
+        return value
+
+
 # ==========================
 # BOOKMARK SERIALIZER
 # ==========================
-class BookmarkSerializer(serializers.ModelSerializer):
+class BookmarkSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Show basic info of bookmarked internships.
     """
@@ -1,41 +1,78 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from .models import Profile, TokenUser
+
+# Users are saved as TokenUser too (request.user of an access token), and
+# post_save is sent with the proxy as sender: user receivers take both.
 
 @receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+@receiver(post_save, sender=TokenUser)
+def save_user_profile(sender, instance, created, **kwargs):
+    # Saves a profile edited through `user.profile`. A user saved on its own
+    # (last_login on every login, say) hasn't loaded it: no query then, and a
+    # loaded but unchanged profile isn't written either.
+    if not created and User.profile.is_cached(instance):
+        instance.profile.save()
 
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Internship, Application, Bookmark, ActivityLog
+from .models import Internship, Application, Bookmark
+from .activity import describe_changes, loaded, log_activity
+from .authentication import forget_auth_version, revoke_tokens
+from .autocomplete import suggestion_index
+from .cache import bump_generation
+from .counters import adjust
+from .recommendations import internship_matrix
+from .search import SEARCH_SOURCE_FIELDS, update_search_vectors
 
 # Internship signals
 
+@receiver(post_save, sender=Internship)
+@receiver(post_delete, sender=Internship)
+def internship_changed(sender, instance, signal, **kwargs):
+    pk, current = instance.pk, None if signal is post_delete else instance
+
+    # Only once the change is visible: a request bumped in the meantime would
+    # cache the old rows under the new generation
+    def committed():
+        generation = bump_generation('internship')
+        suggestion_index.apply(pk, current, generation)
+        internship_matrix.apply(pk, current, generation)
+    transaction.on_commit(committed)
+
+@receiver(post_save, sender=Internship)
+def refresh_internship_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors(Internship.objects.filter(pk=instance.pk))
+
 @receiver(post_save, sender=Internship)
 def log_internship_posted_or_updated(sender, instance, created, **kwargs):
-    action = 'internship_posted' if created else 'internship_updated'
-    ActivityLog.objects.create(
-        user=instance.recruiter,
-        action=action,
-        related_object_id=instance.id,
-        details=f"{instance.title}"
+    if created:
+        action, details = 'internship_posted', "{title}"
+    elif instance.saved_changes:
+        action, details = 'internship_updated', "{title}\n" + describe_changes(instance, instance.saved_changes)
+    else:
+        return  # only an explicit update_fields save gets here with nothing changed
+    log_activity(
+        instance.recruiter_id, action, instance.id, details,
+        internship_id=instance.id, title=loaded(instance, 'title'),
     )
 
 @receiver(post_delete, sender=Internship)
 def log_internship_deleted(sender, instance, **kwargs):
-    ActivityLog.objects.create(
-        user=instance.recruiter,
-        action='internship_deleted',
-        related_object_id=instance.id,
-        details=f"{instance.title}"
+    log_activity(
+        instance.recruiter_id, 'internship_deleted', instance.id, "{title}",
+        internship_id=instance.id, title=loaded(instance, 'title'),
     )
 
 # Application signals
@@ -44,50 +81,86 @@ def log_internship_deleted(sender, instance, **kwargs):
 def log_application_submitted_or_status_changed(sender, instance, created, **kwargs):
     if created:
         action = 'application_submitted'
-        details = f"Applied to {instance.internship.title}"
-    else:
-        # You might want to track status changes only
+        details = "Applied to {title}"
+    elif 'status' in instance.saved_changes:
+        old, new = instance.saved_changes['status']
         action = 'application_status_changed'
-        details = f"Status changed to {instance.status} for {instance.internship.title}"
+        details = f"Status changed from {old} to {new} for {{title}}"
+    else:
+        return
 
-    ActivityLog.objects.create(
-        user=instance.user,
-        action=action,
-        related_object_id=instance.id,
-        details=details
+    log_activity(
+        instance.user_id, action, instance.id, details,
+        internship_id=instance.internship_id, title=loaded(instance, 'internship', 'title'),
     )
 
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    if created:
+        adjust(instance.internship_id, 'applications_count', 1)
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    adjust(instance.internship_id, 'applications_count', -1)
+
 # Bookmark signals
 
+@receiver(post_save, sender=Bookmark)
+def count_bookmark(sender, instance, created, **kwargs):
+    if created:
+        adjust(instance.internship_id, 'bookmarks_count', 1)
+
+@receiver(post_delete, sender=Bookmark)
+def uncount_bookmark(sender, instance, **kwargs):
+    adjust(instance.internship_id, 'bookmarks_count', -1)
+
 @receiver(post_save, sender=Bookmark)
 def log_bookmark_added(sender, instance, created, **kwargs):
     if created:
-        ActivityLog.objects.create(
-            user=instance.user,
-            action='bookmark_added',
-            related_object_id=instance.internship.id,
-            details=f"Bookmarked {instance.internship.title}"
+        log_activity(
+            instance.user_id, 'bookmark_added', instance.internship_id, "Bookmarked {title}",
+            internship_id=instance.internship_id, title=loaded(instance, 'internship', 'title'),
         )
 
 @receiver(post_delete, sender=Bookmark)
 def log_bookmark_removed(sender, instance, **kwargs):
-    ActivityLog.objects.create(
-        user=instance.user,
-        action='bookmark_removed',
-        related_object_id=instance.internship.id,
-        details=f"Removed bookmark {instance.internship.title}"
+    log_activity(
+        instance.user_id, 'bookmark_removed', instance.internship_id, "Removed bookmark {title}",
+        internship_id=instance.internship_id, title=loaded(instance, 'internship', 'title'),
     )
 # Profile signals
+
+# Set together with the picture; logged as profile_picture_updated
+PICTURE_FIELDS = {'profile_picture_path', 'profile_picture_url', 'profile_picture_renditions'}
+
 @receiver(post_save, sender=Profile)
 def log_profile_updated(sender, instance, created, **kwargs):
-    if created:
-        action = 'profile_created'
-    else:
-        action = 'profile_updated'
+    # A new profile is an empty one made along with its user (see
+    # create_user_profile); what is filled in afterwards is the first update.
+    username = loaded(instance, 'user', 'username')
+    if 'profile_picture_path' in instance.saved_changes:
+        log_activity(
+            instance.user_id, 'profile_picture_updated', instance.id, "Profile picture updated for {username}",
+            username=username,
+        )
+    changes = {name: change for name, change in instance.saved_changes.items() if name not in PICTURE_FIELDS}
+    if changes:
+        log_activity(
+            instance.user_id, 'profile_updated', instance.id,
+            "Profile updated for {username}\n" + describe_changes(instance, changes), username=username,
+        )
 
-    ActivityLog.objects.create(
-        user=instance.user,
-        action=action,
-        related_object_id=instance.id,
-        details=f"Profile updated for {instance.user.username}"
-    )
+# Access tokens (see authentication.py)
+
+@receiver(post_save, sender=Profile)
+def revoke_tokens_on_role_change(sender, instance, created, **kwargs):
+    old_role = instance.saved_changes.get('role', (None,))[0]
+    if old_role:  # not the role given at registration
+        revoke_tokens(instance.user_id)
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+@receiver(post_delete, sender=Profile)
+def forget_cached_auth_version(sender, instance, **kwargs):
+    # Picks up deactivation and deletion; no query
+    forget_auth_version(instance.user_id if sender is Profile else instance.pk)
@@ -0,0 +1,227 @@
+import base64
+import mimetypes
+import threading
+import time
+from urllib.parse import quote
+
+import httpx
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.utils.deconstruct import deconstructible
+from rest_framework import serializers
+
+# --------------------------
+# MEDIA STORAGE
+# --------------------------
+# Profile pictures and resumes both go through Django's default storage
+# (settings.STORAGES). Locally and in tests that is the file system under
+# MEDIA_ROOT; in production it is SupabaseStorage, which streams each file to
+# Supabase in fixed-size chunks instead of reading it into memory first.
+# Uploads over MAX_UPLOAD_SIZE are refused while the request body is parsed,
+# before they are written anywhere. Bulk imports have a limit of their own,
+# IMPORT_MAX_UPLOAD_SIZE (see ImportUploadSizeLimitHandler).
+
+
+def _megabytes(size):
+    return f"{size / (1024 * 1024):g} MB"
+
+
+class UploadTooLarge(MultiPartParserError):
+    """DRF turns multipart parser errors into a 400 response."""
+
+
+class UploadSizeLimitHandler(FileUploadHandler):
+    """
+    First upload handler: rejects a multipart body whose Content-Length is
+    over the limit before reading it, and any single file that grows past
+    the limit while it is being received.
+    """
+    limit_setting = 'MAX_UPLOAD_SIZE'
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.limit = getattr(settings, self.limit_setting)
+        # Some slack for the multipart framing and the other form fields
+        if content_length and content_length > self.limit + 64 * 1024:
+            raise UploadTooLarge(f"Upload too large; the limit is {_megabytes(self.limit)}.")
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            raise UploadTooLarge(f"'{self.file_name}' is too large; the limit is {_megabytes(self.limit)}.")
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+class ImportUploadSizeLimitHandler(UploadSizeLimitHandler):
+    """The same with IMPORT_MAX_UPLOAD_SIZE, swapped in by the views that take imports."""
+    limit_setting = 'IMPORT_MAX_UPLOAD_SIZE'
+
+    @classmethod
+    def install(cls, request):
+        """Replace the default limit among `request`'s upload handlers; before the body is read."""
+        request.upload_handlers[:] = [
+            cls() if type(handler) is UploadSizeLimitHandler else handler
+            for handler in request.upload_handlers
+        ]
+
+
+def validate_file_size(limit):
+    """Serializer field validator for a per-field size limit (in bytes)."""
+    def validate(file):
+        if file is not None and file.size > limit:
+            raise serializers.ValidationError(f"File too large; the limit is {_megabytes(limit)}.")
+    return validate
+
+
+# --------------------------
+# SUPABASE
+# --------------------------
+
+class StorageError(Exception):
+    pass
+
+
+_clients = threading.local()
+
+
+@deconstructible
+class SupabaseStorage(Storage):
+    """
+    Django storage on Supabase Storage. The first segment of a name is the
+    bucket (`profile_pics/12/x.png` is `12/x.png` in bucket `profile_pics`),
+    so buckets must exist and be public for `url()` to work.
+
+    Files are uploaded with Supabase's resumable (TUS) endpoint in
+    `chunk_size` pieces read straight from the uploaded file, so at most one
+    chunk is in memory. Each worker thread reuses one HTTP client. Failed
+    requests are retried with exponential backoff, and an interrupted upload
+    resumes from the offset the server reports.
+    """
+    # Supabase requires 6 MB chunks for resumable uploads (except the last one)
+    CHUNK_SIZE = 6 * 1024 * 1024
+    RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+    def __init__(self, url=None, key=None, chunk_size=None, retries=4, backoff=0.5, timeout=30, transport=None):
+        self.base_url = (url or settings.SUPABASE_URL).rstrip('/')
+        self.key = key or settings.SUPABASE_SERVICE_ROLE_KEY
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transport = transport
+
+    # --------------------------
+    # HTTP
+    # --------------------------
+
+    @property
+    def client(self):
+        clients = _clients.__dict__.setdefault('clients', {})
+        key = (self.base_url, self.key, id(self.transport))
+        if key not in clients:
+            clients[key] = httpx.Client(
+                base_url=f'{self.base_url}/storage/v1',
+                headers={'Authorization': f'Bearer {self.key}', 'apikey': self.key},
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return clients[key]
+
+    def request(self, method, url, ok=(200,), retry=True, **kwargs):
+        """Send a request, retrying network errors and retryable statuses."""
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                error = StorageError(f"{method} {url} failed: {exc}")
+            else:
+                if response.status_code in ok:
+                    return response
+                error = StorageError(f"{method} {url} returned {response.status_code}: {response.text[:200]}")
+                if response.status_code not in self.RETRY_STATUSES:
+                    raise error
+            if attempt + 1 < attempts:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise error
+
+    # --------------------------
+    # STORAGE API
+    # --------------------------
+
+    @staticmethod
+    def split(name):
+        bucket, _, path = name.replace('\\', '/').lstrip('/').partition('/')
+        if not path:
+            raise StorageError(f"'{name}' has no bucket prefix.")
+        return bucket, path
+
+    def _save(self, name, content):
+        bucket, path = self.split(name)
+        size = content.size
+        content_type = (
+            getattr(content, 'content_type', None) or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        )
+        metadata = {'bucketName': bucket, 'objectName': path, 'contentType': content_type}
+        created = self.request('POST', '/upload/resumable', ok=(201,), headers={
+            'Tus-Resumable': '1.0.0',
+            'Upload-Length': str(size),
+            'Upload-Metadata': ','.join(
+                f'{key} {base64.b64encode(value.encode()).decode()}' for key, value in metadata.items()
+            ),
+        })
+        location = created.headers['Location']
+
+        offset, failures = 0, 0
+        while offset < size:
+            content.seek(offset)
+            chunk = content.read(self.chunk_size)
+            try:
+                response = self.request('PATCH', location, ok=(204,), retry=False, content=chunk, headers={
+                    'Tus-Resumable': '1.0.0',
+                    'Upload-Offset': str(offset),
+                    'Content-Type': 'application/offset+octet-stream',
+                })
+                offset = int(response.headers['Upload-Offset'])
+                failures = 0
+            except StorageError:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** (failures - 1))
+                # Continue from whatever the server did receive
+                head = self.request('HEAD', location, headers={'Tus-Resumable': '1.0.0'})
+                offset = int(head.headers['Upload-Offset'])
+        return name
+
+    def _open(self, name, mode='rb'):
+        bucket, path = self.split(name)
+        response = self.request('GET', f'/object/{bucket}/{quote(path)}')
+        return ContentFile(response.content, name=name)
+
+    def exists(self, name):
+        bucket, path = self.split(name)
+        response = self.request('HEAD', f'/object/{bucket}/{quote(path)}', ok=(200, 400, 404))
+        return response.status_code == 200
+
+    def delete(self, name):
+        bucket, path = self.split(name)
+        self.request('DELETE', f'/object/{bucket}', ok=(200, 404), json={'prefixes': [path]})
+
+    def size(self, name):
+        bucket, path = self.split(name)
+        response = self.request('HEAD', f'/object/{bucket}/{quote(path)}')
+        return int(response.headers['Content-Length'])
+
+    def url(self, name):
+        bucket, path = self.split(name)
+        return f'{self.base_url}/storage/v1/object/public/{bucket}/{quote(path)}'
@@ -1,3 +1,1707 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import addModuleCleanup, mock, skipUnless
 
-# Create your tests here.
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth.models import User, update_last_login
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .activity import ActivityLogBuffer, activity_buffer, replay_spool
+from .autocomplete import PrefixIndex, SuggestionIndex, suggestion_index
+from .cache import cache_stats, get_cache
+from .exporter import export_applicants
+from .models import ActivityLog, Application, Bookmark, Internship, Profile, TokenUser
+from .pagination import ListPagination
+from .partitions import add_months, create_partitions, expire, is_partitioned, month_start, monthly_partitions
+from . import recommendations
+from .recommendations import InternshipMatrix, internship_matrix
+from .search import update_search_vectors
+from .seed import seed_internships, seed_recruiter, seed_users
+from .storage import StorageError, SupabaseStorage
+from .thumbnails import RENDITIONS, process_profile_picture
+from .views import InternshipListView, MyPostedInternshipsView, UserActivityLogListView
+
+
+LOCAL_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+
+def setUpModule():
+    # Activity logs are written inside the request throughout, so no writer
+    # thread runs against the test database (ActivityLogBufferTests uses a
+    # buffer of its own)
+    overrides = override_settings(ACTIVITY_LOG_SYNC=True)
+    overrides.enable()
+    addModuleCleanup(overrides.disable)
+
+
+def tearDownModule():
+    if activity_buffer.events or activity_buffer.spool is not None:
+        raise AssertionError(f"Tests left activity log events in {activity_buffer.spool_dir}")
+
+
+def make_user(username, role):
+    user = User.objects.create_user(username=username, password='test-password')
+    user.profile.role = role
+    user.profile.save()
+    return user
+
+
+def make_internships(recruiter, count, **kwargs):
+    fields = {
+        'description': "Work on things", 'company': "Acme", 'location': "Pune",
+        'internship_type': 'remote', **kwargs,
+    }
+    return [
+        Internship.objects.create(title=f"Intern {i}", recruiter=recruiter, **fields)
+        for i in range(count)
+    ]
+
+
+class InternshipViewerFlagsTests(APITestCase):
+    """bookmarked/applied flags are resolved per page, not per row."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.client.force_authenticate(self.student)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('internship-list'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data['results']
+
+    def test_list_query_count_is_constant(self):
+        internships = make_internships(self.recruiter, 2)
+        Bookmark.objects.create(user=self.student, internship=internships[0])
+        small, _ = self.count_list_queries()
+
+        internships += make_internships(self.recruiter, 8)
+        for internship in internships[1:]:
+            Bookmark.objects.create(user=self.student, internship=internship)
+            Application.objects.create(user=self.student, internship=internship)
+        large, results = self.count_list_queries()
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(small, large)
+
+    def test_flags_reflect_bookmarks_and_applications(self):
+        bookmarked, applied, neither = make_internships(self.recruiter, 3)
+        Bookmark.objects.create(user=self.student, internship=bookmarked)
+        Application.objects.create(user=self.student, internship=applied)
+
+        _, results = self.count_list_queries()
+        flags = {row['id']: (row['bookmarked'], row['applied']) for row in results}
+        self.assertEqual(flags[bookmarked.id], (True, False))
+        self.assertEqual(flags[applied.id], (False, True))
+        self.assertEqual(flags[neither.id], (False, False))
+
+        response = self.client.get(reverse('internship-view', args=[bookmarked.id]))
+        self.assertTrue(response.data['bookmarked'])
+
+        response = self.client.get(reverse('student-applications'))
+        self.assertTrue(response.data['results'][0]['internship']['applied'])
+
+    def test_flags_are_false_for_anonymous_users(self):
+        make_internships(self.recruiter, 1)
+        self.client.force_authenticate(None)
+        _, results = self.count_list_queries()
+        self.assertEqual((results[0]['bookmarked'], results[0]['applied']), (False, False))
+
+
+class ViewerStateBatchTests(APITestCase):
+    """Applied/bookmarked state of many internships in one request and one query."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.client.force_authenticate(self.student)
+
+    def test_batch(self):
+        applied, bookmarked, both, neither = make_internships(self.recruiter, 4)
+        Application.objects.create(user=self.student, internship=applied)
+        Bookmark.objects.create(user=self.student, internship=bookmarked)
+        Application.objects.create(user=self.student, internship=both, status='accepted')
+        Bookmark.objects.create(user=self.student, internship=both)
+        ids = [applied.id, bookmarked.id, both.id, neither.id, 999999]
+
+        url = reverse('internship-viewer-state')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        state = response.json()
+        self.assertEqual(state[str(applied.id)], {'applied': True, 'bookmarked': False, 'application_status': 'pending'})
+        self.assertEqual(state[str(bookmarked.id)], {'applied': False, 'bookmarked': True, 'application_status': None})
+        self.assertEqual(state[str(both.id)], {'applied': True, 'bookmarked': True, 'application_status': 'accepted'})
+        self.assertEqual(state[str(neither.id)], state['999999'])
+
+        # The per-internship endpoints give the same answers
+        self.assertTrue(self.client.get(reverse('application-check', args=[both.id])).data['applied'])
+        self.assertFalse(self.client.get(reverse('bookmark-check', args=[applied.id])).data['bookmarked'])
+
+        # Recruiters can bookmark too
+        Bookmark.objects.create(user=self.recruiter, internship=neither)
+        self.client.force_authenticate(self.recruiter)
+        self.assertTrue(self.client.get(url, {'ids': neither.id}).json()[str(neither.id)]['bookmarked'])
+
+    def test_validation(self):
+        url = reverse('internship-viewer-state')
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'ids': '1,x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'ids': ','.join(map(str, range(1, 302)))}).status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url, {'ids': '1'}).status_code, 401)
+
+
+class AnonymousResponseCacheTests(APITestCase):
+    """Anonymous list/detail responses are cached until an internship changes."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.internship = make_internships(self.recruiter, 1)[0]
+
+    def test_repeat_requests_hit_the_cache(self):
+        url = reverse('internship-list')
+        self.assertEqual(self.client.get(url, {'location': '', 'page': 1})['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'page': 1})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(cache_stats()['hits'], 1)
+
+    def test_saving_an_internship_invalidates_cached_responses(self):
+        url = reverse('internship-view', args=[self.internship.id])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.internship.title = "Renamed"
+            self.internship.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], "Renamed")
+
+    def test_generation_moves_on_commit(self):
+        url = reverse('internship-list')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.internship.title = "Renamed"
+            self.internship.save()
+            # Until the change commits the cached list stays where it is, so
+            # nobody caches the old rows under a new generation
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], "Renamed")
+
+    def test_authenticated_users_bypass_the_cache(self):
+        self.client.force_authenticate(make_user('student', 'student'))
+        url = reverse('internship-list')
+        self.client.get(url)
+        self.assertNotIn('X-Cache', self.client.get(url))
+
+
+@skipUnless(connection.vendor == 'postgresql', "Query plans are checked on PostgreSQL only")
+class InternshipQueryPlanTests(TestCase):
+    """
+    Every supported filter combination of the internship lists must be served
+    by an index. Seeds a realistic dataset, refreshes planner statistics and
+    checks EXPLAIN of the page query (first ten rows).
+    """
+    ROWS = 20000
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(0)
+        cls.recruiter = seed_recruiter('plan_recruiter')
+        seed_internships([cls.recruiter] + seed_users(199, prefix='plan_recruiter'), cls.ROWS)
+        update_search_vectors(Internship.objects.all())
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE internship_internship')
+
+    def page_query(self, params, view_class=InternshipListView, user=None):
+        request = Request(APIRequestFactory().get('/', params))
+        if user is not None:
+            request.user = user
+        view = view_class(request=request, args=(), kwargs={}, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())[:10]
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan on internship_internship', plan, plan)
+        self.assertIn('Index', plan, plan)
+
+    def test_list_filters_use_indexes(self):
+        now = timezone.now()
+        cases = [
+            {},
+            {'location': 'Pune'},
+            {'location__icontains': 'pun'},
+            {'internship_type': 'remote'},
+            {'location': 'Pune', 'internship_type': 'remote'},
+            {'stipend__gte': 45000, 'stipend__lte': 46000},
+            {'posted_on__gte': (now - timedelta(days=3)).isoformat(), 'posted_on__lte': now.isoformat()},
+            {'ordering': 'stipend'},
+            {'ordering': '-stipend'},
+            {'ordering': 'posted_on'},
+            {'ordering': '-applications_count'},
+            {'ordering': '-bookmarks_count'},
+            {'location': 'Pune', 'ordering': '-stipend'},
+            {'search': 'stark'},
+            {'search': 'data sci', 'location': 'Mumbai'},
+            {'status': 'closed'},
+            {'status': 'archived', 'ordering': 'posted_on'},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                self.assertUsesIndex(self.page_query(params))
+
+    def test_default_list_uses_open_partial_index(self):
+        self.assertIn('internship_open_posted_idx', self.page_query({}).explain())
+
+    def test_keyset_seek_uses_index(self):
+        ordering = InternshipListView.cursor_ordering
+        last = Internship.objects.open().order_by(*ordering)[500]
+        seek = ListPagination._seek_filter(ordering, [last.posted_on, last.id])
+        self.assertUsesIndex(Internship.objects.open().filter(seek).order_by(*ordering)[:11])
+
+    def test_recruiter_postings_use_index(self):
+        self.assertUsesIndex(self.page_query({}, MyPostedInternshipsView, user=self.recruiter))
+
+    def test_status_filter_uses_index(self):
+        self.assertUsesIndex(Internship.objects.filter(status='archived').order_by('-posted_on')[:10])
+
+
+class InternshipSearchTests(APITestCase):
+    """Ranked full-text search on PostgreSQL, icontains elsewhere."""
+
+    def setUp(self):
+        recruiter = make_user('recruiter', 'recruiter')
+        fields = {'company': "Acme", 'location': "Pune", 'internship_type': 'remote'}
+        create = lambda title, description: Internship.objects.create(
+            title=title, description=description, recruiter=recruiter, **fields,
+        )
+        self.in_description = create("Backend Intern", "Build pipelines for the data science team")
+        self.in_title = create("Data Science Intern", "Work on models")
+        self.unrelated = create("Design Intern", "Figma prototypes")
+
+    def search(self, text):
+        response = self.client.get(reverse('internship-list'), {'search': text})
+        return [row['id'] for row in response.data['results']]
+
+    @skipUnless(connection.vendor == 'postgresql', "Full-text search needs PostgreSQL")
+    def test_ranked_prefix_matches(self):
+        # Title matches outrank description matches; partial words match
+        self.assertEqual(self.search("data sci"), [self.in_title.id, self.in_description.id])
+        self.assertEqual(self.search("prototyp"), [self.unrelated.id])
+        self.assertEqual(self.search("nothing here"), [])
+
+    @skipUnless(connection.vendor == 'postgresql', "Full-text search needs PostgreSQL")
+    def test_stop_words_fall_back_to_icontains(self):
+        # "the" alone makes an empty tsquery; with other terms it is just dropped
+        self.assertEqual(self.search("the"), [self.in_description.id])
+        self.assertEqual(self.search("the science"), [self.in_title.id, self.in_description.id])
+
+    @skipUnless(connection.vendor == 'postgresql', "Full-text search needs PostgreSQL")
+    def test_vector_refreshed_only_for_source_fields(self):
+        def refreshes(**changes):
+            posting = Internship.objects.get(pk=self.unrelated.pk)
+            for name, value in changes.items():
+                setattr(posting, name, value)
+            with CaptureQueriesContext(connection) as queries:
+                posting.save()
+            return any('"search_vector" = ' in query['sql'] for query in queries)
+
+        self.assertFalse(refreshes(stipend=1000))
+        self.assertFalse(refreshes(status='closed'))
+        self.assertTrue(refreshes(title="Research Intern", status='open'))
+        self.assertEqual(self.search("research"), [self.unrelated.id])
+
+    def test_icontains_fallback(self):
+        with mock.patch('internship.search.search_supported', return_value=False):
+            self.assertEqual(sorted(self.search("science")), sorted([self.in_title.id, self.in_description.id]))
+            self.assertEqual(self.search("figma"), [self.unrelated.id])
+
+
+class CursorPaginationTests(APITestCase):
+    """Keyset pages of the internship, application and bookmark lists."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.postings = make_internships(self.recruiter, 25)
+        now = timezone.now()
+        for i, posting in enumerate(self.postings):
+            # Four postings per minute: pages break in the middle of ties
+            Internship.objects.filter(pk=posting.pk).update(
+                posted_on=now - timedelta(minutes=i // 4), stipend=1000 + (i * 7) % 25,
+            )
+
+    def walk(self, url, params, link='next'):
+        """Rows of every page reached by following `link` links, and the first response."""
+        first = response = self.client.get(url, params)
+        rows = list(response.data['results'])
+        while response.data[link]:
+            response = self.client.get(response.data[link])
+            rows.extend(response.data['results'])
+        return [row['id'] for row in rows], first.data
+
+    def test_internship_pages_follow_ties(self):
+        expected = list(Internship.objects.order_by('-posted_on', '-id').values_list('id', flat=True))
+        url = reverse('internship-list')
+        ids, first = self.walk(url, {'pagination': 'cursor'})
+        self.assertEqual(ids, expected)
+        self.assertNotIn('count', first)
+        self.assertTrue(first['has_more'])
+
+        # And back again from the last page
+        response = self.client.get(url, {'pagination': 'cursor'})
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+        last_page = [row['id'] for row in response.data['results']]
+        ids, _ = self.walk(response.data['previous'], {}, link='previous')
+        self.assertEqual(last_page, expected[20:])
+        pages = [expected[i:i + 10] for i in range(0, 20, 10)]
+        self.assertEqual(ids, pages[1] + pages[0])
+
+    def test_other_orderings_refuse_cursors(self):
+        url = reverse('internship-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'ordering': 'stipend'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pagination', response.data)
+        ids, first = self.walk(url, {'ordering': 'stipend'})
+        self.assertEqual(ids, list(Internship.objects.order_by('stipend').values_list('id', flat=True)))
+        self.assertEqual(first['count'], 25)
+
+        # A cursor link followed with another ordering added
+        next_link = self.client.get(url, {'pagination': 'cursor'}).data['next']
+        self.assertEqual(self.client.get(next_link + '&ordering=stipend').status_code, 400)
+
+        # Newest first is the cursor ordering, given explicitly
+        ids, first = self.walk(url, {'pagination': 'cursor', 'ordering': '-posted_on'})
+        self.assertEqual(ids, list(Internship.objects.order_by('-posted_on', '-id').values_list('id', flat=True)))
+        self.assertNotIn('count', first)
+
+        # Ranked search orders by rank on PostgreSQL, so it pages by number there
+        Internship.objects.filter(pk=self.postings[3].pk).update(title="Data Science Intern")
+        update_search_vectors(Internship.objects.all())
+        response = self.client.get(url, {'pagination': 'cursor', 'search': 'science'})
+        self.assertEqual(response.status_code, 400 if connection.vendor == 'postgresql' else 200)
+        ids, _ = self.walk(url, {'search': 'science'})
+        self.assertEqual(ids, [self.postings[3].id])
+
+    def test_application_and_bookmark_pages(self):
+        self.client.force_authenticate(self.student)
+        now = timezone.now()
+        for i, posting in enumerate(self.postings[:23]):
+            application = Application.objects.create(user=self.student, internship=posting)
+            bookmark = Bookmark.objects.create(user=self.student, internship=posting)
+            at = now - timedelta(minutes=i // 3)
+            Application.objects.filter(pk=application.pk).update(applied_on=at)
+            Bookmark.objects.filter(pk=bookmark.pk).update(bookmarked_on=at)
+
+        ids, _ = self.walk(reverse('student-applications'), {'pagination': 'cursor'})
+        self.assertEqual(ids, list(
+            Application.objects.filter(user=self.student).order_by('-applied_on', '-id').values_list('id', flat=True)
+        ))
+        ids, _ = self.walk(reverse('bookmark-list'), {'pagination': 'cursor'})
+        self.assertEqual(ids, list(
+            Bookmark.objects.filter(user=self.student).order_by('-bookmarked_on', '-id').values_list('id', flat=True)
+        ))
+
+
+class InternshipFacetTests(APITestCase):
+    """Facet counts come from one aggregate query per facet family."""
+
+    def setUp(self):
+        get_cache().clear()
+        recruiter = make_user('recruiter', 'recruiter')
+        make_internships(recruiter, 3, stipend=1000)
+        make_internships(recruiter, 2, stipend=12000, internship_type='on-site')
+        Internship.objects.create(
+            title="Unpaid", description="-", company="Globex", location="Delhi",
+            internship_type='remote', recruiter=recruiter,
+        )
+
+    def test_facets_ignore_their_own_filter(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('internship-facets'), {'internship_type': 'remote'})
+        data = response.data
+        self.assertEqual(
+            {row['value']: row['count'] for row in data['internship_type']},
+            {'remote': 4, 'on-site': 2},
+        )
+        self.assertEqual(data['location'], [{'value': 'Pune', 'count': 3}, {'value': 'Delhi', 'count': 1}])
+        self.assertEqual([bucket['count'] for bucket in data['stipend']['buckets']], [3, 0, 0, 0, 0, 0])
+        self.assertEqual(data['stipend']['unspecified'], 1)
+
+
+class InternshipAutocompleteTests(APITestCase):
+    """Suggestions come from the in-process index, kept current by signals."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        make_internships(self.recruiter, 2, company="Globex", location="Bangalore")
+        Internship.objects.create(
+            title="Data Science Intern", description="-", company="Acme Data", location="Pune",
+            internship_type='remote', recruiter=self.recruiter,
+        )
+        Internship.objects.create(
+            title="Closed Posting", description="-", company="Initech", location="Delhi",
+            internship_type='remote', recruiter=self.recruiter, status='closed',
+        )
+        suggestion_index.rebuild()
+
+    def suggest(self, **params):
+        response = self.client.get(reverse('internship-autocomplete'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_prefix_matches_any_word_and_ranks_leading_matches_first(self):
+        self.assertEqual(self.suggest(q='sci', field='title'), {'title': ["Data Science Intern"]})
+        data = self.suggest(q='ac')
+        self.assertEqual(data['company'], ["Acme Data"])
+        self.assertEqual(self.suggest(q='data', field='company')['company'], ["Acme Data"])
+        self.assertEqual(self.suggest(q='ba', field='location')['location'], ["Bangalore"])
+        self.assertEqual(self.suggest(q='clo', field='title')['title'], [])  # closed postings are hidden
+
+    def test_committed_changes_are_applied_without_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            internship = Internship.objects.create(
+                title="Robotics Intern", description="-", company="Wonka", location="Chennai",
+                internship_type='remote', recruiter=self.recruiter,
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest(q='robo', field='title', limit=1)['title'], ["Robotics Intern"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            internship.delete()
+        self.assertEqual(self.suggest(q='robo', field='title', limit=1)['title'], [])
+
+    def test_rebuilds_run_once_in_the_background(self):
+        index = SuggestionIndex()
+        with mock.patch('internship.autocomplete.submit') as submit:
+            # No index yet: answered from the database while the first one is built
+            self.assertEqual(index.suggest('title', 'sci'), ["Data Science Intern"])
+            self.assertEqual(index.suggest('company', 'data'), ["Acme Data"])
+            self.assertEqual(submit.call_count, 1)
+            submit.call_args.args[0]()
+        self.assertFalse(index.rebuilding)
+        with self.assertNumQueries(0):
+            self.assertEqual(index.suggest('location', 'ba'), ["Bangalore"])
+
+        # Built in one sort, the same entries as added one at a time
+        values = ["Data Science Intern", "Intern", "data  science intern!", "", None, "Backend Intern"]
+        one_by_one = PrefixIndex()
+        for value in values:
+            one_by_one.add(value)
+        built = PrefixIndex.build(values)
+        self.assertEqual((built.entries, built.values), (one_by_one.entries, one_by_one.values))
+
+    def test_fuzzy_matches_fill_up_results(self):
+        self.assertIn("Bangalore", self.suggest(q='bangalre', field='location')['location'])
+
+    def test_rejects_unknown_fields(self):
+        response = self.client.get(reverse('internship-autocomplete'), {'q': 'a', 'field': 'description'})
+        self.assertEqual(response.status_code, 400)
+
+
+class InternshipExpiryTests(APITestCase):
+    """Expired postings drop out of the public list and get closed in bulk."""
+
+    def setUp(self):
+        recruiter = make_user('recruiter', 'recruiter')
+        today = timezone.localdate()
+        self.current, = make_internships(recruiter, 1, expiry_date=today)
+        self.expired = make_internships(recruiter, 3, expiry_date=today - timedelta(days=1))
+        self.archived, = make_internships(recruiter, 1, status='archived')
+
+    def listed_ids(self, **params):
+        response = self.client.get(reverse('internship-list'), params)
+        return {row['id'] for row in response.data['results']}
+
+    def test_public_list_defaults_to_open_unexpired_postings(self):
+        self.assertEqual(self.listed_ids(), {self.current.id})
+        self.assertEqual(self.listed_ids(status='archived'), {self.archived.id})
+
+    def test_close_expired_internships_command(self):
+        log_count = ActivityLog.objects.count()
+        call_command('close_expired_internships', batch_size=2, stdout=StringIO())
+        self.assertEqual(
+            set(Internship.objects.filter(status='closed').values_list('id', flat=True)),
+            {internship.id for internship in self.expired},
+        )
+        self.assertEqual(ActivityLog.objects.count(), log_count)
+        self.assertEqual(self.listed_ids(status='closed'), {internship.id for internship in self.expired})
+
+
+class ConditionalGetTests(APITestCase):
+    """Read endpoints answer matching validators with 304 Not Modified."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.internship, = make_internships(self.recruiter, 1)
+
+    def assertRevalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def test_internship_detail(self):
+        url = reverse('internship-view', args=[self.internship.id])
+        etag = self.assertRevalidates(url)
+        # The counters change without touching updated_at
+        self.assertFalse(self.client.get(url).has_header('Last-Modified'))
+        params = {'omit': 'applications_count,bookmarks_count'}
+        last_modified = self.client.get(url, params)['Last-Modified']
+        response = self.client.get(url, params, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        self.internship.title = "Renamed"
+        self.internship.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_student_etag_follows_bookmarks(self):
+        self.client.force_authenticate(self.student)
+        url = reverse('internship-list')
+        etag = self.assertRevalidates(url)
+        Bookmark.objects.create(user=self.student, internship=self.internship)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'][0]['bookmarked'])
+
+    def test_profile(self):
+        self.client.force_authenticate(self.student)
+        url = reverse('user-profile')
+        etag = self.assertRevalidates(url)
+        self.client.patch(reverse('profile-update'), {'bio': "Hello"})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SparseFieldsetTests(APITestCase):
+    """?fields=/?omit= shape the response and the columns loaded."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.internship, = make_internships(self.recruiter, 1, description="lorem ipsum " * 500)
+
+    def get_list(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], queries[-1]['sql']
+
+    def test_list_defaults_to_compact_shape(self):
+        (row,), sql = self.get_list(reverse('internship-list'))
+        self.assertNotIn('description', row)
+        self.assertLessEqual(len(row['description_preview']), 161)
+        self.assertTrue(row['description_preview'].endswith('…'))
+        # Only the truncated preview is selected, never the whole column
+        self.assertEqual(sql.count('"description"'), 1)
+        self.assertIn('_description_preview', sql)
+
+        detail = self.client.get(reverse('internship-view', args=[self.internship.id])).data
+        self.assertEqual(detail['description'], self.internship.description)
+
+    def test_fields_and_omit_narrow_the_query(self):
+        (row,), sql = self.get_list(reverse('internship-list'), fields='id,title')
+        self.assertEqual(set(row), {'id', 'title'})
+        self.assertNotIn('"company"', sql)
+
+        (row,), sql = self.get_list(reverse('internship-list'), fields='id,description', omit='description')
+        self.assertEqual(set(row), {'id'})
+
+    def test_nested_selection(self):
+        Application.objects.create(user=self.student, internship=self.internship)
+        Bookmark.objects.create(user=self.student, internship=self.internship)
+        self.client.force_authenticate(self.student)
+
+        (row,), _ = self.get_list(reverse('student-applications'), fields='status,internship.title')
+        self.assertEqual(row, {'status': 'pending', 'internship': {'title': self.internship.title}})
+
+        (row,), sql = self.get_list(reverse('bookmark-list'), fields='id,internship_title')
+        self.assertEqual(set(row), {'id', 'internship_title'})
+        self.assertNotIn('"description"', sql)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse('internship-list'), {'fields': 'id,nope'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('internship-list'), {'fields': 'title.nope'})
+        self.assertEqual(response.status_code, 400)
+
+
+class InternshipRecommendationTests(APITestCase):
+    """Open postings ranked against the student's profile and history."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.student.profile.bio = "I love machine learning and python data pipelines"
+        self.student.profile.location = "Bangalore"
+        self.student.profile.save()
+
+        create = lambda title, description, location="Pune", **kwargs: Internship.objects.create(
+            title=title, description=description, company="Acme", location=location,
+            internship_type='on-site', recruiter=self.recruiter, **kwargs,
+        )
+        self.ml = create("Machine Learning Intern", "Train python models on data")
+        self.ml_local = create("Machine Learning Intern", "Train python models on data", location="Bangalore")
+        self.marketing = create("Marketing Intern", "Run social media campaigns")
+        self.design = create("Product Design Intern", "Figma prototypes and user research")
+        self.closed = create("Python Data Intern", "Python machine learning", status='closed')
+        internship_matrix.rebuild()
+        self.client.force_authenticate(self.student)
+
+    def recommended(self, **params):
+        response = self.client.get(reverse('internship-recommended'), params)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data]
+
+    def test_ranks_by_profile_and_location(self):
+        ids = self.recommended()
+        self.assertEqual(ids[:2], [self.ml_local.id, self.ml.id])
+        self.assertNotIn(self.closed.id, ids)
+
+    def test_history_shapes_results_and_is_excluded(self):
+        Application.objects.create(user=self.student, internship=self.design)
+        ids = self.recommended(limit=3)
+        self.assertNotIn(self.design.id, ids)
+        self.assertEqual(len(ids), 3)
+
+    def test_changes_are_applied_incrementally(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = Internship.objects.create(
+                title="Python Machine Learning Intern", description="Machine learning with python data",
+                company="Hooli", location="Bangalore", internship_type='remote', recruiter=self.recruiter,
+            )
+        self.assertEqual(self.recommended()[0], fresh.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh.status = 'closed'
+            fresh.save()
+        self.assertNotIn(fresh.id, self.recommended())
+
+    def test_scores_are_computed_outside_the_lock(self):
+        scores = InternshipMatrix._scores
+
+        def unlocked(matrices, columns, weights):
+            self.assertFalse(internship_matrix.lock.locked())
+            return scores(matrices, columns, weights)
+
+        with mock.patch.object(InternshipMatrix, '_scores', staticmethod(unlocked)):
+            ids = self.recommended()
+        self.assertEqual(ids[:2], [self.ml_local.id, self.ml.id])
+        # The per-thread query buffer is left empty
+        self.assertFalse(recommendations._query_buffers.buffer.any())
+
+    def test_results_are_cached(self):
+        Bookmark.objects.create(user=self.student, internship=self.marketing)
+        with CaptureQueriesContext(connection) as first:
+            ids = self.recommended()
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self.recommended(), ids)
+        # Applications, bookmarks and their internships are only read on a miss
+        self.assertEqual(len(second), len(first) - 3)
+
+    def test_fallback_until_the_matrix_is_built(self):
+        matrix = InternshipMatrix()
+        with mock.patch('internship.recommendations.internship_matrix', matrix), \
+                mock.patch('internship.recommendations.submit') as submit:
+            # Newest first, the student's own location ahead; not cached
+            fallback = [self.ml_local.id, self.design.id, self.marketing.id, self.ml.id]
+            self.assertEqual(self.recommended(), fallback)
+            self.assertEqual(self.recommended(), fallback)
+            self.assertEqual(submit.call_count, 1)
+            submit.call_args.args[0]()
+            self.assertEqual(self.recommended()[:2], [self.ml_local.id, self.ml.id])
+
+    def test_students_only(self):
+        self.client.force_authenticate(self.recruiter)
+        self.assertEqual(self.client.get(reverse('internship-recommended')).status_code, 403)
+
+
+class InternshipImportTests(APITestCase):
+    """Bulk import validates per row and writes in batches."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.client.force_authenticate(self.recruiter)
+        self.url = reverse('internship-import')
+
+    def post(self, body, content_type, **params):
+        url = f"{self.url}?{'&'.join(f'{k}={v}' for k, v in params.items())}"
+        return self.client.generic('POST', url, body, content_type=content_type)
+
+    def test_csv_import_reports_bad_rows(self):
+        body = (
+            "title,company,location,description,internship_type,stipend,expiry_date\n"
+            "Data Intern,Acme,Pune,Crunch numbers,remote,15000,2030-01-31\n"
+            "Bad Type,Acme,Pune,Oops,underwater,,\n"
+            "Design Intern,Globex,Delhi,Draw things,on-site,,\n"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(body, 'text/csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('internship_type', response.data['errors'][0]['errors'])
+
+        titles = set(Internship.objects.filter(recruiter=self.recruiter).values_list('title', flat=True))
+        self.assertEqual(titles, {"Data Intern", "Design Intern"})
+        self.assertEqual(ActivityLog.objects.filter(user=self.recruiter, action='internship_posted').count(), 2)
+        inserts = [q for q in queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 2)  # internships + activity logs
+
+    def test_json_and_ndjson(self):
+        rows = [
+            {'title': f"Intern {i}", 'company': "Acme", 'location': "Pune",
+             'description': "-", 'internship_type': 'remote'}
+            for i in range(3)
+        ]
+        response = self.post(json.dumps(rows), 'application/json')
+        self.assertEqual((response.status_code, response.data['created']), (201, 3))
+
+        body = '\n'.join(json.dumps(row) for row in rows[:2]) + '\n"not an object"\n'
+        response = self.post(body, 'application/x-ndjson')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'], [{'row': 3, 'errors': {'non_field_errors': ["Expected an object."]}}])
+
+    def test_dry_run_and_bad_input(self):
+        body = '[{"title": "X", "company": "Acme", "location": "Pune", "description": "-", "internship_type": "remote"}]'
+        response = self.post(body, 'application/json', dry_run=1)
+        self.assertEqual((response.status_code, response.data['created']), (200, 1))
+        self.assertFalse(Internship.objects.exists())
+
+        self.assertEqual(self.post('[{"title": ', 'application/json').status_code, 400)
+        self.assertEqual(self.post('title\nX', 'text/plain').status_code, 415)
+        self.client.force_authenticate(make_user('student', 'student'))
+        self.assertEqual(self.post(body, 'application/json').status_code, 403)
+
+    @override_settings(MAX_UPLOAD_SIZE=1024, IMPORT_MAX_UPLOAD_SIZE=64 * 1024)
+    def test_uploaded_files_have_their_own_limit(self):
+        header = "title,company,location,description,internship_type\n"
+        row = "Data Intern,Acme,Pune,Crunch numbers all day long,remote\n"
+
+        def upload(rows):
+            csv_file = SimpleUploadedFile('internships.csv', (header + row * rows).encode(), content_type='text/csv')
+            return self.client.post(self.url, {'file': csv_file}, format='multipart')
+
+        # Over the profile picture and resume limit, within the import one
+        response = upload(200)
+        self.assertEqual((response.status_code, response.data['created']), (201, 200))
+        response = upload(2000)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit is 0.0625 MB', response.data['detail'])
+
+    def test_management_command(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'internships.ndjson')
+            with open(path, 'w') as handle:
+                handle.write(json.dumps({'title': "Ops Intern", 'company': "Acme", 'location': "Pune",
+                                         'description': "-", 'internship_type': 'remote'}) + '\n')
+            call_command('import_internships', path, recruiter='recruiter', stdout=out)
+        self.assertIn("1 internships created", out.getvalue())
+        self.assertTrue(Internship.objects.filter(title="Ops Intern").exists())
+
+
+class ApplicationListQueryTests(APITestCase):
+    """Application lists run a fixed number of queries, however long the page."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.internships = make_internships(self.recruiter, 10)
+        self.posting = self.internships[0]
+
+    def apply(self, count):
+        for _ in range(count):
+            student = make_user(f'applicant{User.objects.count()}', 'student')
+            Application.objects.create(user=student, internship=self.posting)
+
+    def test_recruiter_applicants(self):
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        url = reverse('recruiter-applicants', args=[self.posting.id])
+        self.apply(1)
+        # profile (permission), count, page with users/profiles/internships
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        self.apply(9)
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        row = response.data['results'][0]
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(row['internship']['id'], self.posting.id)
+        self.assertIn('first_name', row['user']['profile'])
+
+    def test_applicants_only_view(self):
+        self.apply(10)
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        # ... plus the internship, once
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('recruiter-applicants', args=[self.posting.id]), {'view': 'applicants'})
+        self.assertEqual(response.data['internship']['id'], self.posting.id)
+        self.assertNotIn('description', response.data['internship'])
+        self.assertTrue(all('internship' not in row for row in response.data['results']))
+
+    def test_student_applications(self):
+        student = make_user('student', 'student')
+        Application.objects.create(user=student, internship=self.internships[0])
+        self.client.force_authenticate(User.objects.get(pk=student.pk))
+        # count, page, the viewer's role, bookmarked/applied flags
+        with self.assertNumQueries(4):
+            self.client.get(reverse('student-applications'))
+        for internship in self.internships[1:]:
+            Application.objects.create(user=student, internship=internship)
+        self.client.force_authenticate(User.objects.get(pk=student.pk))
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('student-applications'))
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertTrue(all(row['internship']['applied'] for row in response.data['results']))
+
+
+class BulkApplicationStatusTests(APITestCase):
+    """Recruiters update many application statuses in one request."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.other = make_user('other', 'recruiter')
+        posting = make_internships(self.recruiter, 1)[0]
+        foreign = make_internships(self.other, 1)[0]
+        self.applications = [
+            Application.objects.create(user=make_user(f'student{i}', 'student'), internship=posting)
+            for i in range(5)
+        ]
+        self.foreign = Application.objects.create(user=make_user('student9', 'student'), internship=foreign)
+        self.url = reverse('bulk-update-application-status')
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+
+    def post(self, updates):
+        return self.client.post(self.url, {'updates': updates}, format='json')
+
+    def test_updates_in_constant_queries(self):
+        updates = [{'id': a.id, 'status': 'accepted'} for a in self.applications[:4]]
+        updates.append({'id': self.applications[4].id, 'status': 'pending'})
+        # profile (permission), savepoint, locked select, update, log insert, release
+        with self.assertNumQueries(6):
+            response = self.post(updates)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': 4, 'unchanged': 1})
+        self.assertEqual(Application.objects.filter(status='accepted').count(), 4)
+        logs = ActivityLog.objects.filter(action='application_status_changed')
+        self.assertEqual(logs.count(), 4)
+        self.assertEqual(
+            set(logs.values_list('related_object_id', flat=True)),
+            {a.id for a in self.applications[:4]},
+        )
+
+    def test_foreign_application_rejects_everything(self):
+        response = self.post([
+            {'id': self.applications[0].id, 'status': 'rejected'},
+            {'id': self.foreign.id, 'status': 'rejected'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.filter(status='rejected').exists())
+        self.assertFalse(ActivityLog.objects.filter(action='application_status_changed').exists())
+
+    def test_invalid_payloads(self):
+        first = self.applications[0].id
+        for updates in (
+            [],
+            [{'id': first, 'status': 'hired'}],
+            [{'id': first, 'status': 'rejected'}, {'id': first, 'status': 'accepted'}],
+        ):
+            self.assertEqual(self.post(updates).status_code, 400)
+
+    def test_students_forbidden(self):
+        self.client.force_authenticate(User.objects.get(username='student0'))
+        response = self.post([{'id': self.applications[0].id, 'status': 'rejected'}])
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(STORAGES=LOCAL_STORAGES)
+class ApplicantExportTests(APITestCase):
+    """Applicant exports stream every row, in either format."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.posting = make_internships(self.recruiter, 1)[0]
+        for i in range(5):
+            Application.objects.create(
+                user=make_user(f'student{i}', 'student'), internship=self.posting,
+                resume='resumes/cv.pdf' if i == 0 else None,
+            )
+        self.url = reverse('recruiter-applicants-export', args=[self.posting.id])
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        response = self.client.get(self.url)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(self.content(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['username'], 'student0')
+        self.assertTrue(rows[0]['resume_url'].startswith('http://testserver/'))
+        self.assertEqual(rows[1]['resume_url'], '')
+        self.assertEqual(rows[0]['status'], 'pending')
+
+    def test_csv_formulas_are_neutralised(self):
+        Profile.objects.filter(user__username='student1').update(first_name='=HYPERLINK("x")', last_name='-2+3')
+        Profile.objects.filter(user__username='student2').update(first_name='@SUM(A1)', last_name='Ann-Marie')
+        rows = list(csv.DictReader(StringIO(self.content(self.client.get(self.url)))))
+        self.assertEqual((rows[1]['first_name'], rows[1]['last_name']), ('\'=HYPERLINK("x")', "'-2+3"))
+        self.assertEqual((rows[2]['first_name'], rows[2]['last_name']), ("'@SUM(A1)", 'Ann-Marie'))
+        # NDJSON is not opened in spreadsheets and keeps the values as they are
+        rows = [json.loads(line) for line in self.content(self.client.get(self.url, {'as': 'ndjson'})).splitlines()]
+        self.assertEqual(rows[1]['first_name'], '=HYPERLINK("x")')
+
+    def test_ndjson(self):
+        response = self.client.get(self.url, {'as': 'ndjson'})
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['username'] for row in rows], [f'student{i}' for i in range(5)])
+        self.assertIsNone(rows[1]['resume_url'])
+
+    def test_rows_are_written_in_chunks(self):
+        chunks = list(export_applicants(self.posting.id, 'csv', chunk_size=2))
+        # header, then 2 + 2 + 1 rows
+        self.assertEqual([chunk.count('\n') for chunk in chunks], [1, 2, 2, 1])
+
+    def test_other_recruiters_and_bad_format(self):
+        self.assertEqual(self.client.get(self.url, {'as': 'xlsx'}).status_code, 400)
+        self.client.force_authenticate(make_user('other', 'recruiter'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class PopularityCounterTests(APITestCase):
+    """applications_count / bookmarks_count follow applications and bookmarks."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.internships = make_internships(self.recruiter, 3)
+        self.students = [make_user(f'student{i}', 'student') for i in range(3)]
+        get_cache().clear()
+
+    def counts(self, internship):
+        internship.refresh_from_db()
+        return internship.applications_count, internship.bookmarks_count
+
+    def test_signals_keep_counts(self):
+        posting = self.internships[0]
+        updated_at = Internship.objects.get(pk=posting.pk).updated_at
+        for student in self.students:
+            Application.objects.create(user=student, internship=posting)
+        bookmark = Bookmark.objects.create(user=self.students[0], internship=posting)
+        self.assertEqual(self.counts(posting), (3, 1))
+        self.assertEqual(posting.updated_at, updated_at)
+
+        bookmark.delete()
+        Application.objects.filter(user=self.students[0]).delete()
+        self.assertEqual(self.counts(posting), (2, 0))
+        # Drifted counters never go negative
+        Internship.objects.filter(pk=posting.pk).update(applications_count=0)
+        Application.objects.filter(user=self.students[1]).delete()
+        self.assertEqual(self.counts(posting), (0, 0))
+
+    def test_repair_command(self):
+        Application.objects.bulk_create([
+            Application(user=student, internship=self.internships[1]) for student in self.students
+        ])
+        Bookmark.objects.bulk_create([Bookmark(user=self.students[0], internship=self.internships[2])])
+        Internship.objects.filter(pk=self.internships[0].pk).update(applications_count=7)
+        out = StringIO()
+        call_command('repair_internship_counters', batch_size=2, stdout=out)
+        self.assertIn('3 internships', out.getvalue())
+        self.assertEqual([self.counts(i) for i in self.internships], [(0, 0), (3, 0), (0, 1)])
+
+    def test_ordering_and_shapes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, student in enumerate(self.students):
+                for internship in self.internships[:i + 1]:
+                    Application.objects.create(user=student, internship=internship)
+        response = self.client.get(reverse('internship-list'), {'ordering': '-applications_count'})
+        self.assertEqual(
+            [row['id'] for row in response.data['results']], [i.id for i in self.internships],
+        )
+        self.assertNotIn('applications_count', response.data['results'][0])
+
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        response = self.client.get(reverse('my-posted-internships'), {'ordering': 'applications_count'})
+        rows = response.data['results']
+        self.assertEqual([row['applications_count'] for row in rows], [1, 2, 3])
+        self.assertIn('bookmarks_count', rows[0])
+
+    def test_cached_responses_follow_counts(self):
+        posting = self.internships[0]
+        list_params = {'ordering': '-applications_count'}
+        detail = reverse('internship-view', args=[posting.id])
+        self.client.get(reverse('internship-list'), list_params)
+        self.assertEqual(self.client.get(detail).data['applications_count'], 0)
+        etag = self.client.get(detail)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(user=self.students[0], internship=posting)
+        self.assertEqual(self.client.get(reverse('internship-list'), list_params)['X-Cache'], 'MISS')
+        response = self.client.get(detail)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['applications_count'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+        # The compact list does not show the counts and keeps its cache
+        self.client.get(reverse('internship-list'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookmark.objects.create(user=self.students[0], internship=posting)
+        self.assertEqual(self.client.get(reverse('internship-list'))['X-Cache'], 'HIT')
+
+
+class ApplyTests(APITestCase):
+    """Applying checks the posting with one query and leaves duplicates to the unique constraint."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.posting = make_internships(self.recruiter, 1)[0]
+        self.student = make_user('student', 'student')
+        self.client.force_authenticate(User.objects.get(pk=self.student.pk))
+
+    def apply(self, internship_id=None):
+        return self.client.post(reverse('apply-to-internship', args=[internship_id or self.posting.id]), {})
+
+    def test_apply_then_duplicate(self):
+        # profile (permission), posting, savepoint, insert, activity log, counter, release
+        with self.assertNumQueries(7):
+            self.assertEqual(self.apply().status_code, 201)
+        response = self.apply()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Application.objects.filter(user=self.student).count(), 1)
+        self.posting.refresh_from_db()
+        self.assertEqual(self.posting.applications_count, 1)
+
+    def test_rejected_targets(self):
+        self.assertEqual(self.apply(self.posting.id + 1000).status_code, 404)
+        Internship.objects.filter(pk=self.posting.pk).update(status='closed')
+        self.assertEqual(self.apply().status_code, 400)
+        Internship.objects.filter(pk=self.posting.pk).update(
+            status='open', expiry_date=timezone.localdate() - timedelta(days=1),
+        )
+        self.assertEqual(self.apply().status_code, 400)
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        Internship.objects.filter(pk=self.posting.pk).update(expiry_date=None)
+        self.assertEqual(self.apply().status_code, 403)
+        self.assertFalse(Application.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', "Concurrent writes need a server database")
+class ConcurrentApplyTests(TransactionTestCase):
+    """Simultaneous submits from one student create one application; the rest get a 409."""
+    THREADS = 8
+
+    def test_double_submit(self):
+        recruiter = make_user('recruiter', 'recruiter')
+        posting = make_internships(recruiter, 1)[0]
+        student = make_user('student', 'student')
+        url = reverse('apply-to-internship', args=[posting.id])
+        barrier = threading.Barrier(self.THREADS)
+        codes = []
+
+        def submit():
+            client = APIClient()
+            client.force_authenticate(User.objects.get(pk=student.pk))
+            try:
+                barrier.wait()
+                codes.append(client.post(url, {}).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(codes), [201] + [409] * (self.THREADS - 1))
+        self.assertEqual(Application.objects.filter(user=student, internship=posting).count(), 1)
+        posting.refresh_from_db()
+        self.assertEqual(posting.applications_count, 1)
+
+
+class UploadTests(APITestCase):
+    """Profile pictures and resumes go through the default storage, within size limits."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        overrides = override_settings(STORAGES=LOCAL_STORAGES, MEDIA_ROOT=media.name, MAX_UPLOAD_SIZE=64 * 1024)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.student = make_user('student', 'student')
+        self.client.force_authenticate(User.objects.get(pk=self.student.pk))
+
+    def image(self, size=(8, 8), **save_options):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, 'JPEG', **save_options)
+        return SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def upload(self, image):
+        return self.client.patch(reverse('profile-update'), {'profile_picture': image}, format='multipart')
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_profile_picture_renditions(self):
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(self.image((1200, 800), exif=exif.tobytes()))
+            # Answered before the renditions exist
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.data['profile']['profile_picture_url'])
+
+        profile = Profile.objects.get(user=self.student)
+        self.assertTrue(profile.profile_picture_path.startswith(f'profile_pics/{self.student.id}/'))
+        self.assertEqual(set(profile.profile_picture_renditions), set(RENDITIONS))
+        for rendition, size in RENDITIONS.items():
+            name = profile.profile_picture_renditions[rendition].removeprefix(settings.MEDIA_URL)
+            with default_storage.open(name) as file, Image.open(file) as image:
+                self.assertEqual(image.size, (size, size))
+                self.assertEqual(len(image.getexif()), 0)
+
+        self.client.force_authenticate(User.objects.get(pk=self.student.pk))
+        me = self.client.get(reverse('user-profile')).data
+        self.assertEqual(
+            me['profile']['profile_picture_url'],
+            'http://testserver' + profile.profile_picture_renditions['medium'],
+        )
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_replaced_pictures_are_deleted(self):
+        folder = f'profile_pics/{self.student.id}'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload(self.image())
+        first = Profile.objects.get(user=self.student).profile_picture_path
+        self.assertEqual(len(default_storage.listdir(folder)[1]), 1 + len(RENDITIONS))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload(self.image())
+        profile = Profile.objects.get(user=self.student)
+        self.assertNotEqual(profile.profile_picture_path, first)
+        files = default_storage.listdir(folder)[1]
+        self.assertEqual(len(files), 1 + len(RENDITIONS))
+        self.assertIn(profile.profile_picture_path.rsplit('/', 1)[1], files)
+        for url in profile.profile_picture_renditions.values():
+            self.assertTrue(default_storage.exists(url.removeprefix(settings.MEDIA_URL)))
+
+    def test_stale_picture_and_command(self):
+        # Two uploads; the first one's task runs late and must not win
+        self.upload(self.image())
+        first = Profile.objects.get(user=self.student).profile_picture_path
+        self.upload(self.image())
+        process_profile_picture(self.student.profile.pk, first)
+        profile = Profile.objects.get(user=self.student)
+        self.assertEqual(profile.profile_picture_renditions, {})
+        # The late task cleans up after itself
+        self.assertFalse(default_storage.exists(first))
+        self.assertEqual(len(default_storage.listdir(f'profile_pics/{self.student.id}')[1]), 1)
+        self.assertIsNone(self.client.get(reverse('user-profile')).data['profile']['profile_picture_url'])
+
+        out = StringIO()
+        call_command('process_profile_pictures', stdout=out)
+        self.assertIn('Processed 1 profile pictures', out.getvalue())
+        profile.refresh_from_db()
+        self.assertIn(profile.profile_picture_path.rsplit('.', 1)[0], profile.profile_picture_renditions['small'])
+
+    def test_resume_and_size_limit(self):
+        posting = make_internships(make_user('recruiter', 'recruiter'), 2)
+        url = lambda internship: reverse('apply-to-internship', args=[internship.id])
+        resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf')
+        self.assertEqual(self.client.post(url(posting[0]), {'resume': resume}, format='multipart').status_code, 201)
+        self.assertTrue(default_storage.exists(Application.objects.get().resume.name))
+        # A duplicate application does not leave its resume behind
+        resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 again', content_type='application/pdf')
+        self.assertEqual(self.client.post(url(posting[0]), {'resume': resume}, format='multipart').status_code, 409)
+        self.assertEqual(len(default_storage.listdir('resumes')[1]), 1)
+
+        # Refused by Content-Length before reading, or while the file streams in
+        for size in (256 * 1024, 80 * 1024):
+            too_large = SimpleUploadedFile('cv.pdf', b'x' * size, content_type='application/pdf')
+            response = self.client.post(url(posting[1]), {'resume': too_large}, format='multipart')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('limit is 0.0625 MB', response.data['detail'])
+        self.assertEqual(Application.objects.count(), 1)
+
+
+class SupabaseStorageTests(TestCase):
+    """Chunked resumable uploads, retried without network access through a mock transport."""
+
+    def storage(self, handler):
+        return SupabaseStorage(
+            url='https://project.supabase.co', key='key', chunk_size=4, backoff=0,
+            transport=httpx.MockTransport(handler),
+        )
+
+    def test_chunked_upload_resumes_after_failure(self):
+        received, calls = bytearray(), []
+        fail_once = {'armed': True}
+
+        def handler(request):
+            calls.append(request.method)
+            if request.method == 'POST':
+                self.assertEqual(request.headers['Upload-Length'], '10')
+                return httpx.Response(201, headers={'Location': 'https://project.supabase.co/storage/v1/upload/resumable/abc'})
+            if request.method == 'HEAD' and '/object/' in request.url.path:
+                return httpx.Response(404)  # exists()
+            if request.method == 'HEAD':
+                return httpx.Response(200, headers={'Upload-Offset': str(len(received))})
+            self.assertEqual(int(request.headers['Upload-Offset']), len(received))
+            received.extend(request.content)
+            if len(received) == 8 and fail_once.pop('armed', False):
+                # The chunk arrived but the response got lost
+                return httpx.Response(503)
+            return httpx.Response(204, headers={'Upload-Offset': str(len(received))})
+
+        name = self.storage(handler).save('resumes/cv.pdf', ContentFile(b'0123456789'))
+        self.assertEqual(name, 'resumes/cv.pdf')
+        self.assertEqual(bytes(received), b'0123456789')
+        self.assertEqual(calls, ['HEAD', 'POST', 'PATCH', 'PATCH', 'HEAD', 'PATCH'])
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(404) if request.method == 'HEAD' else httpx.Response(403, text='denied')
+
+        with self.assertRaises(StorageError):
+            self.storage(handler).save('resumes/cv.pdf', ContentFile(b'data'))
+        self.assertEqual(calls, ['HEAD', 'POST'])
+
+    def test_url(self):
+        storage = self.storage(lambda request: httpx.Response(200))
+        self.assertEqual(
+            storage.url('profile_pics/3/a b.png'),
+            'https://project.supabase.co/storage/v1/object/public/profile_pics/3/a%20b.png',
+        )
+
+
+class ActivityLogListTests(APITestCase):
+    """A user's activity log is keyset-paged with no COUNT(*), filtered in the index."""
+
+    def setUp(self):
+        self.user = make_user('student', 'student')
+        other = make_user('other', 'student')
+        start = timezone.now() - timedelta(days=30)
+        ActivityLog.objects.bulk_create([
+            ActivityLog(user=user, action=('login', 'logout')[i % 2], timestamp=start + timedelta(hours=i))
+            for user in (self.user, other) for i in range(25)
+        ])
+        self.start = start
+        self.client.force_authenticate(self.user)
+        self.url = reverse('user-activity-logs')
+
+    def browse(self, **params):
+        rows, url, pages = [], self.url, 0
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                data = self.client.get(url, params if url == self.url else None).json()
+            self.assertFalse([q for q in queries if 'COUNT(' in q['sql']])
+            self.assertNotIn('count', data)
+            self.assertEqual(data['has_more'], data['next'] is not None)
+            rows += data['results']
+            url, pages = data['next'], pages + 1
+        return rows, pages
+
+    def test_keyset_pages(self):
+        expected = list(
+            ActivityLog.objects.filter(user=self.user).order_by('-timestamp', '-id').values_list('id', flat=True)
+        )
+        rows, pages = self.browse()
+        self.assertEqual([row['id'] for row in rows], expected)
+        self.assertGreater(pages, 1)
+
+    def test_action_and_date_range(self):
+        params = {
+            'action': 'logout',
+            'start_date': (self.start + timedelta(hours=5)).isoformat(),
+            'end_date': (self.start + timedelta(hours=20)).isoformat(),
+        }
+        rows, _ = self.browse(**params)
+        self.assertEqual([row['action'] for row in rows], ['logout'] * 8)
+        self.assertEqual([row['timestamp'] for row in rows], sorted((row['timestamp'] for row in rows), reverse=True))
+
+    def test_page_numbers_on_request(self):
+        data = self.client.get(self.url, {'pagination': 'page'}).json()
+        self.assertEqual(data['count'], ActivityLog.objects.filter(user=self.user).count())
+
+    @skipUnless(connection.vendor == 'postgresql', "Query plans are checked on PostgreSQL only")
+    def test_seek_uses_index(self):
+        ActivityLog.objects.bulk_create([
+            ActivityLog(user=self.user, action=random.choice(['login', 'logout', 'bookmark_added']),
+                        timestamp=self.start - timedelta(minutes=i))
+            for i in range(20000)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE internship_activitylog')
+        ordering = UserActivityLogListView.cursor_ordering
+        last = ActivityLog.objects.filter(user=self.user).order_by(*ordering)[5000]
+        seek = ListPagination._seek_filter(ordering, [last.timestamp, last.id])
+        for columns, queryset in [
+            (['user_id', 'timestamp'], ActivityLog.objects.filter(user=self.user)),
+            (['user_id', 'action', 'timestamp'], ActivityLog.objects.filter(user=self.user, action='login')),
+        ]:
+            plan = queryset.filter(seek).order_by(*ordering)[:11].explain()
+            # Filter, seek bound and order all come from the index, on the partitions it touches
+            conditions = ' '.join(line for line in plan.splitlines() if 'Index Cond' in line)
+            for column in columns:
+                self.assertIn(column, conditions, plan)
+            self.assertNotIn('Sort', plan, plan)
+
+
+@override_settings(ACTIVITY_LOG_SYNC=False)
+class ActivityLogBufferTests(APITestCase):
+    """Activity logs are buffered after commit, spooled, and written in one batch."""
+
+    def setUp(self):
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.spool = Path(spool.name)
+        self.buffer = ActivityLogBuffer(batch_size=100, interval=60, spool_dir=self.spool, autostart=False)
+        patcher = mock.patch('internship.activity.activity_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.posting = make_internships(self.recruiter, 1)[0]
+        self.student = make_user('student', 'student')
+        self.client.force_authenticate(User.objects.get(pk=self.student.pk))
+
+    def test_requests_only_enqueue(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse('bookmark-add', args=[self.posting.id]))
+                self.client.post(reverse('apply-to-internship', args=[self.posting.id]), {})
+        self.assertFalse([q for q in queries if ActivityLog._meta.db_table in q['sql']])
+        self.assertEqual(len(self.buffer.events), 2)
+        self.assertEqual(len(list(self.spool.glob('*.ndjson'))), 1)
+
+        # Users, the title the bookmark didn't have loaded, one insert
+        with self.assertNumQueries(3):
+            self.buffer.flush()
+        details = dict(ActivityLog.objects.values_list('action', 'details'))
+        self.assertEqual(details['bookmark_added'], f"Bookmarked {self.posting.title}")
+        self.assertEqual(details['application_submitted'], f"Applied to {self.posting.title}")
+        self.assertFalse(list(self.spool.iterdir()))
+
+    def test_bulk_writes_go_through_the_buffer(self):
+        application = Application.objects.create(user=self.student, internship=self.posting)
+        self.buffer.flush()
+        self.client.force_authenticate(User.objects.get(pk=self.recruiter.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('bulk-update-application-status'),
+                {'updates': [{'id': application.id, 'status': 'accepted'}]}, format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ActivityLog.objects.filter(action='application_status_changed').exists())
+        self.assertEqual([event['action'] for event in self.buffer.events], ['application_status_changed'])
+
+        self.buffer.flush()
+        self.assertEqual(
+            ActivityLog.objects.get(action='application_status_changed').details,
+            f"Status changed from pending to accepted for {self.posting.title}",
+        )
+
+    def test_rolled_back_changes_log_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Bookmark.objects.create(user=self.student, internship=self.posting)
+                transaction.set_rollback(True)
+        self.assertEqual(self.buffer.events, [])
+
+    def test_failed_write_is_replayed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookmark.objects.create(user=self.student, internship=self.posting)
+        with mock.patch('internship.activity.write_events', side_effect=DatabaseError), \
+                self.assertLogs('internship.activity', 'ERROR'):
+            self.buffer.flush()
+        self.assertEqual([path.name[:7] for path in self.spool.iterdir()], ['failed-'])
+        self.assertFalse(ActivityLog.objects.exists())
+
+        self.assertEqual(replay_spool(self.spool), 1)
+        self.assertTrue(ActivityLog.objects.filter(user=self.student, action='bookmark_added').exists())
+        self.assertFalse(list(self.spool.iterdir()))
+
+    def test_spool_of_dead_process(self):
+        event = {
+            'user_id': self.student.pk, 'action': 'bookmark_added', 'related_object_id': self.posting.pk,
+            'details': "Bookmarked {title}", 'internship_id': self.posting.pk, 'title': None, 'username': None,
+            'timestamp': '2024-01-02T03:04:05+00:00',
+        }
+        # A process id that can't be running, and a last line cut short by the crash
+        (self.spool / '99999999-0a1b.ndjson').write_text(json.dumps(event) + '\n{"user_id": ')
+        live = self.spool / f'{os.getpid()}-ffff.ndjson'
+        live.write_text(json.dumps(event) + '\n')
+
+        out = StringIO()
+        with self.assertLogs('internship.activity', 'WARNING'):
+            call_command('flush_activity_log', spool_dir=str(self.spool), stdout=out)
+        self.assertIn("Wrote 1 activity log events", out.getvalue())
+        log = ActivityLog.objects.get()
+        self.assertEqual(log.timestamp.isoformat(), '2024-01-02T03:04:05+00:00')
+        self.assertEqual(log.details, f"Bookmarked {self.posting.title}")
+        self.assertEqual(list(self.spool.iterdir()), [live])
+
+    def test_events_of_deleted_users_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookmark.objects.create(user=self.student, internship=self.posting)
+        User.objects.filter(pk=self.student.pk).delete()
+        self.buffer.flush()
+        self.assertFalse(ActivityLog.objects.exists())
+        self.assertFalse(list(self.spool.iterdir()))
+
+
+class ActivityLogRetentionTests(APITestCase):
+    """Old months are archived and dropped whole; reads work across partitions."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        overrides = override_settings(STORAGES=LOCAL_STORAGES, MEDIA_ROOT=media.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = make_user('student', 'student')
+        self.this_month = month_start()
+        self.old_months = [add_months(self.this_month, -15), add_months(self.this_month, -14)]
+        for month in [*self.old_months, self.this_month]:
+            at = timezone.make_aware(timezone.datetime.combine(month.replace(day=2), timezone.datetime.min.time()))
+            for action in ('login', 'logout'):
+                ActivityLog.objects.create(user=self.user, action=action, timestamp=at)
+
+    def test_partitions_archive_and_list(self):
+        if is_partitioned():
+            # The old months start out in the default partition and move into their own
+            create_partitions(months_ahead=1, today=self.old_months[0])
+            self.assertTrue(set(self.old_months) <= set(monthly_partitions()))
+            create_partitions(months_ahead=2)
+            self.assertIn(add_months(self.this_month, 2), monthly_partitions())
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('user-activity-logs'), {'action': 'login'})
+        timestamps = [row['timestamp'] for row in response.data['results']]
+        self.assertEqual(len(timestamps), 3)
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+        expired = expire(retain_months=12)
+        self.assertEqual([(month, rows) for month, rows, _ in expired], [(month, 2) for month in self.old_months])
+        with default_storage.open(expired[0][2]) as archive:
+            rows = [json.loads(line) for line in gzip.decompress(archive.read()).decode().splitlines()]
+        self.assertEqual([row['action'] for row in rows], ['login', 'logout'])
+        self.assertEqual(ActivityLog.objects.filter(action__in=['login', 'logout']).count(), 2)
+        if is_partitioned():
+            self.assertFalse(set(self.old_months) & set(monthly_partitions()))
+
+        # Nothing left to expire
+        self.assertEqual(expire(retain_months=12), [])
+
+
+class ChangeTrackingTests(APITestCase):
+    """Saves write only changed columns; signals log only real changes."""
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.student = make_user('student', 'student')
+        self.posting = make_internships(self.recruiter, 1)[0]
+
+    def writes(self, fn):
+        with CaptureQueriesContext(connection) as queries:
+            fn()
+        return [query['sql'] for query in queries if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+    def logs(self, user, action):
+        return list(ActivityLog.objects.filter(user=user, action=action).order_by('id').values_list('details', flat=True))
+
+    def test_login_writes_only_last_login(self):
+        user = User.objects.get(pk=self.student.pk)
+        self.assertEqual(len(self.writes(lambda: update_last_login(None, user))), 1)
+        # A loaded but unchanged profile isn't saved along with its user
+        user.profile.bio
+        self.assertEqual(len(self.writes(user.save)), 1)
+        user.profile.bio = "Edited through the user"
+        self.assertEqual(len(self.writes(user.save)), 3)  # user, profile, activity log
+        self.assertEqual(self.logs(user, 'profile_updated')[-1], "Profile updated for student\nbio changed")
+
+    def test_edits_write_changed_columns_and_log_diffs(self):
+        self.client.force_authenticate(self.recruiter)
+        url = reverse('internship-edit', args=[self.posting.id])
+        writes = self.writes(lambda: self.client.patch(url, {'stipend': '1500', 'location': "Pune"}))
+        update = next(sql for sql in writes if sql.startswith('UPDATE "internship_internship"'))
+        self.assertIn('"stipend"', update)
+        self.assertNotIn('"location"', update)
+        self.assertNotIn('"description"', update)
+        self.assertEqual(self.logs(self.recruiter, 'internship_updated'), ["Intern 0\nstipend: — → 1500.00"])
+
+        # The same edit again is a no-op: nothing written, nothing logged
+        self.assertEqual(self.writes(lambda: self.client.patch(url, {'stipend': '1500.00'})), [])
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.writes(lambda: self.client.patch(reverse('profile-update'), {'location': ''})), [])
+        self.assertEqual(len(self.logs(self.recruiter, 'internship_updated')), 1)
+
+        application = Application.objects.create(user=self.student, internship=self.posting)
+        self.client.force_authenticate(self.recruiter)
+        url = reverse('update-application-status', args=[application.id])
+        for _ in range(2):
+            self.client.patch(url, {'status': 'accepted'})
+        self.assertEqual(
+            self.logs(self.student, 'application_status_changed'), ["Status changed from pending to accepted for Intern 0"],
+        )
+
+    def test_tracked_values(self):
+        profile = Profile.objects.get(user=self.student)
+        profile.profile_picture_renditions['small'] = '/media/small.webp'
+        profile.location = "{Pune}"
+        self.assertEqual(set(profile.changes()), {'profile_picture_renditions', 'location'})
+        profile.save()
+        self.assertEqual(profile.changes(), {})
+        self.assertEqual(self.logs(self.student, 'profile_updated')[-1], "Profile updated for student\nlocation: — → {Pune}")
+
+        # Fields deferred when loaded count as changed once set
+        posting = Internship.objects.only('title').get(pk=self.posting.pk)
+        posting.status = 'closed'
+        self.assertEqual(list(posting.changes()), ['status'])
+        posting.save()
+        self.posting.refresh_from_db()
+        self.assertEqual((self.posting.status, self.posting.changes()), ('closed', {}))
+
+
+@override_settings(AUTH_VERSION_CACHE_TIMEOUT=60)  # as with a shared cache
+class RoleTokenAuthenticationTests(APITestCase):
+    """Access tokens carry the role: no User or Profile query per request."""
+
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_user('recruiter', 'recruiter')
+        self.posting = make_internships(self.recruiter, 1)[0]
+
+    def obtain(self, username='recruiter'):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': username, 'password': 'test-password'})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get(self, name, access):
+        return self.client.get(reverse(name), HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_requests_skip_user_and_profile(self):
+        access = self.obtain()['access']
+        self.assertEqual(AccessToken(access)['role'], 'recruiter')
+        self.get('my-posted-internships', access)  # caches the auth version
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get('my-posted-internships', access)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.posting.id])
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('"auth_user"', tables)
+        self.assertNotIn('"internship_profile"', tables)
+
+        # Views that need the user load it whole, once
+        with CaptureQueriesContext(connection) as queries:
+            me = self.get('user-profile', access).data
+        self.assertEqual((me['username'], me['profile']['role']), ('recruiter', 'recruiter'))
+        self.assertEqual(sum('FROM "auth_user"' in query['sql'] for query in queries), 1)
+
+        # Tokens issued without role claims still work
+        self.assertEqual(self.get('my-posted-internships', RefreshToken.for_user(self.recruiter).access_token).status_code, 200)
+
+    def test_role_change_deactivation_and_logout(self):
+        tokens = self.obtain()
+        profile = Profile.objects.get(user=self.recruiter)
+        profile.role = 'student'
+        profile.save()
+        self.assertEqual(self.get('my-posted-internships', tokens['access']).status_code, 401)
+        # A refresh picks up the new role
+        access = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']}).data['access']
+        self.assertEqual(AccessToken(access)['role'], 'student')
+        self.assertEqual(self.get('my-posted-internships', access).status_code, 403)
+
+        # Logout ends this session only; another device stays logged in
+        other = self.obtain()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.post(reverse('auth_logout'), {'refresh': tokens['refresh']}).status_code, 205)
+        self.client.credentials()
+        self.assertEqual(self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']}).status_code, 401)
+        self.assertEqual(self.get('user-profile', other['access']).status_code, 200)
+        self.assertEqual(self.client.post(reverse('token_refresh'), {'refresh': other['refresh']}).status_code, 200)
+
+        access = self.obtain()['access']
+        self.assertEqual(self.get('user-profile', access).status_code, 200)
+        User.objects.filter(pk=self.recruiter.pk).update(is_active=False)
+        User.objects.get(pk=self.recruiter.pk).save()
+        self.assertEqual(self.get('user-profile', access).status_code, 401)
+
+    @override_settings(AUTH_VERSION_CACHE_TIMEOUT=0)
+    def test_version_read_every_time_without_a_shared_cache(self):
+        access = self.obtain()['access']
+        self.assertEqual(self.get('my-posted-internships', access).status_code, 200)
+        self.assertIsNone(cache.get(f'auth-version:{self.recruiter.pk}'))
+        # A logout handled by another worker only clears that worker's cache
+        Profile.objects.filter(user=self.recruiter).update(auth_version=F('auth_version') + 1)
+        self.assertEqual(self.get('my-posted-internships', access).status_code, 401)
+
+    def test_saving_the_request_user_runs_user_signals(self):
+        # request.user is a TokenUser; post_save comes with the proxy as sender
+        access = self.obtain()['access']
+        key = f'auth-version:{self.recruiter.pk}'
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('user-update'), {'username': 'hiring', 'email': 'hr@example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(key))
+
+        self.get('my-posted-internships', access)
+        self.assertIsNotNone(cache.get(key))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                reverse('change-password'), {'old_password': 'test-password', 'new_password': 'N3w-password!'},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(key))
+
+        user = TokenUser.from_claims(self.recruiter.pk, 'recruiter')
+        user.profile.bio = 'Hiring interns'
+        user.save()
+        self.assertEqual(Profile.objects.get(user=self.recruiter).bio, 'Hiring interns')
@@ -0,0 +1,100 @@
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from .models import Profile
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# PROFILE PICTURE RENDITIONS
+# --------------------------
+# An uploaded profile picture is stored as is (`Profile.profile_picture_path`)
+# and a background task turns it into small square renditions, with EXIF and
+# other metadata stripped, recorded in `Profile.profile_picture_renditions`.
+# Until they exist the API shows no picture (the frontend's default avatar).
+# Once they are recorded, the picture they replace is deleted with its
+# renditions; a picture replaced before its renditions were recorded is
+# deleted by its own task.
+
+RENDITIONS = {'small': 64, 'medium': 256, 'large': 512}
+DEFAULT_RENDITION = 'medium'
+# WebP everywhere, unless Pillow was built without it
+FORMAT, EXTENSION = ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+SAVE_OPTIONS = {
+    'WEBP': {'quality': 82, 'method': 4},
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+}[FORMAT]
+
+
+def _load(file):
+    image = Image.open(file)
+    # JPEG can decode straight at a reduced scale, much faster for photos
+    largest = max(RENDITIONS.values())
+    image.draft('RGB', (largest, largest))
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+    return image.convert('RGBA' if has_alpha and FORMAT == 'WEBP' else 'RGB')
+
+
+def render(file):
+    """{rendition: encoded bytes} for an image file."""
+    image = _load(file)
+    output = {}
+    for name, size in RENDITIONS.items():
+        thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        thumbnail.info.clear()  # no EXIF, ICC or comments in the output
+        buffer = BytesIO()
+        thumbnail.save(buffer, FORMAT, **SAVE_OPTIONS)
+        output[name] = buffer.getvalue()
+    return output
+
+
+def _rendition_name(name, rendition):
+    return f"{name.rsplit('.', 1)[0]}-{rendition}.{EXTENSION}"
+
+
+def delete_picture(name):
+    """Delete a stored profile picture and its renditions (missing ones are skipped)."""
+    for stored in (name, *(_rendition_name(name, rendition) for rendition in RENDITIONS)):
+        default_storage.delete(stored)
+
+
+def process_profile_picture(profile_id, name, previous=None):
+    """
+    Store the renditions of the picture saved as `name` and record their
+    URLs, unless the profile has moved on to another picture meanwhile.
+    `previous` is the picture `name` replaced.
+    """
+    with default_storage.open(name) as file:
+        renditions = render(file)
+    urls = {}
+    for rendition, data in renditions.items():
+        saved = default_storage.save(_rendition_name(name, rendition), ContentFile(data))
+        urls[rendition] = default_storage.url(saved)
+    updated = Profile.objects.filter(pk=profile_id, profile_picture_path=name).update(
+        profile_picture_renditions=urls,
+        profile_picture_url=urls[DEFAULT_RENDITION],
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        logger.info("Profile %s changed its picture while %s was processed", profile_id, name)
+        delete_picture(name)
+    if previous:
+        delete_picture(previous)
+    return urls
+
+
+def rendition_url(profile, rendition=DEFAULT_RENDITION):
+    """URL of a profile's picture in the given rendition, or None."""
+    renditions = profile.profile_picture_renditions
+    if renditions:
+        return renditions.get(rendition) or renditions.get(DEFAULT_RENDITION)
+    if profile.profile_picture_path:
+        return None  # still processing
+    # Pictures uploaded before renditions existed
+    return profile.profile_picture_url or None
@@ -21,7 +21,12 @@ urlpatterns = [
     # INTERNSHIPS
     # --------------------------
     path('internships/', InternshipListView.as_view(), name='internship-list'),           # Anyone
+    path('internships/facets/', InternshipFacetView.as_view(), name='internship-facets'), # Anyone
+    path('internships/autocomplete/', InternshipAutocompleteView.as_view(), name='internship-autocomplete'), # Anyone
+    path('internships/recommended/', InternshipRecommendationView.as_view(), name='internship-recommended'), # Authenticated students
+    path('internships/import/', InternshipImportView.as_view(), name='internship-import'),          # Authenticated recruiters
     path('internships/create/', InternshipCreateView.as_view(), name='internship-create'), # Authenticated recruiters
+    path('internships/viewer-state/', ViewerStateView.as_view(), name='internship-viewer-state'), # Authenticated users
     path('internships/mine/', MyPostedInternshipsView.as_view(), name='my-posted-internships'), # Authenticated recruiters
     path('internships/<int:pk>/view/', InternshipRetrieveView.as_view(), name='internship-view'), # Anyone
     path('internships/<int:pk>/edit/', InternshipEditView.as_view(), name='internship-edit'),     # Authenticated recruiters (only their own)
@@ -32,6 +37,8 @@ urlpatterns = [
     path('applications/apply/<int:internship_id>/', ApplyToInternshipView.as_view(), name='apply-to-internship'), # Authenticated students
     path('applications/mine/', StudentApplicationListView.as_view(), name='student-applications'),              # Authenticated students
     path('internships/<int:internship_id>/applicants/', RecruiterApplicantListView.as_view(), name='recruiter-applicants'), # Authenticated recruiters
+    path('internships/<int:internship_id>/applicants/export/', RecruiterApplicantExportView.as_view(), name='recruiter-applicants-export'), # Authenticated recruiters
+    path('applications/status/', ApplicationBulkStatusView.as_view(), name='bulk-update-application-status'),          # Authenticated recruiters
     path('applications/<int:pk>/status/', ApplicationStatusUpdateView.as_view(), name='update-application-status'),      # Authenticated recruiters
     path('applications/check/<int:internship_id>/', ApplicationCheckView.as_view(), name='application-check'),          # Authenticated students
 
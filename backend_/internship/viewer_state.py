@@ -0,0 +1,116 @@
+from django.db import models
+from django.db.models import CharField, Count, Max, Value
+from rest_framework import serializers
+
+from .models import Application, Bookmark
+from .permissions import role_of
+
+
+def is_student(user):
+    return role_of(user) == 'student'
+
+
+def viewer_version(user):
+    """
+    Cheap marker that changes whenever a student's bookmarks or applications
+    do (used in ETags of responses carrying bookmarked/applied flags).
+    None for everyone else, whose responses carry no per-user state.
+    """
+    if not is_student(user):
+        return None
+    marker = lambda queryset: tuple(queryset.aggregate(n=Count('id'), last=Max('id')).values())
+    return (
+        marker(Bookmark.objects.filter(user=user)),
+        marker(Application.objects.filter(user=user)),
+    )
+
+
+# Most internships the viewer-state endpoint answers for in one request
+MAX_BATCH = 300
+
+
+class ViewerState:
+    """
+    Per-request cache of which internships the current student has bookmarked
+    or applied to (and the application's status). Flags for a batch of
+    internships are loaded together with one UNION query; ids already loaded
+    are never queried again.
+    """
+
+    def __init__(self, user, enabled=None):
+        self.user = user
+        # Serialized internships carry the flags for students only; the
+        # viewer-state endpoints answer for any signed-in user
+        self.enabled = is_student(user) if enabled is None else enabled
+        self.loaded = set()
+        self.bookmarked = set()
+        self.applied = {}  # internship id -> application status
+
+    @classmethod
+    def for_context(cls, context):
+        """Return the state stored in a serializer context, creating it on first use."""
+        state = context.get('viewer_state')
+        if state is None:
+            request = context.get('request')
+            state = context['viewer_state'] = cls(getattr(request, 'user', None))
+        return state
+
+    def load(self, internship_ids):
+        missing = set(internship_ids) - self.loaded
+        if not self.enabled or not missing:
+            return
+        self.loaded |= missing
+
+        # A bookmark row has no status, which tells the two halves apart
+        bookmarks = (
+            Bookmark.objects.filter(user=self.user, internship_id__in=missing)
+            .annotate(application_status=Value(None, output_field=CharField()))
+            .values_list('internship_id', 'application_status')
+        )
+        applications = (
+            Application.objects.filter(user=self.user, internship_id__in=missing)
+            .values_list('internship_id', 'status')
+        )
+        for internship_id, status in bookmarks.union(applications, all=True):
+            if status is None:
+                self.bookmarked.add(internship_id)
+            else:
+                self.applied[internship_id] = status
+
+    def is_bookmarked(self, internship_id):
+        self.load([internship_id])
+        return internship_id in self.bookmarked
+
+    def has_applied(self, internship_id):
+        self.load([internship_id])
+        return internship_id in self.applied
+
+    def application_status(self, internship_id):
+        self.load([internship_id])
+        return self.applied.get(internship_id)
+
+    def flags(self, internship_ids):
+        """{id: {applied, bookmarked, application_status}} for a batch of internships."""
+        self.load(internship_ids)
+        return {
+            internship_id: {
+                'applied': internship_id in self.applied,
+                'bookmarked': internship_id in self.bookmarked,
+                'application_status': self.applied.get(internship_id),
+            }
+            for internship_id in internship_ids
+        }
+
+
+class ViewerStateListSerializer(serializers.ListSerializer):
+    """
+    List serializer that primes `ViewerState` for every internship on the page
+    before the rows are serialized. The child names the attribute holding the
+    internship id via `Meta.viewer_state_internship_field`.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        field = getattr(self.child.Meta, 'viewer_state_internship_field', 'id')
+        ViewerState.for_context(self.context).load(getattr(item, field) for item in items)
+        return super().to_representation(items)
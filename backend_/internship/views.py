@@ -4,6 +4,10 @@ from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth import update_session_auth_hash
 from django.core.mail import EmailMessage
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.http import StreamingHttpResponse
+from django_filters import utils as filter_utils
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions, status, filters
 from rest_framework.decorators import api_view, permission_classes
@@ -12,16 +16,30 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from .models import Profile, Internship, Application, Bookmark, ActivityLog
 from .serializers import (
     UserSerializer, ProfileUpdateSerializer, UserUpdateSerializer,
     UserCreateSerializer, InternshipSerializer, ApplicationCreateSerializer,
-    ApplicationListSerializer, ApplicationStatusUpdateSerializer,
+    ApplicationListSerializer, ApplicantSerializer, ApplicationStatusUpdateSerializer,
+    ApplicationBulkStatusSerializer,
     BookmarkSerializer, ActivityLogSerializer, ChangePasswordSerializer
 )
-from .permissions import IsRecruiter, IsStudent
+from .activity import activity, log_activities
+from .autocomplete import SUGGESTION_FIELDS, suggestion_index
+from .cache import AnonymousResponseCacheMixin, get_generation
+from .conditional import ConditionalGetMixin
+from .counters import CounterResponseMixin
+from .fieldsets import SparseFieldsetViewMixin
+from .exporter import CONTENT_TYPES as EXPORT_CONTENT_TYPES, FORMATS as EXPORT_FORMATS, export_applicants
+from .importer import FORMATS, ImportFailed, detect_format, import_internships, read_records
+from .permissions import IsRecruiter, IsStudent, role_of
+from .recommendations import MAX_RESULTS, recommended_ids
+from .search import InternshipSearchFilter
+from .storage import ImportUploadSizeLimitHandler
+from .viewer_state import MAX_BATCH as VIEWER_STATE_MAX_BATCH, ViewerState, is_student, viewer_version
 
 # --------------------------
 # AUTHENTICATION & USER VIEWS
@@ -34,7 +52,10 @@ class RegisterUserView(generics.CreateAPIView):
     permission_classes = [AllowAny]
 
 class LogoutView(APIView):
-    """Blacklist JWT refresh token to log user out."""
+    """
+    Blacklist the JWT refresh token to log this session out. Other devices
+    stay logged in; this session's access token lapses with its lifetime.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -42,17 +63,21 @@ class LogoutView(APIView):
             refresh_token = request.data["refresh"]
             token = RefreshToken(refresh_token)
             token.blacklist()
-            return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception:
             return Response(status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
 
-class UserProfileView(APIView):
-    """Retrieve the authenticated user's profile."""
+class UserProfileView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """Retrieve the authenticated user's profile (with ETag support)."""
+    serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+    def get_object(self):
+        return self.request.user
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        user = request.user
+        return (user.pk, user.username, user.email, user.profile.updated_at)
 
 class ProfileUpdateView(APIView):
     """Update authenticated user's profile (including picture)."""
@@ -153,26 +178,159 @@ class ChangePasswordView(generics.UpdateAPIView):
 # INTERNSHIP VIEWS
 # --------------------------
 
-class InternshipListView(generics.ListAPIView):
-    """List all internships with filters and search."""
+class InternshipListView(ConditionalGetMixin, CounterResponseMixin, AnonymousResponseCacheMixin, SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    List internships with filters and search (cached for anonymous users).
+    Only open, unexpired postings are listed unless `status` is given.
+    Rows use the compact card shape unless `?fields=` asks otherwise.
+    The ETag follows the internship cache generation (and the counters'
+    generation when popularity is shown or sorted by), so it costs no query.
+    """
+    cache_namespace = 'internship'
+    compact = True
     queryset = Internship.objects.all().order_by('-posted_on')
     serializer_class = InternshipSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, InternshipSearchFilter, filters.OrderingFilter]
     filterset_fields = {
         'location': ['exact', 'icontains'],
         'stipend': ['gte', 'lte'],
         'internship_type': ['exact'],
         'posted_on': ['gte', 'lte'],
+        'status': ['exact'],
     }
     search_fields = ['title', 'description', 'location', 'company', 'internship_type']
-    ordering_fields = ['posted_on', 'stipend']
+    ordering_fields = ['posted_on', 'stipend', 'applications_count', 'bookmarks_count']
+    cursor_ordering = ('-posted_on', '-id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.request.query_params.get('status'):
+            queryset = queryset.open()
+        return queryset
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        # open() depends on the current date, so the date is part of the version
+        return (
+            get_generation(self.cache_namespace), timezone.localdate(), viewer_version(request.user),
+            *map(get_generation, self.get_extra_cache_namespaces()),
+        )
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
 
+class InternshipFacetView(InternshipListView):
+    """
+    Facet counts for the internship browser. Accepts the same filter and
+    search params as InternshipListView. Each facet family ignores its own
+    filters, so the sidebar keeps showing the alternatives to the current choice.
+    """
+    cache_authenticated = True  # nothing here depends on the user
+    location_limit = 20
+    stipend_buckets = [0, 5000, 10000, 20000, 30000, 50000, None]
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        return (get_generation(self.cache_namespace), timezone.localdate())
+
+    def get_extra_cache_namespaces(self):
+        return ()
+
+    def facet_queryset(self, exclude):
+        """The list queryset filtered by every param except those starting with `exclude`."""
+        queryset = InternshipSearchFilter().filter_queryset(self.request, self.get_queryset(), self)
+        params = self.request.query_params.copy()
+        for key in list(params):
+            if key == exclude or key.startswith(f'{exclude}__'):
+                del params[key]
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+        filterset = filterset_class(data=params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise filter_utils.translate_validation(filterset.errors)
+        return filterset.qs.order_by()
+
+    def list(self, request, *args, **kwargs):
+        return Response({
+            'internship_type': self.value_counts('internship_type'),
+            'location': self.value_counts('location', limit=self.location_limit),
+            'stipend': self.stipend_histogram(),
+        })
+
+    def value_counts(self, field, limit=None):
+        rows = (
+            self.facet_queryset(exclude=field)
+            .values(field)
+            .annotate(count=Count('id'))
+            .order_by('-count', field)
+        )
+        if limit:
+            rows = rows[:limit]
+        return [{'value': row[field], 'count': row['count']} for row in rows]
+
+    def stipend_histogram(self):
+        """All buckets, plus postings without a stipend, in one aggregate query."""
+        bounds = list(zip(self.stipend_buckets, self.stipend_buckets[1:]))
+        aggregates = {'unspecified': Count('id', filter=Q(stipend__isnull=True))}
+        for i, (low, high) in enumerate(bounds):
+            condition = Q(stipend__gte=low) if high is None else Q(stipend__gte=low, stipend__lt=high)
+            aggregates[f'bucket_{i}'] = Count('id', filter=condition)
+        counts = self.facet_queryset(exclude='stipend').aggregate(**aggregates)
+        return {
+            'buckets': [
+                {'min': low, 'max': high, 'count': counts[f'bucket_{i}']}
+                for i, (low, high) in enumerate(bounds)
+            ],
+            'unspecified': counts['unspecified'],
+        }
+
+class InternshipAutocompleteView(APIView):
+    """
+    Typeahead suggestions for the search box: `?q=<text>&field=title|company|location&limit=N`.
+    Without `field`, suggestions for every field are returned.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    max_limit = 20
+
+    def get(self, request):
+        text = request.query_params.get('q', '')[:100]
+        field = request.query_params.get('field')
+        if field and field not in SUGGESTION_FIELDS:
+            raise ValidationError({"field": f"Must be one of: {', '.join(SUGGESTION_FIELDS)}"})
+        try:
+            limit = min(int(request.query_params.get('limit', 8)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        fields = [field] if field else SUGGESTION_FIELDS
+        return Response({name: suggestion_index.suggest(name, text, limit) for name in fields})
+
+class InternshipRecommendationView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    "Recommended for you": open internships ranked against the student's
+    profile, applications and bookmarks (`?limit=N`, at most 50).
+    """
+    serializer_class = InternshipSerializer
+    permission_classes = [IsAuthenticated, IsStudent]
+    filter_backends = []
+    pagination_class = None
+    compact = True
+
+    def get_queryset(self):
+        return Internship.objects.open()
+
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), MAX_RESULTS)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        ids = recommended_ids(request.user)
+        # Ranked ids may include postings closed or deleted by another worker
+        # since the matrix last synced; those are dropped here.
+        rows = self.filter_queryset(self.get_queryset()).in_bulk(ids[:limit * 2])
+        internships = [rows[pk] for pk in ids if pk in rows][:limit]
+        return Response(self.get_serializer(internships, many=True).data)
+
 class InternshipCreateView(generics.CreateAPIView):
     """Recruiters can post new internships."""
     queryset = Internship.objects.all()
@@ -186,12 +344,80 @@ class InternshipCreateView(generics.CreateAPIView):
         serializer.save(recruiter=request.user)
         return Response(serializer.data, status=201)
 
-class InternshipRetrieveView(generics.RetrieveAPIView):
-    """Retrieve details of a single internship (public)."""
+class InternshipImportView(APIView):
+    """
+    Recruiters post many internships at once. The body is CSV, a JSON array
+    or NDJSON (by Content-Type), or a multipart upload in a `file` field
+    (by file name). Invalid rows are skipped and listed in the report;
+    `?dry_run=1` only validates.
+    """
+    permission_classes = [IsAuthenticated, IsRecruiter]
+
+    def post(self, request):
+        if request.content_type.startswith('multipart/'):
+            ImportUploadSizeLimitHandler.install(request)
+            upload = request.FILES.get('file')
+            if upload is None:
+                raise ValidationError({"file": "No file uploaded."})
+            stream, fmt = upload, detect_format(filename=upload.name) or detect_format(upload.content_type)
+        else:
+            # Read the raw body as a stream; request.data would load it whole
+            stream, fmt = request.stream, detect_format(request.content_type)
+        if fmt is None:
+            return Response(
+                {"detail": f"Unsupported import format; send one of: {', '.join(FORMATS)}."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        if stream is None:
+            raise ValidationError({"detail": "Empty request body."})
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        try:
+            report = import_internships(read_records(stream, fmt), request.user, dry_run=dry_run)
+        except ImportFailed as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        if dry_run:
+            code = status.HTTP_200_OK
+        elif report['created']:
+            code = status.HTTP_201_CREATED
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(report, status=code)
+
+class InternshipRetrieveView(ConditionalGetMixin, CounterResponseMixin, AnonymousResponseCacheMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
+    """
+    Retrieve details of a single internship (public, cached for anonymous users).
+    Validated by the row's `updated_at` and popularity counters, plus the
+    student's own bookmark and application state when the response carries those flags.
+    """
+    cache_namespace = 'internship'
     queryset = Internship.objects.all()
     serializer_class = InternshipSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_row_version(self):
+        """(updated_at, applications_count, bookmarks_count), or None if there is no such row."""
+        if not hasattr(self, '_row_version'):
+            self._row_version = (
+                Internship.objects.filter(pk=self.kwargs['pk'])
+                .values_list('updated_at', 'applications_count', 'bookmarks_count').first()
+            )
+        return self._row_version
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        version = self.get_row_version()
+        if version is None:
+            return None
+        return (self.kwargs['pk'], *version, viewer_version(request.user))
+
+    def get_last_modified(self, request, *args, **kwargs):
+        # A student's flags and the counters change without touching the row
+        version = self.get_row_version()
+        if version is None or is_student(request.user) or self.shows_counters():
+            return None
+        return version[0]
+
 class InternshipEditView(generics.RetrieveUpdateDestroyAPIView):
     """Recruiters can edit or delete their own internships."""
     queryset = Internship.objects.all()
@@ -214,14 +440,19 @@ class InternshipEditView(generics.RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("You cannot delete this internship.")
         instance.delete()
 
-class MyPostedInternshipsView(generics.ListAPIView):
-    """List internships posted by the logged-in recruiter."""
+class MyPostedInternshipsView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """List internships posted by the logged-in recruiter, with their popularity counters."""
     serializer_class = InternshipSerializer
     permission_classes = [IsAuthenticated, IsRecruiter]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['posted_on', 'applications_count', 'bookmarks_count']
+    compact = True
+    extra_compact_fields = ('applications_count', 'bookmarks_count')
+    cursor_ordering = ('-posted_on', '-id')
 
     def get_queryset(self):
         user = self.request.user
-        if not hasattr(user, 'profile') or user.profile.role != 'recruiter':
+        if role_of(user) != 'recruiter':
             return Internship.objects.none()
         return Internship.objects.filter(recruiter=user).order_by('-posted_on')
 
@@ -230,33 +461,120 @@ class MyPostedInternshipsView(generics.ListAPIView):
 # --------------------------
 
 class ApplyToInternshipView(generics.CreateAPIView):
-    """Students can apply to internships."""
+    """
+    Students can apply to open internships. The posting is read with one
+    lock-free query; duplicate applications are left to the unique
+    constraint, so concurrent double submits get a 409 instead of a 500.
+    """
     serializer_class = ApplicationCreateSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsStudent]
 
-    def perform_create(self, serializer):
-        internship_id = self.kwargs['internship_id']
-        serializer.save(user=self.request.user, internship_id=internship_id)
+    def get_internship(self):
+        internship = (
+            Internship.objects.filter(pk=self.kwargs['internship_id'])
+            .only('title', 'status', 'expiry_date').first()
+        )
+        if internship is None:
+            raise NotFound("Internship not found.")
+        expiry_date = internship.expiry_date
+        if internship.status != 'open' or (expiry_date and expiry_date < timezone.localdate()):
+            raise ValidationError({"detail": "This internship is not accepting applications."})
+        return internship
 
-class StudentApplicationListView(generics.ListAPIView):
+    def create(self, request, *args, **kwargs):
+        internship = self.get_internship()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                serializer.save(user=request.user, internship=internship)
+        except IntegrityError:
+            if not Application.objects.filter(user=request.user, internship=internship).exists():
+                # The posting was deleted in the meantime
+                raise NotFound("Internship not found.")
+            return Response(
+                {"detail": "You have already applied for this internship."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class StudentApplicationListView(SparseFieldsetViewMixin, generics.ListAPIView):
     """List all applications of the logged-in student."""
     serializer_class = ApplicationListSerializer
     permission_classes = [IsAuthenticated]
+    compact = True
+    cursor_ordering = ('-applied_on', '-id')
 
     def get_queryset(self):
-        return Application.objects.filter(user=self.request.user).order_by('-applied_on')
+        return (
+            Application.objects.filter(user=self.request.user)
+            .select_related('internship', 'user__profile')
+            .order_by('-applied_on')
+        )
 
-class RecruiterApplicantListView(generics.ListAPIView):
-    """Recruiters can view applications for their internships."""
+class RecruiterApplicantListView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    Recruiters can view applications for their internships.
+    With `?view=applicants`, rows leave out the internship, which is sent
+    once next to the results instead of on every row.
+    """
     serializer_class = ApplicationListSerializer
     permission_classes = [IsAuthenticated, IsRecruiter]
+    compact = True
+    cursor_ordering = ('-applied_on', '-id')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['avatar_size'] = 'small'
+        return context
+
+    def applicants_only(self):
+        return self.request.query_params.get('view') == 'applicants'
+
+    def get_serializer_class(self):
+        return ApplicantSerializer if self.applicants_only() else ApplicationListSerializer
 
     def get_queryset(self):
         internship_id = self.kwargs['internship_id']
+        related = ['user__profile'] if self.applicants_only() else ['internship', 'user__profile']
         return Application.objects.filter(
             internship__recruiter=self.request.user,
             internship_id=internship_id
-        ).order_by('-applied_on')
+        ).select_related(*related).order_by('-applied_on')
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.applicants_only():
+            internship = Internship.objects.filter(
+                pk=self.kwargs['internship_id'], recruiter=request.user
+            ).first()
+            # No request in the context: ?fields= selects applicant fields, not these
+            response.data['internship'] = (
+                InternshipSerializer(internship, context={'compact': True}).data if internship else None
+            )
+        return response
+
+class RecruiterApplicantExportView(APIView):
+    """
+    Recruiters download every applicant of one of their internships,
+    streamed as CSV (default) or NDJSON with `?as=ndjson`.
+    """
+    permission_classes = [IsAuthenticated, IsRecruiter]
+
+    def get(self, request, internship_id):
+        fmt = request.query_params.get('as', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"as": f"Must be one of: {', '.join(EXPORT_FORMATS)}"})
+        if not Internship.objects.filter(pk=internship_id, recruiter=request.user).exists():
+            raise NotFound("Internship not found.")
+
+        response = StreamingHttpResponse(
+            export_applicants(internship_id, fmt, resume_url=request.build_absolute_uri),
+            content_type=EXPORT_CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = f'attachment; filename="internship-{internship_id}-applicants.{fmt}"'
+        response['Cache-Control'] = 'no-store'
+        return response
 
 class ApplicationStatusUpdateView(generics.UpdateAPIView):
     """Recruiters can update application status."""
@@ -264,12 +582,53 @@ class ApplicationStatusUpdateView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated, IsRecruiter]
     queryset = Application.objects.all()
 
+class ApplicationBulkStatusView(APIView):
+    """
+    Recruiters change the status of many applications in one request.
+    All ids must belong to the recruiter's internships, or nothing changes.
+    The changes are applied with one UPDATE and logged as one batch.
+    """
+    permission_classes = [IsAuthenticated, IsRecruiter]
+
+    def post(self, request):
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        targets = {update['id']: update['status'] for update in serializer.validated_data['updates']}
+
+        with transaction.atomic():
+            rows = (
+                Application.objects
+                .filter(id__in=targets, internship__recruiter=request.user)
+                .select_for_update(of=('self',))
+                .values_list('id', 'status', 'user_id', 'internship__title')
+            )
+            current = {pk: (old, user_id, title) for pk, old, user_id, title in rows}
+            missing = sorted(set(targets) - set(current))
+            if missing:
+                raise ValidationError({"updates": f"Applications not found among your internships: {missing}"})
+
+            changed = {pk: new for pk, new in targets.items() if current[pk][0] != new}
+            if changed:
+                Application.objects.filter(id__in=changed).update(status=Case(
+                    *(When(id=pk, then=Value(new)) for pk, new in changed.items()),
+                    output_field=CharField(),
+                ))
+                log_activities([
+                    activity(
+                        current[pk][1], 'application_status_changed', pk,
+                        f"Status changed from {current[pk][0]} to {new} for {{title}}", title=current[pk][2],
+                    )
+                    for pk, new in changed.items()
+                ])
+
+        return Response({"updated": len(changed), "unchanged": len(targets) - len(changed)})
+
 class ApplicationCheckView(APIView):
     """Check if student has already applied."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request, internship_id):
-        applied = Application.objects.filter(internship_id=internship_id, user=request.user).exists()
+        applied = ViewerState(request.user, enabled=True).has_applied(internship_id)
         return Response({"applied": applied})
 
 # --------------------------
@@ -299,23 +658,55 @@ class BookmarkCheckView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, internship_id):
-        exists = Bookmark.objects.filter(internship_id=internship_id, user=request.user).exists()
+        exists = ViewerState(request.user, enabled=True).is_bookmarked(internship_id)
         return Response({"bookmarked": exists})
 
-class BookmarkListView(generics.ListAPIView):
+class ViewerStateView(APIView):
+    """
+    Applied/bookmarked flags of the current user for a batch of internships
+    (`?ids=1,2,3`), so list pages need one request instead of two per card:
+    `{id: {applied, bookmarked, application_status}}`.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            ids = [int(pk) for pk in request.query_params.get('ids', '').split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError({"ids": "Must be a comma-separated list of integers"})
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise ValidationError({"ids": "This parameter is required"})
+        if len(ids) > VIEWER_STATE_MAX_BATCH:
+            raise ValidationError({"ids": f"At most {VIEWER_STATE_MAX_BATCH} ids per request"})
+        return Response(ViewerState(request.user, enabled=True).flags(ids))
+
+class BookmarkListView(SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = BookmarkSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-bookmarked_on', '-id')
 
     def get_queryset(self):
-        return Bookmark.objects.filter(user=self.request.user).order_by('-bookmarked_on')
+        return (
+            Bookmark.objects.filter(user=self.request.user)
+            .select_related('internship')
+            .order_by('-bookmarked_on')
+        )
 
 # --------------------------
 # ACTIVITY LOG VIEWS
 # --------------------------
 
 class UserActivityLogListView(generics.ListAPIView):
+    """
+    The user's activity, newest first, optionally of one `action` and
+    between `start_date` and `end_date`. Keyset-paged without a COUNT(*)
+    by default (`?pagination=page` for page numbers).
+    """
     serializer_class = ActivityLogSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-timestamp', '-id')
+    default_pagination = 'cursor'
 
     def get_queryset(self):
         user = self.request.user
@@ -337,4 +728,4 @@ class UserActivityLogListView(generics.ListAPIView):
             if not end_dt:
                 raise ValidationError({"end_date": "Invalid datetime format"})
             queryset = queryset.filter(timestamp__lte=end_dt)
-        return queryset.order_by('-timestamp')
+        return queryset.order_by(*self.cursor_ordering)
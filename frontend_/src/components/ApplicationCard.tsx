@@ -15,11 +15,7 @@ export default function ApplicationCard({ application }: Props) {
       ? "text-red-400"
       : "text-yellow-400";
 
-  const shortDesc = internship?.description
-    ? internship.description.length > 170
-      ? internship.description.slice(0, 167) + "..."
-      : internship.description
-    : "No description available";
+  const shortDesc = internship?.description_preview || "No description available";
 
   return (
     <div className="bg-gradient-to-br from-gray-800 to-gray-900 rounded-xl shadow-lg p-6 text-white hover:scale-[1.02] transition transform">
@@ -11,7 +11,7 @@ type Props = {
     location?: string;
     type: string;
     duration: string;
-    description: string;
+    description_preview: string;
     bookmarked?: boolean; // optional, in case not provided
   };
 };
@@ -24,16 +24,13 @@ export default function InternshipCard({ internship }: Props) {
     location = "Remote",
     type,
     duration,
-    description,
+    description_preview,
   } = internship;
 
   const { user } = useAuth(); // get logged in user
   const [bookmarked, setBookmarked] = useState(internship.bookmarked ?? false);
 
 
-  const shortDesc =
-    description.length > 170 ? description.slice(0, 167) + "..." : description;
-
   const toggleBookmark = async () => {
     try {
       if (bookmarked) {
@@ -64,7 +61,7 @@ export default function InternshipCard({ internship }: Props) {
       <h3 className="text-xl font-semibold mb-1">{title}</h3>
       <p className="text-sm text-gray-300 mb-2">{company} • {location}</p>
       <p className="text-sm text-gray-400 mb-2">{type} • {duration}</p>
-      <p className="text-sm text-gray-200 mb-4">{shortDesc}</p>
+      <p className="text-sm text-gray-200 mb-4">{description_preview}</p>
       <Link
         to={`/internships/${id}/view/`}
         className="inline-block bg-gradient-to-r from-blue-500 to-purple-600 text-white px-4 py-2 rounded hover:opacity-90 text-sm"
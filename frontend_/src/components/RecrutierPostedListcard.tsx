@@ -21,6 +21,9 @@ export default function RecruiterPostedListCard({ internship }: Props) {
         {internship.internship_type ?? "—"} • {internship.stipend ? `₹${internship.stipend}` : "—"}
       </p>
       <p className="text-sm text-gray-500">Status: {internship.status ?? "—"}</p>
+      <p className="text-sm text-gray-500 mt-1">
+        {internship.applications_count ?? 0} applicants • {internship.bookmarks_count ?? 0} saves
+      </p>
     </div>
   );
 }
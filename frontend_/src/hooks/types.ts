@@ -17,7 +17,8 @@ export interface User {
 export interface Internship {
   id: number;
   title: string;
-  description: string;
+  description?: string; // detail views; lists send description_preview
+  description_preview?: string;
   company: string;
   location: string;
   stipend: number | null;
@@ -27,6 +28,8 @@ export interface Internship {
   status: 'open' | 'closed' | 'archived';
   expiry_date?: string | null; // ISO date string
   recruiter: User;
+  applications_count?: number; // detail view and recruiter's own list
+  bookmarks_count?: number;
   tech_stack?: string[]; // optional, if used in frontend
   tags?: string[];       // optional
 }
@@ -11,16 +11,19 @@ export default function ActivityLogPage() {
   const [logs, setLogs] = useState<ActivityLog[]>([]); // typed state
   const [fetching, setFetching] = useState(true);
   const [error, setError] = useState("");
+  // Link to the next (keyset) page, null on the last one
+  const [nextPage, setNextPage] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     if (!authLoading && user) {
       const fetchLogs = async () => {
         try {
-          const { data } = await api.get<{ results?: ActivityLog[] }>("/activity_logs/");
-          console.log("Fetched activity_logs:", data);
+          const { data } = await api.get<{ results?: ActivityLog[]; next?: string | null }>("/activity_logs/");
 
           if (data.results && Array.isArray(data.results)) {
             setLogs(data.results);
+            setNextPage(data.next ?? null);
           } else if (Array.isArray(data)) {
             setLogs(data);
           } else {
@@ -37,6 +40,20 @@ export default function ActivityLogPage() {
     }
   }, [authLoading, user]);
 
+  const loadMore = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const { data } = await api.get<{ results: ActivityLog[]; next: string | null }>(nextPage);
+      setLogs((prev) => [...prev, ...data.results]);
+      setNextPage(data.next);
+    } catch {
+      setError("Unable to fetch activity logs.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (authLoading) {
     return (
       <div className="h-screen flex items-center justify-center bg-black text-white text-xl">
@@ -67,6 +84,18 @@ export default function ActivityLogPage() {
             ))}
           </div>
         )}
+
+        {nextPage && !error && (
+          <div className="text-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-6 py-2 rounded-lg bg-gray-800 hover:bg-gray-700 disabled:opacity-50"
+            >
+              {loadingMore ? "Loading…" : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
 
       <footer className="text-center py-6 text-sm text-gray-500">
@@ -13,7 +13,7 @@ export default function ApplicantsListPage() {
   useEffect(() => {
     const fetchApplicants = async () => {
       try {
-        const { data } = await api.get(`/internships/${internship_id}/applicants/`);
+        const { data } = await api.get(`/internships/${internship_id}/applicants/?view=applicants`);
         console.log("Applicants API response:", data);
         setApplicants(data.results || []); // only store results array
       } catch (err) {
@@ -38,6 +38,22 @@ export default function ApplicantsListPage() {
     }
   };
 
+  const exportApplicants = async () => {
+    try {
+      const { data } = await api.get(`/internships/${internship_id}/applicants/export/`, {
+        responseType: "blob",
+      });
+      const url = URL.createObjectURL(data);
+      const link = document.createElement("a");
+      link.href = url;
+      link.download = `internship-${internship_id}-applicants.csv`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      alert("Failed to export applicants.");
+    }
+  };
+
   if (loading) {
     return (
       <div className="min-h-screen bg-gradient-to-br from-gray-900 to-black text-white">
@@ -73,7 +89,17 @@ export default function ApplicantsListPage() {
         >
           ← Back
         </button>
-        <h1 className="text-2xl font-bold mb-4">Applicants</h1>
+        <div className="flex items-center justify-between mb-4">
+          <h1 className="text-2xl font-bold">Applicants</h1>
+          {applicants.length > 0 && (
+            <button
+              onClick={exportApplicants}
+              className="bg-gray-700 px-3 py-1 rounded hover:bg-gray-600 text-white"
+            >
+              Export CSV
+            </button>
+          )}
+        </div>
 
         {applicants.length === 0 ? (
           <p className="text-gray-400">No applicants have applied yet.</p>
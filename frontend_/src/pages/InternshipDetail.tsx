@@ -26,14 +26,12 @@ export default function InternshipDetail() {
       const internshipRes = await api.get(`/internships/${id}/view/`);
       setInternship(internshipRes.data);
 
-      // Only check application/bookmark if user is authenticated
+      // Only check application/bookmark state if user is authenticated
       if (user) {
-        const [applyCheck, bookmarkCheck] = await Promise.all([
-          api.get(`/applications/check/${id}/`),
-          api.get(`/bookmarks/check/${id}/`)
-        ]);
-        setAlreadyApplied(applyCheck.data.applied);
-        setBookmarked(bookmarkCheck.data.bookmarked);
+        const stateRes = await api.get(`/internships/viewer-state/`, { params: { ids: id } });
+        const state = stateRes.data[String(id)];
+        setAlreadyApplied(state?.applied ?? false);
+        setBookmarked(state?.bookmarked ?? false);
       }
     } catch (_) {
       setError("Failed to load internship.");
@@ -67,7 +65,9 @@ export default function InternshipDetail() {
       await api.post(`/applications/apply/${internship.id}/`, {});
       setAlreadyApplied(true);
     } catch (error: any) {
-      if (error.response?.data) {
+      if (error.response?.status === 409) {
+        setAlreadyApplied(true);
+      } else if (error.response?.data) {
         alert(Object.values(error.response.data).join("\n"));
       } else {
         alert("Failed to submit application.");
@@ -141,6 +141,11 @@ export default function InternshipDetail() {
         <p className="text-gray-400 mb-2"><strong>Stipend:</strong> ₹{internship.stipend || "Not disclosed"}</p>
         <p className="text-gray-500 mb-2"><strong>Status:</strong> {internship.status}</p>
         <p className="text-gray-500 mb-2"><strong>Posted On:</strong> {new Date(internship.posted_on).toLocaleDateString()}</p>
+        {internship.applications_count !== undefined && (
+          <p className="text-gray-500 mb-2">
+            {internship.applications_count} applicants • {internship.bookmarks_count} saves
+          </p>
+        )}
         {internship.expiry_date && (
           <p className="text-gray-500 mb-2"><strong>Expiry Date:</strong> {new Date(internship.expiry_date).toLocaleDateString()}</p>
         )}
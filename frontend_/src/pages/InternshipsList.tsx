@@ -8,7 +8,7 @@ export default function InternshipList() {
   type Internship = {
     id: number;
     title: string;
-    description: string;
+    description_preview: string;
     company: string;
     location: string;
     stipend?: number | null;